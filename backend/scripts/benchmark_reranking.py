@@ -0,0 +1,69 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.services.reranking import MultiFactorScorer
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+
+
+def build_contexts(count: int):
+    rng = random.Random(42)
+    return [
+        RetrievedContext.model_construct(
+            product=Product.model_construct(
+                name=f"Product {i}",
+                price=rng.uniform(5.0, 1500.0),
+                rating=rng.choice([None, rng.uniform(1.0, 5.0)]),
+                stock_quantity=rng.randint(0, 50)
+            ),
+            relevance_score=rng.random(),
+            chunk_text=None,
+            chunk_position=None
+        )
+        for i in range(count)
+    ]
+
+
+def loop_rerank(contexts, top_n):
+    def price_score(price):
+        if price <= 50:
+            return 1.0
+        elif price <= 200:
+            return 0.8
+        elif price <= 500:
+            return 0.6
+        return 0.4
+
+    scored = [
+        (ctx, ctx.relevance_score * 0.7 + price_score(ctx.product.price) * 0.2 + ((ctx.product.rating or 0.0) / 5.0) * 0.1)
+        for ctx in contexts
+    ]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [ctx for ctx, _ in scored[:top_n]]
+
+
+def measure(function, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    scorer = MultiFactorScorer()
+    top_n = 10
+    print(f"{'candidates':>10} {'python loop (ms)':>18} {'numpy scorer (ms)':>18} {'speedup':>8}")
+    for count in (1_000, 10_000):
+        contexts = build_contexts(count)
+        repeats = 50 if count <= 1_000 else 10
+        baseline = measure(lambda: loop_rerank(contexts, top_n), repeats)
+        vectorized = measure(lambda: scorer.rerank(contexts, top_n=top_n), repeats)
+        print(f"{count:>10} {baseline:>18.3f} {vectorized:>18.3f} {baseline / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
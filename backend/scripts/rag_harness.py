@@ -0,0 +1,410 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.application.services.context_retrieval import (
+    HybridRetrievalStrategy,
+    RetrievalConfig,
+    VectorSearchStrategy
+)
+from src.application.services.listwise_rerank import (
+    ListwiseRerankConfig,
+    ListwiseReranker,
+    ListwiseRerankingStrategy
+)
+from src.application.services.prompt_builder import ApproximateTokenizer
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.domain.models.product import Product
+from src.domain.models.rag import RAGRequest
+from src.domain.value_objects.identifiers import ProductIdentifier
+from src.infrastructure.embedding.ollama_embedder import OllamaEmbeddingConfig, OllamaEmbeddingService
+from src.infrastructure.lexical.bm25_index import BM25Index, tokenize
+from src.infrastructure.tracing import Trace, span, tracer
+from src.infrastructure.vector_store.chroma_repository import (
+    ChromaConfig,
+    ChromaVectorRepository,
+    build_product_metadata
+)
+from src.infrastructure.vector_store.snapshot import SnapshotManifest, VectorSnapshot
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+PERCENTILES = (50, 95, 99)
+_FIRST_PRODUCT = re.compile(r"Product 1 \(relevance [^)]*\): ([^\n.]+)")
+_LISTWISE_ITEM = re.compile(r"^\[(\d+)\]", re.MULTILINE)
+
+
+class TokenUsage:
+    def __init__(self):
+        self.prompt: List[int] = []
+        self.completion: List[int] = []
+
+    def record(self, prompt_tokens: int, completion_tokens: int) -> None:
+        self.prompt.append(prompt_tokens)
+        self.completion.append(completion_tokens)
+
+
+class HashingEmbedder:
+    def __init__(self, dimension: int = 512):
+        self._dimension = dimension
+
+    async def embed_text(self, text: str) -> List[float]:
+        vector = np.zeros(self._dimension, dtype=np.float32)
+        tokens = tokenize(text)
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self._dimension
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [await self.embed_text(text) for text in texts]
+
+    async def close(self) -> None:
+        return None
+
+
+class StandInLLM:
+    def __init__(self, usage: TokenUsage, latency_ms: float = 250.0, tokenizer: Optional[ApproximateTokenizer] = None):
+        self._usage = usage
+        self._latency = latency_ms / 1000
+        self._tokenizer = tokenizer or ApproximateTokenizer()
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        format: Optional[str] = None
+    ) -> str:
+        await asyncio.sleep(self._latency)
+        match = _FIRST_PRODUCT.search(prompt)
+        name = match.group(1).strip() if match else "the first product"
+        listed = _LISTWISE_ITEM.findall(prompt)
+        if listed:
+            completion = " ".join(listed)
+        elif format == "json":
+            completion = json.dumps({
+                "recommendations": [{"product_id": "1", "reason": f"{name} is the closest match."}],
+                "summary": f"{name} fits the request best."
+            })
+        else:
+            completion = f"I recommend {name}. It is the closest match to what you described."
+        self._usage.record(self._tokenizer.count(prompt), self._tokenizer.count(completion))
+        return completion
+
+
+class OllamaHTTPLLM:
+    def __init__(self, usage: TokenUsage, host: str, timeout: float = 120.0):
+        self._usage = usage
+        self._host = host.rstrip("/")
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def generate(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        format: Optional[str] = None
+    ) -> str:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {"temperature": temperature, "num_predict": max_tokens}
+        }
+        if format:
+            payload["format"] = format
+        response = await self._client.post(f"{self._host}/api/generate", json=payload)
+        response.raise_for_status()
+        data = response.json()
+        self._usage.record(data.get("prompt_eval_count", 0), data.get("eval_count", 0))
+        return data.get("response", "")
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class StageCollector:
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def export(self, trace: Trace) -> None:
+        for stage in trace.spans:
+            self.durations[stage.name].append(stage.duration_ms)
+
+
+def product_id_for(sku: str) -> ProductIdentifier:
+    return ProductIdentifier(value=uuid5(NAMESPACE_URL, f"inmind-harness:{sku}"))
+
+
+def load_catalog(path: Path) -> Tuple[List[Product], Dict[str, str]]:
+    products: List[Product] = []
+    skus: Dict[str, str] = {}
+    for item in json.loads(path.read_text()):
+        sku = item.pop("sku")
+        product = Product(id=product_id_for(sku), **item)
+        products.append(product)
+        skus[str(product.id)] = sku
+    return products, skus
+
+
+def load_queries(path: Path) -> List[Dict[str, Any]]:
+    return json.loads(path.read_text())
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    array = np.asarray(values, dtype=np.float64)
+    summary = {"count": len(values), "mean": round(float(array.mean()), 3)}
+    for percentile, value in zip(PERCENTILES, np.percentile(array, PERCENTILES)):
+        summary[f"p{percentile}"] = round(float(value), 3)
+    return summary
+
+
+def recall_at_k(expected: List[str], retrieved: List[str], k: int) -> float:
+    if not expected:
+        return 1.0
+    return len(set(expected) & set(retrieved[:k])) / len(set(expected))
+
+
+async def build_pipeline(args: argparse.Namespace, products: List[Product], embedder, llm) -> RAGPipeline:
+    collection_name = f"harness_{uuid4().hex[:8]}"
+    repository = ChromaVectorRepository(ChromaConfig(
+        persist_directory=tempfile.mkdtemp(prefix="inmind-harness-"),
+        collection_name=collection_name
+    ))
+    vectors = np.asarray(await embedder.embed_batch([product.to_document() for product in products]), dtype=np.float32)
+    await repository.import_snapshot(VectorSnapshot(
+        SnapshotManifest(
+            collection_name=collection_name,
+            generation=1,
+            count=len(products),
+            dimension=vectors.shape[1]
+        ),
+        ids=[str(product.id) for product in products],
+        documents=[product.description for product in products],
+        metadatas=[build_product_metadata(product) for product in products],
+        vectors=vectors
+    ))
+
+    lexical_index = BM25Index()
+    lexical_index.add_products(products)
+    retrieval_config = RetrievalConfig(min_relevance=args.min_relevance)
+    strategy = HybridRetrievalStrategy(
+        VectorSearchStrategy(repository, embedder, retrieval_config),
+        retrieval_config,
+        lexical_index
+    )
+    if args.listwise_rerank:
+        strategy = ListwiseRerankingStrategy(
+            strategy,
+            ListwiseReranker(llm, ListwiseRerankConfig(model_name=args.model))
+        )
+    return RAGPipeline(
+        strategy,
+        llm,
+        RAGPipelineConfig(
+            model_name=args.model,
+            structured_output=args.structured,
+            enable_self_consistency=args.self_consistency
+        )
+    )
+
+
+async def run_queries(
+    pipeline: RAGPipeline,
+    queries: List[Dict[str, Any]],
+    skus: Dict[str, str],
+    args: argparse.Namespace
+) -> Tuple[List[Dict[str, Any]], float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run_one(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            request = RAGRequest(
+                query=item["query"],
+                max_results=args.k,
+                min_relevance=args.min_relevance,
+                intent_type=item.get("intent_type"),
+                response_mode=args.response_mode
+            )
+            started = time.perf_counter()
+            try:
+                with span("harness.query", index=index):
+                    response = await pipeline.process_query(request)
+            except Exception as e:
+                return {"query": item["query"], "error": f"{type(e).__name__}: {e}"}
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            retrieved = [skus.get(str(ctx.product.id), str(ctx.product.id)) for ctx in response.context_used]
+            return {
+                "query": item["query"],
+                "latency_ms": round(latency_ms, 3),
+                "expected": item.get("expected", []),
+                "retrieved": retrieved,
+                "recall": recall_at_k(item.get("expected", []), retrieved, args.k),
+                "answer_path": response.metadata.get("answer_path", {}).get("path")
+            }
+
+    workload = [item for _ in range(args.repeat) for item in queries]
+    started = time.perf_counter()
+    results = await asyncio.gather(*[run_one(index, item) for index, item in enumerate(workload)])
+    return list(results), time.perf_counter() - started
+
+
+def build_report(
+    args: argparse.Namespace,
+    results: List[Dict[str, Any]],
+    wall_seconds: float,
+    stages: StageCollector,
+    usage: TokenUsage
+) -> Dict[str, Any]:
+    succeeded = [result for result in results if "error" not in result]
+    failed = [result for result in results if "error" in result]
+    answer_paths: Dict[str, int] = defaultdict(int)
+    for result in succeeded:
+        answer_paths[result["answer_path"] or "unknown"] += 1
+
+    return {
+        "label": args.label,
+        "generated_at": datetime.utcnow().isoformat(),
+        "config": {
+            "catalog": str(args.catalog),
+            "queries": str(args.queries),
+            "llm": args.llm,
+            "embedder": args.embedder,
+            "model": args.model,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "k": args.k,
+            "min_relevance": args.min_relevance,
+            "response_mode": args.response_mode,
+            "structured": args.structured,
+            "self_consistency": args.self_consistency,
+            "listwise_rerank": args.listwise_rerank,
+            "stand_in_latency_ms": args.stand_in_latency_ms if args.llm == "stand-in" else None
+        },
+        "throughput": {
+            "queries": len(results),
+            "failed": len(failed),
+            "wall_seconds": round(wall_seconds, 3),
+            "queries_per_second": round(len(succeeded) / wall_seconds, 3) if wall_seconds else 0.0
+        },
+        "latency_ms": {
+            "end_to_end": summarize([result["latency_ms"] for result in succeeded]),
+            "stages": {name: summarize(values) for name, values in sorted(stages.durations.items())}
+        },
+        "retrieval": {
+            "k": args.k,
+            "recall_at_k": round(float(np.mean([result["recall"] for result in succeeded])), 4) if succeeded else 0.0,
+            "per_query": results[:len(results) // max(args.repeat, 1)]
+        },
+        "tokens": {
+            "llm_calls": len(usage.prompt),
+            "prompt": {"total": int(sum(usage.prompt)), **summarize(usage.prompt)},
+            "completion": {"total": int(sum(usage.completion)), **summarize(usage.completion)}
+        },
+        "answer_paths": dict(answer_paths),
+        "errors": failed
+    }
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    throughput = report["throughput"]
+    print(f"queries: {throughput['queries']}  failed: {throughput['failed']}  "
+          f"qps: {throughput['queries_per_second']:.2f}  recall@{report['retrieval']['k']}: "
+          f"{report['retrieval']['recall_at_k']:.3f}")
+    print(f"{'stage':<28} {'count':>6} {'p50 (ms)':>10} {'p95 (ms)':>10} {'p99 (ms)':>10}")
+    rows = [("end_to_end", report["latency_ms"]["end_to_end"])] + list(report["latency_ms"]["stages"].items())
+    for name, summary in rows:
+        if not summary.get("count"):
+            continue
+        print(f"{name:<28} {summary['count']:>6} {summary['p50']:>10.2f} {summary['p95']:>10.2f} {summary['p99']:>10.2f}")
+    tokens = report["tokens"]
+    print(f"llm calls: {tokens['llm_calls']}  prompt tokens: {tokens['prompt']['total']}  "
+          f"completion tokens: {tokens['completion']['total']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline throughput and quality harness for the RAG pipeline")
+    parser.add_argument("--catalog", type=Path, default=FIXTURES / "rag_catalog.json")
+    parser.add_argument("--queries", type=Path, default=FIXTURES / "rag_queries.json")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--label", default="local")
+    parser.add_argument("--llm", choices=["stand-in", "ollama"], default="stand-in")
+    parser.add_argument("--embedder", choices=["hashing", "ollama"], default="hashing")
+    parser.add_argument("--ollama-host", default="http://localhost:11434")
+    parser.add_argument("--embedding-model", default="nomic-embed-text")
+    parser.add_argument("--model", default="llama2")
+    parser.add_argument("--stand-in-latency-ms", type=float, default=250.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--min-relevance", type=float, default=0.0)
+    parser.add_argument("--response-mode", choices=["auto", "generate", "list"], default="generate")
+    parser.add_argument("--structured", action="store_true")
+    parser.add_argument("--self-consistency", action="store_true")
+    parser.add_argument("--listwise-rerank", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    usage = TokenUsage()
+    products, skus = load_catalog(args.catalog)
+    queries = load_queries(args.queries)
+
+    if args.embedder == "ollama":
+        embedder = OllamaEmbeddingService(OllamaEmbeddingConfig(base_url=args.ollama_host, model=args.embedding_model))
+    else:
+        embedder = HashingEmbedder()
+    if args.llm == "ollama":
+        llm = OllamaHTTPLLM(usage, args.ollama_host)
+    else:
+        llm = StandInLLM(usage, args.stand_in_latency_ms)
+
+    stages = StageCollector()
+    tracer.add_exporter(stages)
+    try:
+        pipeline = await build_pipeline(args, products, embedder, llm)
+        stages.durations.clear()
+        results, wall_seconds = await run_queries(pipeline, queries, skus, args)
+    finally:
+        tracer.clear_exporters()
+        await embedder.close()
+        if isinstance(llm, OllamaHTTPLLM):
+            await llm.close()
+
+    return build_report(args, results, wall_seconds, stages, usage)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+    print_summary(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2, default=str))
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,45 @@
 from functools import lru_cache
+from typing import Optional, Union
 from src.infrastructure.config.settings import Settings
 from src.infrastructure.llm.ollama_client import OllamaClient, OllamaConfig
 from src.infrastructure.embedding.ollama_embedder import OllamaEmbeddingService, OllamaEmbeddingConfig
 from src.infrastructure.vector_store.chroma_repository import ChromaVectorRepository, ChromaConfig
+from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+from src.infrastructure.vector_store.cached_repository import CachingVectorRepository, SearchCacheConfig
+from src.infrastructure.lexical.bm25_index import BM25Index
+from src.infrastructure.vector_store.sharded_chroma_repository import (
+    ShardedChromaConfig,
+    ShardedChromaVectorRepository
+)
+from src.infrastructure.vector_store.neighbor_graph import NeighborGraph, NeighborGraphConfig
 from src.infrastructure.conversation.in_memory_state_repository import InMemoryStateRepository
 from src.infrastructure.conversation.in_memory_memory_repository import InMemoryMemoryRepository
+from src.infrastructure.tracing import JsonlTraceExporter, TraceRingBuffer, tracer
 from src.application.services.intent_detector import IntentDetectorService
-from src.application.services.text_chunker import TextChunker, ChunkingConfig
+from src.application.services.text_chunker import TextChunker, ChunkConfig
 from src.application.services.product_ingestion import ProductIngestionService
-from src.application.services.prompt_template import RAGPromptTemplates
-from src.application.services.context_retrieval import HybridRetrievalStrategy
-from src.application.services.rag_pipeline import RAGPipeline
-from src.application.services.conversation_manager import ConversationManager
+from src.application.services.context_retrieval import (
+    HybridRetrievalStrategy,
+    RetrievalConfig,
+    VectorSearchStrategy
+)
+from src.application.services.listwise_rerank import (
+    ListwiseRerankConfig,
+    ListwiseReranker,
+    ListwiseRerankingStrategy
+)
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.application.services.product_fragments import ProductFragmentCache
+from src.application.services.semantic_cache import SemanticAnswerCache, SemanticCacheConfig
+from src.application.services.speculative_retrieval import SpeculationConfig, SpeculativeRetriever
+from src.application.services.query_rewriter import QueryRewriter, RewriteConfig
+from src.application.services.conversation_manager import (
+    ConversationManager,
+    ConversationManagerConfig
+)
+from src.application.services.filter_compiler import AliasTable, FilterCompiler
+from src.domain.models.memory import MemoryConfig
+from src.application.services.similar_products import SimilarProductsService
 
 
 @lru_cache()
@@ -19,6 +47,26 @@ def get_settings() -> Settings:
     return Settings()
 
 
+@lru_cache()
+def get_trace_buffer() -> TraceRingBuffer:
+    return TraceRingBuffer(get_settings().trace_buffer_size)
+
+
+def configure_tracing() -> None:
+    settings = get_settings()
+    tracer.enabled = settings.tracing_enabled
+    tracer.clear_exporters()
+    if not settings.tracing_enabled:
+        return
+    tracer.add_exporter(get_trace_buffer())
+    if settings.trace_log_path:
+        tracer.add_exporter(JsonlTraceExporter(
+            settings.trace_log_path,
+            max_bytes=settings.trace_log_max_bytes,
+            backup_count=settings.trace_log_backups
+        ))
+
+
 def get_ollama_client() -> OllamaClient:
     settings = get_settings()
     config = OllamaConfig(
@@ -40,13 +88,63 @@ def get_embedding_service() -> OllamaEmbeddingService:
     return OllamaEmbeddingService(config)
 
 
+@lru_cache()
+def get_metadata_index() -> Optional[ColumnarMetadataIndex]:
+    if not get_settings().columnar_metadata_index_enabled:
+        return None
+    return ColumnarMetadataIndex()
+
+
+@lru_cache()
 def get_vector_repository() -> ChromaVectorRepository:
     config = ChromaConfig(
         collection_name="products",
-        persist_directory="./data/chroma"
+        persist_directory="./data/chroma",
+        persistent=True
     )
-    embedding_service = get_embedding_service()
-    return ChromaVectorRepository(config, embedding_service)
+    return ChromaVectorRepository(config, metadata_index=get_metadata_index())
+
+
+@lru_cache()
+def get_sharded_vector_repository() -> Optional[ShardedChromaVectorRepository]:
+    settings = get_settings()
+    if not settings.category_sharding_enabled:
+        return None
+    return ShardedChromaVectorRepository(ShardedChromaConfig(
+        persist_directory="./data/chroma",
+        persistent=True,
+        collection_prefix="product_shards",
+        hash_buckets=settings.category_shard_buckets
+    ))
+
+
+def get_backing_search_repository() -> Union[ChromaVectorRepository, ShardedChromaVectorRepository]:
+    sharded = get_sharded_vector_repository()
+    if sharded is None or get_settings().chunk_retrieval_enabled:
+        return get_vector_repository()
+    return sharded
+
+
+@lru_cache()
+def get_search_cache() -> Optional[CachingVectorRepository]:
+    settings = get_settings()
+    if not settings.search_cache_enabled:
+        return None
+    return CachingVectorRepository(get_backing_search_repository(), SearchCacheConfig(
+        max_entries=settings.search_cache_max_entries,
+        ttl_seconds=settings.search_cache_ttl_seconds
+    ))
+
+
+def get_search_repository() -> Union[ChromaVectorRepository, ShardedChromaVectorRepository, CachingVectorRepository]:
+    cache = get_search_cache()
+    return cache if cache is not None else get_backing_search_repository()
+
+
+@lru_cache()
+def get_similar_products_service() -> SimilarProductsService:
+    vector_repo = get_vector_repository()
+    return SimilarProductsService(vector_repo, NeighborGraph(NeighborGraphConfig()))
 
 
 def get_state_repository() -> InMemoryStateRepository:
@@ -63,26 +161,105 @@ def get_intent_detector() -> IntentDetectorService:
 
 
 def get_text_chunker() -> TextChunker:
-    config = ChunkingConfig(
+    config = ChunkConfig(
         chunk_size=500,
-        chunk_overlap=50,
-        min_chunk_size=100
+        chunk_overlap=50
     )
     return TextChunker(config)
 
 
+@lru_cache()
+def get_lexical_index() -> BM25Index:
+    return BM25Index()
+
+
+@lru_cache()
+def get_filter_compiler() -> FilterCompiler:
+    settings = get_settings()
+    return FilterCompiler(
+        category_aliases=AliasTable(aliases=settings.category_aliases),
+        brand_aliases=AliasTable(aliases=settings.brand_aliases)
+    )
+
+
 def get_product_ingestion_service() -> ProductIngestionService:
+    embedding_service = get_embedding_service()
     vector_repo = get_vector_repository()
-    text_chunker = get_text_chunker()
-    return ProductIngestionService(vector_repo, text_chunker)
+    settings = get_settings()
+    return ProductIngestionService(
+        embedding_service,
+        vector_repo,
+        lexical_index=get_lexical_index(),
+        similar_products=get_similar_products_service(),
+        text_chunker=get_text_chunker() if settings.chunk_retrieval_enabled else None,
+        filter_compiler=get_filter_compiler(),
+        shard_repository=get_sharded_vector_repository()
+    )
 
 
+@lru_cache()
+def get_semantic_cache() -> Optional[SemanticAnswerCache]:
+    settings = get_settings()
+    if not settings.semantic_cache_enabled:
+        return None
+    vector_repo = get_vector_repository()
+    return SemanticAnswerCache(
+        get_embedding_service(),
+        SemanticCacheConfig(similarity_threshold=settings.semantic_cache_threshold),
+        generation=lambda: vector_repo.generation
+    )
+
+
+@lru_cache()
 def get_rag_pipeline() -> RAGPipeline:
     vector_repo = get_vector_repository()
     ollama_client = get_ollama_client()
-    retrieval_strategy = HybridRetrievalStrategy(vector_repo)
-    prompt_templates = RAGPromptTemplates()
-    return RAGPipeline(retrieval_strategy, ollama_client, prompt_templates)
+    settings = get_settings()
+    retrieval_config = RetrievalConfig(use_chunks=settings.chunk_retrieval_enabled)
+    embedding_service = get_embedding_service()
+    vector_strategy = VectorSearchStrategy(get_search_repository(), embedding_service, retrieval_config)
+    retrieval_strategy = HybridRetrievalStrategy(vector_strategy, retrieval_config, get_lexical_index())
+    fragment_cache = ProductFragmentCache(generation=lambda: vector_repo.generation)
+    if settings.listwise_rerank_enabled:
+        retrieval_strategy = ListwiseRerankingStrategy(
+            retrieval_strategy,
+            ListwiseReranker(
+                ollama_client,
+                ListwiseRerankConfig(latency_budget_ms=settings.listwise_rerank_budget_ms),
+                generation=lambda: vector_repo.generation
+            )
+        )
+    return RAGPipeline(
+        retrieval_strategy,
+        ollama_client,
+        RAGPipelineConfig(structured_output=settings.structured_output_enabled),
+        fragment_cache,
+        get_semantic_cache()
+    )
+
+
+@lru_cache()
+def get_speculative_retriever() -> SpeculativeRetriever:
+    settings = get_settings()
+    return SpeculativeRetriever(
+        get_embedding_service(),
+        get_search_repository(),
+        SpeculationConfig(enabled=settings.speculative_retrieval_enabled)
+    )
+
+
+@lru_cache()
+def get_query_rewriter() -> QueryRewriter:
+    settings = get_settings()
+    return QueryRewriter(
+        get_embedding_service(),
+        get_ollama_client(),
+        RewriteConfig(
+            enabled=settings.query_rewrite_enabled,
+            llm_fallback=settings.query_rewrite_llm_fallback,
+            llm_budget_ms=settings.query_rewrite_budget_ms
+        )
+    )
 
 
 def get_conversation_manager() -> ConversationManager:
@@ -90,4 +267,13 @@ def get_conversation_manager() -> ConversationManager:
     rag_pipeline = get_rag_pipeline()
     state_repo = get_state_repository()
     memory_repo = get_memory_repository()
-    return ConversationManager(intent_detector, rag_pipeline, state_repo, memory_repo)
+    return ConversationManager(
+        state_repository=state_repo,
+        memory_repository=memory_repo,
+        intent_detector=intent_detector,
+        rag_pipeline=rag_pipeline,
+        config=ConversationManagerConfig(memory_config=MemoryConfig()),
+        filter_compiler=get_filter_compiler(),
+        speculative_retriever=get_speculative_retriever(),
+        query_rewriter=get_query_rewriter()
+    )
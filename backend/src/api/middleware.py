@@ -5,6 +5,8 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from datetime import datetime
 import logging
 
+from src.infrastructure.tracing import set_request_id
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,3 +46,10 @@ async def general_exception_handler(request: Request, exc: Exception):
             "timestamp": datetime.utcnow().isoformat()
         }
     )
+
+
+async def request_id_middleware(request: Request, call_next):
+    request_id = set_request_id(request.headers.get("X-Request-ID"))
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
@@ -2,6 +2,7 @@ from src.api.routes.health import router as health_router
 from src.api.routes.chat import router as chat_router
 from src.api.routes.product import router as product_router
 from src.api.routes.intent import router as intent_router
+from src.api.routes.debug import router as debug_router
 
 
 __all__ = [
@@ -9,4 +10,5 @@ __all__ = [
     "chat_router",
     "product_router",
     "intent_router",
+    "debug_router",
 ]
\ No newline at end of file
@@ -79,6 +79,8 @@ async def send_message(
             entities=entities_dict,
             confidence=response.detected_intent.confidence,
             dialog_state=state.dialog_state.value,
+            ranked_product_ids=state.context.ranked_product_ids,
+            product_reasons=state.context.product_reasons,
             timestamp=datetime.utcnow()
         )
     except HTTPException:
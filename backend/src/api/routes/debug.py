@@ -0,0 +1,108 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+from src.api.schemas import (
+    AnswerPathStatsResponse,
+    FalseHitResponse,
+    SearchCacheStatsResponse,
+    SemanticCacheAuditEntryResponse,
+    SemanticCacheAuditResponse,
+    SemanticCacheStatsResponse,
+    SlowTracesResponse,
+    TraceWaterfallResponse,
+)
+from src.api.dependencies import (
+    get_rag_pipeline,
+    get_search_cache,
+    get_semantic_cache,
+    get_settings,
+    get_trace_buffer,
+)
+from src.application.services.rag_pipeline import RAGPipeline
+from src.application.services.semantic_cache import SemanticAnswerCache
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.vector_store.cached_repository import CachingVectorRepository
+from src.infrastructure.tracing import TraceRingBuffer, render_waterfall
+
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+@router.get("/traces/slow", response_model=SlowTracesResponse)
+async def slow_traces(
+    limit: int = Query(default=20, ge=1, le=200),
+    min_duration_ms: Optional[float] = Query(default=None, ge=0.0),
+    name: Optional[str] = Query(default=None),
+    buffer: TraceRingBuffer = Depends(get_trace_buffer),
+    settings: Settings = Depends(get_settings),
+):
+    threshold = settings.slow_trace_ms if min_duration_ms is None else min_duration_ms
+    traces = buffer.recent(limit=limit, min_duration_ms=threshold, name=name)
+    
+    return SlowTracesResponse(
+        threshold_ms=threshold,
+        buffered=len(buffer),
+        traces=[TraceWaterfallResponse(**render_waterfall(trace)) for trace in traces]
+    )
+
+
+@router.get("/cache/search", response_model=SearchCacheStatsResponse)
+async def search_cache_stats(
+    cache: Optional[CachingVectorRepository] = Depends(get_search_cache),
+):
+    if cache is None:
+        return SearchCacheStatsResponse(enabled=False)
+    
+    stats = cache.stats
+    return SearchCacheStatsResponse(enabled=True, hit_rate=stats.hit_rate, **stats.model_dump())
+
+
+@router.get("/answer-paths", response_model=AnswerPathStatsResponse)
+async def answer_path_stats(
+    pipeline: RAGPipeline = Depends(get_rag_pipeline),
+):
+    metrics = pipeline.answer_path_metrics
+    return AnswerPathStatsResponse(
+        requests=metrics.requests,
+        paths=dict(metrics.paths),
+        llm_calls_avoided=metrics.llm_calls_avoided,
+        fast_path_rate=metrics.fast_path_rate
+    )
+
+
+@router.get("/cache/semantic", response_model=SemanticCacheStatsResponse)
+async def semantic_cache_stats(
+    cache: Optional[SemanticAnswerCache] = Depends(get_semantic_cache),
+):
+    if cache is None:
+        return SemanticCacheStatsResponse(enabled=False)
+    
+    stats = cache.stats
+    return SemanticCacheStatsResponse(
+        enabled=True,
+        hit_rate=stats.hit_rate,
+        false_hit_rate=stats.false_hit_rate,
+        **stats.model_dump()
+    )
+
+
+@router.get("/cache/semantic/audit", response_model=SemanticCacheAuditResponse)
+async def semantic_cache_audit(
+    limit: int = Query(default=50, ge=1, le=1000),
+    cache: Optional[SemanticAnswerCache] = Depends(get_semantic_cache),
+):
+    entries = cache.audit_log[-limit:] if cache is not None else []
+    return SemanticCacheAuditResponse(
+        entries=[SemanticCacheAuditEntryResponse(**entry.model_dump()) for entry in reversed(entries)]
+    )
+
+
+@router.post("/cache/semantic/audit/{audit_id}/false-hit", response_model=FalseHitResponse)
+async def flag_semantic_false_hit(
+    audit_id: int,
+    cache: Optional[SemanticAnswerCache] = Depends(get_semantic_cache),
+):
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Semantic cache is disabled")
+    if not cache.flag_false_hit(audit_id):
+        raise HTTPException(status_code=404, detail="Cache hit not found")
+    return FalseHitResponse(audit_id=audit_id, flagged=True)
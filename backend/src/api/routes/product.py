@@ -8,13 +8,17 @@ from src.api.schemas import (
     ProductSearchResponse,
     ProductIngestRequest,
     ProductIngestResponse,
+    SimilarProductResponse,
+    SimilarProductsResponse,
 )
 from src.api.dependencies import (
     get_vector_repository,
     get_product_ingestion_service,
+    get_similar_products_service,
 )
 from src.infrastructure.vector_store.chroma_repository import ChromaVectorRepository
 from src.application.services.product_ingestion import ProductIngestionService
+from src.application.services.similar_products import SimilarProductsService
 from src.domain.models.product import Product
 from src.domain.value_objects.identifiers import ProductId
 from src.domain.models.search_result import SearchFilters
@@ -116,6 +120,42 @@ async def search_products(
         )
 
 
+@router.get("/{product_id}/similar", response_model=SimilarProductsResponse)
+async def get_similar_products(
+    product_id: str,
+    limit: int = Query(default=10, ge=1, le=50, description="Maximum similar products"),
+    similar_service: SimilarProductsService = Depends(get_similar_products_service),
+):
+    try:
+        if not await similar_service.has_product(product_id):
+            raise HTTPException(status_code=404, detail="Product not found")
+        
+        results = await similar_service.find_similar(product_id, limit=limit)
+        
+        return SimilarProductsResponse(
+            product_id=product_id,
+            similar_products=[
+                SimilarProductResponse(
+                    id=str(result.product.id),
+                    name=result.product.name,
+                    category=result.product.category,
+                    price=result.product.price,
+                    brand=result.product.brand,
+                    similarity=result.score
+                )
+                for result in results
+            ],
+            timestamp=datetime.utcnow()
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get similar products: {str(e)}"
+        )
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 async def get_product(
     product_id: str,
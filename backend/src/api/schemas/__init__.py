@@ -44,6 +44,8 @@ from src.api.schemas.product import (
     ProductSearchResponse,
     ProductIngestRequest,
     ProductIngestResponse,
+    SimilarProductResponse,
+    SimilarProductsResponse,
 )
 
 from src.api.schemas.intent import (
@@ -52,6 +54,18 @@ from src.api.schemas.intent import (
     IntentDetectResponse,
 )
 
+from src.api.schemas.debug import (
+    TraceSpanResponse,
+    TraceWaterfallResponse,
+    SlowTracesResponse,
+    SearchCacheStatsResponse,
+    AnswerPathStatsResponse,
+    SemanticCacheStatsResponse,
+    SemanticCacheAuditEntryResponse,
+    SemanticCacheAuditResponse,
+    FalseHitResponse,
+)
+
 
 __all__ = [
     "HealthResponse",
@@ -70,7 +84,18 @@ __all__ = [
     "ProductSearchResponse",
     "ProductIngestRequest",
     "ProductIngestResponse",
+    "SimilarProductResponse",
+    "SimilarProductsResponse",
     "EntityResponse",
     "IntentDetectRequest",
     "IntentDetectResponse",
+    "TraceSpanResponse",
+    "TraceWaterfallResponse",
+    "SlowTracesResponse",
+    "SearchCacheStatsResponse",
+    "AnswerPathStatsResponse",
+    "SemanticCacheStatsResponse",
+    "SemanticCacheAuditEntryResponse",
+    "SemanticCacheAuditResponse",
+    "FalseHitResponse",
 ]
\ No newline at end of file
@@ -19,6 +19,8 @@ class ChatResponse(BaseModel):
     entities: dict[str, list[str]] = Field(description="Extracted entities")
     confidence: float = Field(ge=0.0, le=1.0, description="Response confidence score")
     dialog_state: str = Field(description="Current dialog state")
+    ranked_product_ids: list[str] = Field(default_factory=list, description="Recommended product IDs, best first")
+    product_reasons: dict[str, str] = Field(default_factory=dict, description="Recommendation reason per product ID")
     timestamp: datetime = Field(description="Response timestamp")
 
 
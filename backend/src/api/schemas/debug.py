@@ -0,0 +1,74 @@
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+
+
+class TraceSpanResponse(BaseModel):
+    name: str = Field(description="Stage name")
+    depth: int = Field(ge=0, description="Nesting depth below the root span")
+    offset_ms: float = Field(description="Start offset from the beginning of the trace")
+    duration_ms: float = Field(description="Stage duration")
+    share: float = Field(description="Fraction of the total trace duration")
+    bar: str = Field(description="Text waterfall bar")
+    attributes: dict[str, Any] = Field(description="Stage attributes")
+    error: Optional[str] = Field(default=None, description="Error raised inside the stage")
+
+
+class TraceWaterfallResponse(BaseModel):
+    trace_id: str = Field(description="Trace identifier")
+    request_id: str = Field(description="Request identifier")
+    started_at: float = Field(description="Trace start as a unix timestamp")
+    duration_ms: float = Field(description="Total trace duration")
+    spans: list[TraceSpanResponse] = Field(description="Spans in start order")
+
+
+class SlowTracesResponse(BaseModel):
+    threshold_ms: float = Field(description="Minimum duration of returned traces")
+    buffered: int = Field(description="Traces currently held in the ring buffer")
+    traces: list[TraceWaterfallResponse] = Field(description="Most recent slow traces, newest first")
+
+
+class SearchCacheStatsResponse(BaseModel):
+    enabled: bool = Field(description="Whether the vector search cache is configured")
+    hits: int = Field(default=0, ge=0, description="Searches served from the cache")
+    misses: int = Field(default=0, ge=0, description="Searches forwarded to the vector store")
+    evictions: int = Field(default=0, ge=0, description="Entries dropped to respect the size limit")
+    expirations: int = Field(default=0, ge=0, description="Entries dropped after their TTL")
+    entries: int = Field(default=0, ge=0, description="Entries currently cached")
+    hit_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Fraction of lookups served from the cache")
+
+
+class AnswerPathStatsResponse(BaseModel):
+    requests: int = Field(ge=0, description="Answered RAG requests")
+    paths: dict[str, int] = Field(description="Requests per answer path")
+    llm_calls_avoided: int = Field(ge=0, description="Requests answered without calling the LLM")
+    fast_path_rate: float = Field(ge=0.0, le=1.0, description="Fraction of requests answered without the LLM")
+
+
+class SemanticCacheStatsResponse(BaseModel):
+    enabled: bool = Field(description="Whether the semantic answer cache is configured")
+    hits: int = Field(default=0, ge=0, description="Requests answered from the cache")
+    misses: int = Field(default=0, ge=0, description="Requests answered by the pipeline")
+    false_hits: int = Field(default=0, ge=0, description="Cache hits flagged as wrong answers")
+    evictions: int = Field(default=0, ge=0, description="Entries dropped to respect the size limit")
+    entries: int = Field(default=0, ge=0, description="Answers currently cached")
+    hit_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Fraction of lookups served from the cache")
+    false_hit_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Fraction of hits flagged as false")
+
+
+class SemanticCacheAuditEntryResponse(BaseModel):
+    audit_id: int = Field(description="Audit entry identifier")
+    outcome: str = Field(description="Audit outcome (hit or false_hit)")
+    query: str = Field(description="Query that looked up the cache")
+    matched_query: Optional[str] = Field(default=None, description="Cached query that answered it")
+    similarity: Optional[float] = Field(default=None, description="Cosine similarity of the match")
+    generation: int = Field(description="Catalog generation at lookup time")
+    recorded_at: float = Field(description="Entry time as a unix timestamp")
+
+
+class SemanticCacheAuditResponse(BaseModel):
+    entries: list[SemanticCacheAuditEntryResponse] = Field(description="Most recent audit entries, newest first")
+
+
+class FalseHitResponse(BaseModel):
+    audit_id: int = Field(description="Flagged audit entry")
+    flagged: bool = Field(description="Whether the hit was flagged and its cached answer evicted")
@@ -55,4 +55,19 @@ class ProductIngestResponse(BaseModel):
     product_id: str = Field(description="Created product identifier")
     status: str = Field(description="Ingestion status")
     message: str = Field(description="Status message")
-    timestamp: datetime = Field(description="Ingestion timestamp")
\ No newline at end of file
+    timestamp: datetime = Field(description="Ingestion timestamp")
+
+
+class SimilarProductResponse(BaseModel):
+    id: str = Field(description="Product identifier")
+    name: str = Field(description="Product name")
+    category: str = Field(description="Product category")
+    price: float = Field(ge=0.0, description="Product price")
+    brand: Optional[str] = Field(default=None, description="Product brand")
+    similarity: float = Field(ge=0.0, le=1.0, description="Cosine similarity to the source product")
+
+
+class SimilarProductsResponse(BaseModel):
+    product_id: str = Field(description="Source product identifier")
+    similar_products: list[SimilarProductResponse] = Field(description="Nearest products by stored vector")
+    timestamp: datetime = Field(description="Response timestamp")
@@ -1,20 +1,62 @@
 from src.application.services.intent_detector import IntentDetectorService
 from src.application.services.text_chunker import TextChunker
 from src.application.services.product_ingestion import ProductIngestionService
+from src.application.services.similar_products import SimilarProductsService
 from src.application.services.prompt_template import (
     PromptTemplate,
     RAGPromptTemplates
 )
+from src.application.services.product_fragments import (
+    FragmentCacheConfig,
+    ProductFragmentCache
+)
+from src.application.services.prompt_builder import (
+    PromptBudget,
+    PromptBuilder
+)
+from src.application.services.reranking import (
+    MultiFactorScorer,
+    RerankConfig,
+    RerankWeights
+)
+from src.application.services.filter_compiler import (
+    AliasTable,
+    CompiledFilters,
+    FilterCompiler
+)
 from src.application.services.context_retrieval import (
     ContextRetrievalStrategy,
     VectorSearchStrategy,
     HybridRetrievalStrategy,
     RetrievalConfig
 )
+from src.application.services.listwise_rerank import (
+    ListwiseRerankConfig,
+    ListwiseReranker,
+    ListwiseRerankingStrategy
+)
+from src.application.services.semantic_cache import (
+    SemanticAnswerCache,
+    SemanticCacheConfig
+)
+from src.application.services.answer_policy import (
+    AnswerPath,
+    AnswerPolicy,
+    AnswerPolicyConfig
+)
 from src.application.services.rag_pipeline import (
     RAGPipeline,
     RAGPipelineConfig
 )
+from src.application.services.speculative_retrieval import (
+    SpeculationConfig,
+    SpeculativeRetriever
+)
+from src.application.services.query_rewriter import (
+    QueryRewriter,
+    RewriteConfig,
+    RewrittenQuery
+)
 from src.application.services.conversation_manager import (
     ConversationManager,
     ConversationManagerConfig
@@ -24,14 +66,38 @@ __all__ = [
     "IntentDetectorService",
     "TextChunker",
     "ProductIngestionService",
+    "SimilarProductsService",
     "PromptTemplate",
     "RAGPromptTemplates",
+    "FragmentCacheConfig",
+    "ProductFragmentCache",
+    "PromptBudget",
+    "PromptBuilder",
+    "MultiFactorScorer",
+    "RerankConfig",
+    "RerankWeights",
+    "AliasTable",
+    "CompiledFilters",
+    "FilterCompiler",
     "ContextRetrievalStrategy",
     "VectorSearchStrategy",
     "HybridRetrievalStrategy",
     "RetrievalConfig",
+    "ListwiseRerankConfig",
+    "ListwiseReranker",
+    "ListwiseRerankingStrategy",
+    "SemanticAnswerCache",
+    "SemanticCacheConfig",
+    "AnswerPath",
+    "AnswerPolicy",
+    "AnswerPolicyConfig",
     "RAGPipeline",
     "RAGPipelineConfig",
+    "SpeculationConfig",
+    "SpeculativeRetriever",
+    "QueryRewriter",
+    "RewriteConfig",
+    "RewrittenQuery",
     "ConversationManager",
     "ConversationManagerConfig",
 ]
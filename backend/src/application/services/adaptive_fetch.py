@@ -0,0 +1,71 @@
+import math
+from typing import Dict
+from pydantic import BaseModel, Field
+
+
+class AdaptiveFetchConfig(BaseModel):
+    enabled: bool = Field(default=True)
+    initial_multiplier: float = Field(default=2.0, ge=1.0)
+    min_multiplier: float = Field(default=1.5, ge=1.0)
+    smoothing: float = Field(default=0.3, gt=0.0, le=1.0)
+    min_survival: float = Field(default=0.05, gt=0.0, le=1.0)
+    widening_factor: float = Field(default=2.0, gt=1.0)
+    max_widening_rounds: int = Field(default=2, ge=0)
+    max_fetch: int = Field(default=200, ge=1)
+
+
+class FetchMetrics(BaseModel):
+    requests: int = 0
+    widening_retries: int = 0
+    fetched_candidates: int = 0
+    requested_results: int = 0
+    returned_results: int = 0
+    short_requests: int = 0
+
+    @property
+    def fill_rate(self) -> float:
+        return self.returned_results / self.requested_results if self.requested_results else 1.0
+
+    @property
+    def retry_rate(self) -> float:
+        return self.widening_retries / self.requests if self.requests else 0.0
+
+
+class SurvivalTracker:
+    def __init__(self, config: AdaptiveFetchConfig):
+        self._config = config
+        self._ratios: Dict[str, float] = {}
+        self._metrics = FetchMetrics()
+
+    @property
+    def metrics(self) -> FetchMetrics:
+        return self._metrics
+
+    def survival_ratio(self, shape: str) -> float:
+        return self._ratios.get(shape, 1.0 / self._config.initial_multiplier)
+
+    def fetch_size(self, shape: str, wanted: int) -> int:
+        if not self._config.enabled:
+            return math.ceil(wanted * self._config.initial_multiplier)
+        size = math.ceil(wanted / self.survival_ratio(shape))
+        floor = math.ceil(wanted * self._config.min_multiplier)
+        return max(wanted, min(max(size, floor), self._config.max_fetch))
+
+    def widened_size(self, current: int) -> int:
+        return min(math.ceil(current * self._config.widening_factor), self._config.max_fetch)
+
+    def observe(self, shape: str, fetched: int, survived: int) -> None:
+        if fetched <= 0:
+            return
+        observed = max(self._config.min_survival, min(1.0, survived / fetched))
+        previous = self.survival_ratio(shape)
+        self._ratios[shape] = self._config.smoothing * observed + (1.0 - self._config.smoothing) * previous
+
+    def record_request(self, wanted: int, returned: int, fetched: int, retries: int) -> None:
+        self._metrics.requests += 1
+        self._metrics.widening_retries += retries
+        self._metrics.fetched_candidates += fetched
+        self._metrics.requested_results += wanted
+        self._metrics.returned_results += returned
+        if returned < wanted:
+            self._metrics.short_requests += 1
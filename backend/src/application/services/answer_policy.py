@@ -0,0 +1,111 @@
+from enum import Enum
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from src.domain.models.rag import RAGRequest, RetrievedContext
+
+
+class AnswerPath(str, Enum):
+    GENERATE = "generate"
+    EMPTY = "empty"
+    SINGLE_MATCH = "single_match"
+    LIST = "list"
+
+
+class AnswerPolicyConfig(BaseModel):
+    enabled: bool = Field(default=True)
+    decisive_score: float = Field(default=0.85, ge=0.0, le=1.0)
+    decisive_margin: float = Field(default=0.15, ge=0.0, le=1.0)
+    list_intents: List[str] = Field(default_factory=list)
+
+
+class AnswerDecision(BaseModel):
+    path: AnswerPath
+    reason: str
+
+    @property
+    def uses_llm(self) -> bool:
+        return self.path == AnswerPath.GENERATE
+
+
+class AnswerPathMetrics(BaseModel):
+    paths: Dict[str, int] = Field(default_factory=lambda: {path.value: 0 for path in AnswerPath})
+
+    @property
+    def requests(self) -> int:
+        return sum(self.paths.values())
+
+    @property
+    def llm_calls_avoided(self) -> int:
+        return self.requests - self.paths[AnswerPath.GENERATE.value]
+
+    @property
+    def fast_path_rate(self) -> float:
+        return self.llm_calls_avoided / self.requests if self.requests else 0.0
+
+    def record(self, decision: AnswerDecision) -> None:
+        self.paths[decision.path.value] += 1
+
+
+def normalize_intent(intent_type) -> str:
+    return str(getattr(intent_type, "value", intent_type) or "").lower()
+
+
+class AnswerPolicy:
+    def __init__(self, config: Optional[AnswerPolicyConfig] = None):
+        self._config = config or AnswerPolicyConfig()
+        self._list_intents = {normalize_intent(intent) for intent in self._config.list_intents}
+        self._metrics = AnswerPathMetrics()
+
+    @property
+    def metrics(self) -> AnswerPathMetrics:
+        return self._metrics
+
+    def decide(self, request: RAGRequest, contexts: List[RetrievedContext]) -> AnswerDecision:
+        decision = self._decide(request, contexts)
+        self._metrics.record(decision)
+        return decision
+
+    def _decide(self, request: RAGRequest, contexts: List[RetrievedContext]) -> AnswerDecision:
+        if not contexts:
+            return AnswerDecision(path=AnswerPath.EMPTY, reason="no products retrieved")
+        if request.response_mode == "generate":
+            return AnswerDecision(path=AnswerPath.GENERATE, reason="requested generation")
+        if request.response_mode == "list":
+            return AnswerDecision(path=AnswerPath.LIST, reason="requested list")
+        if not self._config.enabled:
+            return AnswerDecision(path=AnswerPath.GENERATE, reason="policy disabled")
+
+        if normalize_intent(request.intent_type) in self._list_intents:
+            return AnswerDecision(path=AnswerPath.LIST, reason=f"listing intent {normalize_intent(request.intent_type)}")
+
+        scores = sorted((ctx.relevance_score for ctx in contexts), reverse=True)
+        top = scores[0]
+        margin = top - scores[1] if len(scores) > 1 else top
+        if top >= self._config.decisive_score and margin >= self._config.decisive_margin:
+            return AnswerDecision(path=AnswerPath.SINGLE_MATCH, reason=f"decisive match {top:.2f} (margin {margin:.2f})")
+
+        return AnswerDecision(path=AnswerPath.GENERATE, reason="retrieval not decisive")
+
+
+def render_templated_answer(decision: AnswerDecision, contexts: List[RetrievedContext]) -> str:
+    if decision.path == AnswerPath.SINGLE_MATCH:
+        best = max(contexts, key=lambda ctx: ctx.relevance_score)
+        product = best.product
+        answer = f"The best match is {product.name} (${product.price:.2f}, {product.category})."
+        if product.features:
+            answer += f" Key features: {', '.join(product.features[:3])}."
+        if product.rating is not None:
+            answer += f" Rated {product.rating:.1f}/5."
+        return answer
+
+    lines = [f"Here are {len(contexts)} matching products:"]
+    for position, ctx in enumerate(contexts, 1):
+        product = ctx.product
+        line = f"{position}. {product.name} - ${product.price:.2f}"
+        if product.brand:
+            line += f" ({product.brand})"
+        if product.rating is not None:
+            line += f", rated {product.rating:.1f}/5"
+        lines.append(line)
+    return "\n".join(lines)
@@ -1,10 +1,26 @@
-from typing import List, Protocol
+import asyncio
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+import numpy as np
 from pydantic import BaseModel, Field
 
 from src.domain.models.rag import RetrievedContext, RAGRequest
-from src.domain.models.search_result import SearchResult
+from src.domain.models.search_result import SearchHit
 from src.domain.repositories.vector_repository import VectorRepository
 from src.domain.repositories.embedding_repository import EmbeddingRepository
+from src.infrastructure.lexical.bm25_index import BM25Index
+from src.infrastructure.tracing import span, traced
+from src.application.services.reranking import MultiFactorScorer
+from src.application.services.diversity import maximal_marginal_relevance
+from src.application.services.filter_compiler import (
+    filter_fields,
+    hit_matches_filters,
+    product_matches_filters
+)
+from src.application.services.adaptive_fetch import (
+    AdaptiveFetchConfig,
+    FetchMetrics,
+    SurvivalTracker
+)
 
 
 class ContextRetrievalStrategy(Protocol):
@@ -14,13 +30,27 @@ class ContextRetrievalStrategy(Protocol):
         request: RAGRequest
     ) -> List[RetrievedContext]:
         ...
+    
+    async def retrieve_many(
+        self, 
+        queries: List[str], 
+        request: RAGRequest
+    ) -> List[List[RetrievedContext]]:
+        ...
 
 
 class RetrievalConfig(BaseModel):
     max_results: int = Field(default=10, ge=1, le=50)
     min_relevance: float = Field(default=0.5, ge=0.0, le=1.0)
+    diversity_method: str = Field(default="mmr", pattern="^(mmr|heuristic|none)$")
     diversity_threshold: float = Field(default=0.8, ge=0.0, le=1.0)
+    mmr_lambda: float = Field(default=0.7, ge=0.0, le=1.0)
     include_metadata: bool = Field(default=True)
+    lexical_candidates: int = Field(default=20, ge=1, le=200)
+    rrf_k: int = Field(default=60, ge=1)
+    use_chunks: bool = Field(default=False)
+    chunk_aggregation: str = Field(default="max", pattern="^(max|sum)$")
+    adaptive_fetch: AdaptiveFetchConfig = Field(default_factory=AdaptiveFetchConfig)
 
 
 class VectorSearchStrategy:
@@ -33,40 +63,181 @@ class VectorSearchStrategy:
         self._vector_repository = vector_repository
         self._embedding_service = embedding_service
         self._config = config
+        self._survival = SurvivalTracker(config.adaptive_fetch)
     
+    @property
+    def metrics(self) -> FetchMetrics:
+        return self._survival.metrics
+    
+    @traced("retrieval.vector")
     async def retrieve_context(
         self, 
         query: str, 
         request: RAGRequest
     ) -> List[RetrievedContext]:
-        query_embedding = await self._embedding_service.embed_text(query)
+        if request.query_embedding is not None and query == request.query:
+            query_embedding = request.query_embedding
+        else:
+            with span("retrieval.embed"):
+                query_embedding = await self._embedding_service.embed_text(query)
+        
+        max_results = min(request.max_results, self._config.max_results)
+        shape = self._filter_shape(request)
+        top_k = self._survival.fetch_size(shape, max_results)
+        
+        hits = self._from_candidate_pool(query, request, top_k)
+        if hits is None:
+            with span("retrieval.vector_search", top_k=top_k):
+                hits = await self._search(query_embedding, top_k, request.filters)
+        with span("retrieval.select", candidates=len(hits)):
+            selected = await self._fill(query_embedding, hits, top_k, request, max_results, shape)
+        
+        return await self._to_contexts(selected)
+    
+    @traced("retrieval.vector_many")
+    async def retrieve_many(
+        self, 
+        queries: List[str], 
+        request: RAGRequest
+    ) -> List[List[RetrievedContext]]:
+        if not queries:
+            return []
+        
+        with span("retrieval.embed", queries=len(queries)):
+            query_embeddings = await self._embedding_service.embed_batch(queries)
         
         max_results = min(request.max_results, self._config.max_results)
+        shape = self._filter_shape(request)
+        top_k = self._survival.fetch_size(shape, max_results)
+        
+        if self._config.use_chunks:
+            per_query_hits = await asyncio.gather(*[
+                self._search(query_embedding, top_k, request.filters)
+                for query_embedding in query_embeddings
+            ])
+        else:
+            per_query_hits = await self._vector_repository.search_many(
+                query_embeddings=query_embeddings,
+                top_k=top_k,
+                filters=request.filters,
+                include_embeddings=self._uses_mmr
+            )
         
-        search_results = await self._vector_repository.search(
+        results = []
+        for query_embedding, hits in zip(query_embeddings, per_query_hits):
+            selected = await self._fill(query_embedding, hits, top_k, request, max_results, shape)
+            results.append(await self._to_contexts(selected))
+        return results
+    
+    async def _search(
+        self,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchHit]:
+        if self._config.use_chunks:
+            return await self._vector_repository.search_chunk_hits(
+                query_embedding=query_embedding,
+                top_k=top_k,
+                filters=filters,
+                aggregation=self._config.chunk_aggregation,
+                include_embeddings=self._uses_mmr
+            )
+        return await self._vector_repository.search_hits(
             query_embedding=query_embedding,
-            top_k=max_results * 2,
-            min_score=request.min_relevance
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=self._uses_mmr
         )
+    
+    def _from_candidate_pool(self, query: str, request: RAGRequest, top_k: int) -> Optional[List[SearchHit]]:
+        pool = request.candidate_pool
+        if pool is None or query != request.query or self._config.use_chunks:
+            return None
+        if self._uses_mmr and any(hit.embedding is None for hit in pool.hits):
+            return None
         
-        filtered_results = [
-            result for result in search_results 
-            if result.score >= request.min_relevance
-        ]
+        matched = [hit for hit in pool.hits if hit_matches_filters(hit, request.filters)]
+        if len(matched) >= top_k:
+            return matched[:top_k]
+        return matched if pool.exhaustive else None
+    
+    async def _fill(
+        self,
+        query_embedding: List[float],
+        hits: List[SearchHit],
+        top_k: int,
+        request: RAGRequest,
+        max_results: int,
+        shape: str
+    ) -> List[SearchHit]:
+        candidates = [hit for hit in hits if hit.score >= request.min_relevance]
+        selected, survivors = self._diversify(candidates, max_results)
         
-        diverse_results = self._apply_diversity_filter(filtered_results)
+        retries = 0
+        while (
+            len(selected) < max_results
+            and retries < self._config.adaptive_fetch.max_widening_rounds
+            and self._can_widen(hits, top_k, request.min_relevance)
+        ):
+            retries += 1
+            seen = len(hits)
+            top_k = self._survival.widened_size(top_k)
+            hits = await self._search(query_embedding, top_k, request.filters)
+            candidates.extend(hit for hit in hits[seen:] if hit.score >= request.min_relevance)
+            selected, survivors = self._diversify(candidates, max_results)
+        
+        self._survival.observe(shape, len(hits), survivors)
+        self._survival.record_request(max_results, len(selected), len(hits), retries)
+        return selected
+    
+    def _can_widen(self, hits: List[SearchHit], top_k: int, min_relevance: float) -> bool:
+        if not self._config.adaptive_fetch.enabled or not hits:
+            return False
+        if len(hits) < top_k or top_k >= self._config.adaptive_fetch.max_fetch:
+            return False
+        return hits[-1].score >= min_relevance
+    
+    def _filter_shape(self, request: RAGRequest) -> str:
+        fields = ",".join(filter_fields(request.filters))
+        return f"{self._config.diversity_method}|{request.min_relevance:.2f}|{fields}"
+    
+    async def _to_contexts(self, hits: List[SearchHit]) -> List[RetrievedContext]:
+        if self._config.use_chunks:
+            return await self._convert_chunks_to_contexts(hits)
         
         contexts = [
-            self._convert_to_context(result)
-            for result in diverse_results[:max_results]
+            self._convert_to_context(hit)
+            for hit in hits
         ]
         
         return contexts
     
+    @property
+    def _uses_mmr(self) -> bool:
+        return self._config.diversity_method == "mmr"
+    
+    def _diversify(self, hits: List[SearchHit], max_results: int) -> Tuple[List[SearchHit], int]:
+        if self._config.diversity_method == "none":
+            return hits[:max_results], len(hits)
+        if self._uses_mmr and hits and all(hit.embedding is not None for hit in hits):
+            return self._apply_mmr(hits, max_results), len(hits)
+        diverse_hits = self._apply_diversity_filter(hits)
+        return diverse_hits[:max_results], len(diverse_hits)
+    
+    def _apply_mmr(self, hits: List[SearchHit], max_results: int) -> List[SearchHit]:
+        selected = maximal_marginal_relevance(
+            [hit.score for hit in hits],
+            np.asarray([hit.embedding for hit in hits], dtype=np.float32),
+            k=max_results,
+            lambda_mult=self._config.mmr_lambda
+        )
+        return [hits[i] for i in selected]
+    
     def _apply_diversity_filter(
         self, 
-        results: List[SearchResult]
-    ) -> List[SearchResult]:
+        results: List[SearchHit]
+    ) -> List[SearchHit]:
         if not results or len(results) <= 1:
             return results
         
@@ -85,39 +256,61 @@ class VectorSearchStrategy:
     
     def _calculate_diversity(
         self, 
-        result1: SearchResult, 
-        result2: SearchResult
+        result1: SearchHit, 
+        result2: SearchHit
     ) -> float:
-        if result1.product.category != result2.product.category:
+        if result1.category != result2.category:
             return 1.0
         
-        if result1.product.brand != result2.product.brand:
+        if result1.brand != result2.brand:
             return 0.9
         
-        price_diff = abs(result1.product.price - result2.product.price)
+        price_diff = abs(result1.price - result2.price)
         if price_diff > 100:
             return 0.8
         
         return 0.6
     
-    def _convert_to_context(self, result: SearchResult) -> RetrievedContext:
-        return RetrievedContext(
-            product=result.product,
-            relevance_score=result.score,
+    def _convert_to_context(self, hit: SearchHit) -> RetrievedContext:
+        return RetrievedContext.model_construct(
+            product=hit.to_product(),
+            relevance_score=hit.score,
             chunk_text=None,
             chunk_position=None
         )
+    
+    async def _convert_chunks_to_contexts(self, hits: List[SearchHit]) -> List[RetrievedContext]:
+        if not hits:
+            return []
+        
+        products = await self._vector_repository.get_products([hit.product_id for hit in hits])
+        products_by_id = {str(product.id): product for product in products}
+        
+        return [
+            RetrievedContext.model_construct(
+                product=products_by_id.get(hit.product_id) or hit.to_product(),
+                relevance_score=hit.score,
+                chunk_text=hit.document,
+                chunk_position=hit.chunk_position
+            )
+            for hit in hits
+        ]
 
 
 class HybridRetrievalStrategy:
     def __init__(
         self,
         vector_strategy: VectorSearchStrategy,
-        config: RetrievalConfig
+        config: RetrievalConfig,
+        lexical_index: Optional[BM25Index] = None,
+        scorer: Optional[MultiFactorScorer] = None
     ):
         self._vector_strategy = vector_strategy
         self._config = config
+        self._lexical_index = lexical_index
+        self._scorer = scorer or MultiFactorScorer()
     
+    @traced("retrieval.hybrid")
     async def retrieve_context(
         self, 
         query: str, 
@@ -128,41 +321,83 @@ class HybridRetrievalStrategy:
             request
         )
         
-        reranked_contexts = self._rerank_by_multiple_factors(vector_contexts)
-        
-        return reranked_contexts[:request.max_results]
+        return self._combine_with_lexical(query, vector_contexts, request)
     
-    def _rerank_by_multiple_factors(
+    @traced("retrieval.hybrid_many")
+    async def retrieve_many(
         self, 
-        contexts: List[RetrievedContext]
+        queries: List[str], 
+        request: RAGRequest
+    ) -> List[List[RetrievedContext]]:
+        per_query_contexts = await self._vector_strategy.retrieve_many(queries, request)
+        
+        return [
+            self._combine_with_lexical(query, vector_contexts, request)
+            for query, vector_contexts in zip(queries, per_query_contexts)
+        ]
+    
+    def _combine_with_lexical(
+        self,
+        query: str,
+        vector_contexts: List[RetrievedContext],
+        request: RAGRequest
     ) -> List[RetrievedContext]:
-        scored_contexts = []
+        if not self._lexical_index:
+            with span("retrieval.rerank", candidates=len(vector_contexts)):
+                return self._rerank_by_multiple_factors(vector_contexts, request=request)
         
-        for ctx in contexts:
-            relevance_weight = 0.7
-            price_weight = 0.2
-            rating_weight = 0.1
-            
-            relevance_score = ctx.relevance_score * relevance_weight
-            
-            price_score = self._normalize_price_score(ctx.product.price) * price_weight
-            
-            rating_score = (ctx.product.rating / 5.0) * rating_weight
-            
-            final_score = relevance_score + price_score + rating_score
-            
-            scored_contexts.append((ctx, final_score))
+        with span("retrieval.lexical"):
+            lexical_hits = self._lexical_index.search(query, top_k=self._config.lexical_candidates)
+            contexts, fused_scores = self._fuse_rankings(vector_contexts, lexical_hits, request.filters)
+        
+        with span("retrieval.rerank", candidates=len(contexts)):
+            return self._rerank_by_multiple_factors(contexts, fused_scores, request)
+    
+    def _fuse_rankings(
+        self,
+        vector_contexts: List[RetrievedContext],
+        lexical_hits: List[Tuple[str, float]],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[RetrievedContext], List[float]]:
+        rrf_k = self._config.rrf_k
+        contexts: Dict[str, RetrievedContext] = {}
+        fused: Dict[str, float] = {}
         
-        scored_contexts.sort(key=lambda x: x[1], reverse=True)
+        for rank, ctx in enumerate(vector_contexts):
+            product_id = str(ctx.product.id)
+            contexts[product_id] = ctx
+            fused[product_id] = 1.0 / (rrf_k + rank + 1)
+        
+        max_fused = 2.0 / (rrf_k + 1)
+        for rank, (product_id, _) in enumerate(lexical_hits):
+            fused[product_id] = fused.get(product_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+            if product_id in contexts:
+                continue
+            product = self._lexical_index.get_product(product_id)
+            if product is None or not product_matches_filters(product, filters):
+                continue
+            contexts[product_id] = RetrievedContext(
+                product=product,
+                relevance_score=fused[product_id] / max_fused,
+                chunk_text=None,
+                chunk_position=None
+            )
         
-        return [ctx for ctx, _ in scored_contexts]
+        ordered_ids = list(contexts)
+        return (
+            [contexts[product_id] for product_id in ordered_ids],
+            [fused[product_id] / max_fused for product_id in ordered_ids]
+        )
     
-    def _normalize_price_score(self, price: float) -> float:
-        if price <= 50:
-            return 1.0
-        elif price <= 200:
-            return 0.8
-        elif price <= 500:
-            return 0.6
-        else:
-            return 0.4
\ No newline at end of file
+    def _rerank_by_multiple_factors(
+        self, 
+        contexts: List[RetrievedContext],
+        relevance_scores: Optional[List[float]] = None,
+        request: Optional[RAGRequest] = None
+    ) -> List[RetrievedContext]:
+        return self._scorer.rerank(
+            contexts,
+            relevance_scores=relevance_scores,
+            price_range=request.price_range if request else None,
+            top_n=request.max_results if request else None
+        )
@@ -17,6 +17,17 @@ from src.domain.repositories.conversation_state_repository import (
 )
 from src.application.services.intent_detector import IntentDetectorService
 from src.application.services.rag_pipeline import RAGPipeline
+from src.application.services.answer_policy import normalize_intent
+from src.application.services.filter_compiler import FilterCompiler
+from src.application.services.speculative_retrieval import Speculation, SpeculativeRetriever
+from src.application.services.query_rewriter import QueryRewriter, RewrittenQuery
+from src.infrastructure.tracing import current_span, span, traced
+
+_PRODUCT_INTENTS = ("SEARCH_PRODUCT", "GET_RECOMMENDATION", "COMPARE_PRODUCTS")
+
+
+def _intent_name(intent: DetectedIntent) -> str:
+    return normalize_intent(intent.intent_type).upper()
 
 
 class ConversationManagerConfig:
@@ -38,13 +49,19 @@ class ConversationManager:
         memory_repository: ConversationMemoryRepository,
         intent_detector: IntentDetectorService,
         rag_pipeline: RAGPipeline,
-        config: ConversationManagerConfig
+        config: ConversationManagerConfig,
+        filter_compiler: Optional[FilterCompiler] = None,
+        speculative_retriever: Optional[SpeculativeRetriever] = None,
+        query_rewriter: Optional[QueryRewriter] = None
     ):
         self._state_repo = state_repository
         self._memory_repo = memory_repository
         self._intent_detector = intent_detector
         self._rag_pipeline = rag_pipeline
         self._config = config
+        self._filter_compiler = filter_compiler or FilterCompiler()
+        self._speculative_retriever = speculative_retriever
+        self._query_rewriter = query_rewriter
 
     async def start_conversation(self, user_id: UUID) -> ConversationState:
         conversation_id = uuid4()
@@ -66,21 +83,27 @@ class ConversationManager:
         
         return state
 
+    @traced("conversation.turn")
     async def process_message(
         self,
         conversation_id: UUID,
         user_message: str
     ) -> tuple[str, ConversationState]:
-        state = await self._state_repo.get_state(conversation_id)
-        if not state:
-            raise ValueError(f"Conversation {conversation_id} not found")
-        
-        memory = await self._memory_repo.get_memory(conversation_id)
-        if not memory:
-            memory = ConversationMemory(
-                conversation_id=conversation_id,
-                max_turns=self._config.memory_config.max_turns
-            )
+        turn = current_span()
+        if turn:
+            turn.set(conversation_id=str(conversation_id))
+        
+        with span("conversation.load_state"):
+            state = await self._state_repo.get_state(conversation_id)
+            if not state:
+                raise ValueError(f"Conversation {conversation_id} not found")
+            
+            memory = await self._memory_repo.get_memory(conversation_id)
+            if not memory:
+                memory = ConversationMemory(
+                    conversation_id=conversation_id,
+                    max_turns=self._config.memory_config.max_turns
+                )
         
         start_time = datetime.utcnow()
         
@@ -90,16 +113,28 @@ class ConversationManager:
             content=user_message
         )
         
-        detected_intent = await self._intent_detector.detect_intent(user_message)
-        
-        await self._update_state_from_intent(state, detected_intent)
-        
-        response_text = await self._generate_response(
-            state=state,
-            memory=memory,
-            user_message=user_message,
-            detected_intent=detected_intent
-        )
+        speculation = self._speculate(user_message)
+        try:
+            detected_intent = await self._intent_detector.detect_intent(user_message)
+            if turn:
+                turn.set(intent=str(getattr(detected_intent.intent_type, "value", detected_intent.intent_type)))
+            if speculation and _intent_name(detected_intent) not in _PRODUCT_INTENTS:
+                speculation.cancel()
+            
+            await self._update_state_from_intent(state, detected_intent)
+            state.set_ranking([], {})
+            
+            response_text = await self._generate_response(
+                state=state,
+                memory=memory,
+                user_message=user_message,
+                detected_intent=detected_intent,
+                speculation=speculation
+            )
+        except BaseException:
+            if speculation:
+                speculation.cancel()
+            raise
         
         assistant_msg = Message(
             conversation_id=conversation_id,
@@ -117,8 +152,9 @@ class ConversationManager:
         state.increment_message_count()
         
         if self._config.enable_state_persistence:
-            await self._state_repo.save_state(state)
-            await self._memory_repo.save_memory(memory)
+            with span("conversation.persist_state"):
+                await self._state_repo.save_state(state)
+                await self._memory_repo.save_memory(memory)
         
         return response_text, state
 
@@ -141,32 +177,34 @@ class ConversationManager:
             "THANK_YOU": DialogState.CLOSING,
         }
         
-        new_state = intent_to_state_map.get(intent.intent_type)
+        new_state = intent_to_state_map.get(_intent_name(intent))
         if new_state and new_state != state.current_state:
             state.transition_to(new_state)
         
         for entity in intent.entities:
-            state.add_entity(entity.entity_type, entity.value)
+            state.add_entity(entity.type.value, entity.value)
 
     async def _generate_response(
         self,
         state: ConversationState,
         memory: ConversationMemory,
         user_message: str,
-        detected_intent: DetectedIntent
+        detected_intent: DetectedIntent,
+        speculation: Optional[Speculation] = None
     ) -> str:
-        if detected_intent.intent_type == "GREETING":
+        intent_name = _intent_name(detected_intent)
+        if intent_name == "GREETING":
             return "Hello! I'm here to help you find the perfect products. What are you looking for today?"
         
-        if detected_intent.intent_type == "THANK_YOU":
+        if intent_name == "THANK_YOU":
             state.mark_completed()
             return "You're welcome! Feel free to come back anytime you need product recommendations. Have a great day!"
         
-        if detected_intent.intent_type == "CLARIFICATION":
+        if intent_name == "CLARIFICATION":
             return await self._handle_clarification(state, user_message)
         
-        if detected_intent.intent_type in ["SEARCH_PRODUCT", "GET_RECOMMENDATION", "COMPARE_PRODUCTS"]:
-            return await self._handle_product_query(state, memory, user_message, detected_intent)
+        if intent_name in _PRODUCT_INTENTS:
+            return await self._handle_product_query(state, memory, user_message, detected_intent, speculation)
         
         return "I'm here to help you find products. Could you tell me more about what you're looking for?"
 
@@ -180,7 +218,8 @@ class ConversationManager:
         state: ConversationState,
         memory: ConversationMemory,
         query: str,
-        intent: DetectedIntent
+        intent: DetectedIntent,
+        speculation: Optional[Speculation] = None
     ) -> str:
         context_messages = memory.get_context_window(
             max_tokens=self._config.memory_config.max_context_tokens
@@ -191,42 +230,59 @@ class ConversationManager:
             for msg in context_messages[-3:]
         ])
         
-        filters = self._build_filters_from_entities(intent)
+        rewritten = await self._rewrite_query(state, query, intent)
+        compiled = self._filter_compiler.compile(rewritten.entities)
+        query_embedding, candidate_pool = None, None
+        if rewritten.rewritten:
+            if speculation:
+                speculation.cancel()
+            for entity_type, value in rewritten.entities:
+                state.add_entity(entity_type, value)
+            query_embedding = await self._query_rewriter.embed(state.conversation_id, rewritten.query)
+        elif speculation:
+            speculative = await speculation.result()
+            if speculative:
+                query_embedding, candidate_pool = speculative.embedding, speculative.pool
         
         rag_request = RAGRequest(
-            query=query,
+            query=rewritten.query,
             conversation_context=conversation_context if conversation_context else None,
             max_results=5,
-            filters=filters
+            filters=compiled.where,
+            price_range=compiled.price_range,
+            intent_type=getattr(intent.intent_type, "value", intent.intent_type),
+            query_embedding=query_embedding,
+            candidate_pool=candidate_pool
         )
         
-        rag_response = await self._rag_pipeline.generate_recommendation(rag_request)
+        rag_response = await self._rag_pipeline.process_query(rag_request)
         
         for product in rag_response.recommended_products:
             state.add_recommended_product(product.id)
+        state.set_ranking(rag_response.ranked_product_ids, rag_response.product_reasons)
         
-        state.add_search_query(query)
+        state.add_search_query(rewritten.query)
         
-        return rag_response.response_text
+        return rag_response.reasoning
 
-    def _build_filters_from_entities(self, intent: DetectedIntent) -> Optional[dict]:
-        filters = {}
-        
-        for entity in intent.entities:
-            if entity.entity_type == "CATEGORY":
-                filters["category"] = entity.value
-            elif entity.entity_type == "BRAND":
-                filters["brand"] = entity.value
-            elif entity.entity_type == "PRICE_RANGE":
-                filters["price_range"] = entity.value
-        
-        return filters if filters else None
+    async def _rewrite_query(self, state: ConversationState, query: str, intent: DetectedIntent) -> RewrittenQuery:
+        entities = [(entity.type.value, entity.value) for entity in intent.entities]
+        if self._query_rewriter is None:
+            return RewrittenQuery(query=query, entities=entities)
+        return await self._query_rewriter.rewrite(query, state.context, entities)
+
+    def _speculate(self, user_message: str) -> Optional[Speculation]:
+        if self._speculative_retriever is None:
+            return None
+        return self._speculative_retriever.start(user_message)
 
     async def end_conversation(self, conversation_id: UUID) -> None:
         state = await self._state_repo.get_state(conversation_id)
         if state:
             state.mark_completed()
             await self._state_repo.save_state(state)
+        if self._query_rewriter:
+            self._query_rewriter.forget(conversation_id)
 
     async def get_conversation_state(self, conversation_id: UUID) -> Optional[ConversationState]:
         return await self._state_repo.get_state(conversation_id)
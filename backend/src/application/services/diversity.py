@@ -0,0 +1,32 @@
+from typing import List, Sequence
+import numpy as np
+
+
+def maximal_marginal_relevance(
+    relevance: Sequence[float],
+    embeddings: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.7
+) -> List[int]:
+    candidates = np.asarray(embeddings, dtype=np.float32)
+    count = candidates.shape[0]
+    k = min(k, count)
+    if k <= 0:
+        return []
+
+    norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+    candidates = candidates / np.where(norms == 0.0, 1.0, norms)
+    relevance_term = lambda_mult * np.asarray(relevance, dtype=np.float32)
+    max_similarity = np.zeros(count, dtype=np.float32)
+    available = np.ones(count, dtype=bool)
+
+    selected = [int(np.argmax(relevance_term))]
+    available[selected[0]] = False
+    while len(selected) < k:
+        np.maximum(max_similarity, candidates @ candidates[selected[-1]], out=max_similarity)
+        scores = relevance_term - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+    return selected
@@ -0,0 +1,280 @@
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from src.domain.models.product import Product
+from src.domain.models.search_result import SearchHit
+from src.domain.value_objects.entities import PriceRange
+
+_NUMBER = r"\$?\s*(\d[\d,]*(?:\.\d+)?)\s*(k)?"
+_BETWEEN = re.compile(rf"(?:between|from)?\s*{_NUMBER}\s*(?:-|to|and|–)\s*{_NUMBER}")
+_UPPER = re.compile(rf"(?:under|below|less than|cheaper than|up to|at most|max(?:imum)?|no more than|within|<=?)\s*{_NUMBER}")
+_LOWER = re.compile(rf"(?:over|above|more than|at least|min(?:imum)?|starting at|from|>=?)\s*{_NUMBER}")
+_AROUND = re.compile(rf"(?:around|about|roughly|approximately|~)\s*{_NUMBER}")
+_BARE = re.compile(rf"{_NUMBER}\s*(?:dollars?|usd|bucks)?")
+
+
+class PriceTiers(BaseModel):
+    budget_max: float = Field(default=50.0, gt=0.0)
+    mid_range: Tuple[float, float] = Field(default=(50.0, 200.0))
+    premium_min: float = Field(default=500.0, gt=0.0)
+    around_tolerance: float = Field(default=0.2, gt=0.0, lt=1.0)
+
+
+BUDGET_WORDS = ("cheap", "budget", "affordable", "inexpensive", "low cost", "low-cost", "economical")
+MID_RANGE_WORDS = ("mid-range", "mid range", "midrange", "moderately priced", "mid-priced")
+PREMIUM_WORDS = ("premium", "expensive", "high-end", "high end", "luxury", "top of the line", "flagship")
+
+
+def _amount(digits: str, thousands: Optional[str]) -> float:
+    value = float(digits.replace(",", ""))
+    return value * 1000 if thousands else value
+
+
+def parse_price_expression(text: str, tiers: Optional[PriceTiers] = None) -> Optional[PriceRange]:
+    tiers = tiers or PriceTiers()
+    normalized = text.strip().lower()
+    if not normalized:
+        return None
+    return _parse_amounts(normalized, tiers) or _parse_tier_words(normalized, tiers)
+
+
+def is_explicit_price(text: str) -> bool:
+    return _parse_amounts(text.strip().lower(), PriceTiers()) is not None
+
+
+def _parse_amounts(normalized: str, tiers: PriceTiers) -> Optional[PriceRange]:
+    match = _BETWEEN.search(normalized)
+    if match:
+        low, high = sorted((_amount(match.group(1), match.group(2)), _amount(match.group(3), match.group(4))))
+        return PriceRange(min_price=low, max_price=high)
+
+    match = _UPPER.search(normalized)
+    if match:
+        return PriceRange(min_price=0.0, max_price=_amount(match.group(1), match.group(2)))
+
+    match = _LOWER.search(normalized)
+    if match:
+        return PriceRange(min_price=_amount(match.group(1), match.group(2)), max_price=math.inf)
+
+    match = _AROUND.search(normalized)
+    if match:
+        center = _amount(match.group(1), match.group(2))
+        spread = center * tiers.around_tolerance
+        return PriceRange(min_price=center - spread, max_price=center + spread)
+
+    match = _BARE.fullmatch(normalized)
+    if match:
+        return PriceRange(min_price=0.0, max_price=_amount(match.group(1), match.group(2)))
+    return None
+
+
+def _parse_tier_words(normalized: str, tiers: PriceTiers) -> Optional[PriceRange]:
+    if any(word in normalized for word in MID_RANGE_WORDS):
+        return PriceRange(min_price=tiers.mid_range[0], max_price=tiers.mid_range[1])
+    if any(word in normalized for word in BUDGET_WORDS):
+        return PriceRange(min_price=0.0, max_price=tiers.budget_max)
+    if any(word in normalized for word in PREMIUM_WORDS):
+        return PriceRange(min_price=tiers.premium_min, max_price=math.inf)
+    return None
+
+
+def normalize_entity_type(entity_type) -> str:
+    return str(getattr(entity_type, "value", entity_type) or "").upper()
+
+
+def _alias_key(value: str) -> str:
+    key = re.sub(r"[^a-z0-9]+", "", value.lower())
+    if len(key) > 3 and key.endswith("es") and key[:-2].endswith(("ch", "sh", "x")):
+        return key[:-2]
+    if len(key) > 3 and key.endswith("s") and not key.endswith("ss"):
+        return key[:-1]
+    return key
+
+
+class AliasTable:
+    def __init__(
+        self,
+        lookup: Optional[Dict[str, str]] = None,
+        aliases: Optional[Mapping[str, Iterable[str]]] = None
+    ):
+        self._lookup = lookup or {}
+        self._aliases = {_alias_key(canonical): list(names) for canonical, names in (aliases or {}).items()}
+        self._aliased: Dict[str, str] = {}
+        self._link(self._lookup.values())
+
+    @classmethod
+    def build(
+        cls,
+        canonical_values: Iterable[str],
+        aliases: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> "AliasTable":
+        return cls({_alias_key(value): value for value in canonical_values}, aliases)
+
+    def __len__(self) -> int:
+        return len(set(self._lookup.values()))
+
+    def add(self, canonical_values: Iterable[str]) -> None:
+        added = [
+            self._lookup.setdefault(_alias_key(value), value)
+            for value in canonical_values
+            if value and value.strip()
+        ]
+        self._link(added)
+
+    def resolve(self, value: str) -> Optional[str]:
+        key = _alias_key(value)
+        return self._lookup.get(key) or self._aliased.get(key)
+
+    def _link(self, canonical_values: Iterable[str]) -> None:
+        for value in canonical_values:
+            for name in self._aliases.get(_alias_key(value), ()):
+                self._aliased.setdefault(_alias_key(name), value)
+
+
+class CompiledFilters(BaseModel):
+    where: Optional[Dict[str, Any]] = None
+    price_range: Optional[PriceRange] = None
+    unresolved: List[str] = Field(default_factory=list)
+
+
+class FilterCompiler:
+    def __init__(
+        self,
+        category_aliases: Optional[AliasTable] = None,
+        brand_aliases: Optional[AliasTable] = None,
+        price_tiers: Optional[PriceTiers] = None
+    ):
+        self._category_aliases = AliasTable() if category_aliases is None else category_aliases
+        self._brand_aliases = AliasTable() if brand_aliases is None else brand_aliases
+        self._price_tiers = price_tiers or PriceTiers()
+
+    def learn_catalog(self, products: Iterable[Product]) -> None:
+        products = list(products)
+        self._category_aliases.add(product.category for product in products)
+        self._brand_aliases.add(product.brand for product in products if product.brand)
+
+    def compile(self, entities: Iterable[Tuple[str, str]]) -> CompiledFilters:
+        categories: List[str] = []
+        brands: List[str] = []
+        price_range: Optional[PriceRange] = None
+        index_range: Optional[PriceRange] = None
+        unresolved: List[str] = []
+
+        for entity_type, value in entities:
+            kind = normalize_entity_type(entity_type)
+            if kind == "CATEGORY":
+                self._collect(self._category_aliases, value, categories, unresolved)
+            elif kind == "BRAND":
+                self._collect(self._brand_aliases, value, brands, unresolved)
+            elif kind == "PRICE_RANGE":
+                parsed = parse_price_expression(value, self._price_tiers)
+                if parsed is None:
+                    unresolved.append(value)
+                else:
+                    price_range = self._intersect(price_range, parsed)
+                    if is_explicit_price(value):
+                        index_range = self._intersect(index_range, parsed)
+
+        clauses: List[Dict[str, Any]] = []
+        if categories:
+            clauses.append(self._membership("category", categories))
+        if brands:
+            clauses.append(self._membership("brand", brands))
+        if index_range is not None:
+            if index_range.min_price > 0:
+                clauses.append({"price": {"$gte": index_range.min_price}})
+            if math.isfinite(index_range.max_price):
+                clauses.append({"price": {"$lte": index_range.max_price}})
+
+        if not clauses:
+            where = None
+        elif len(clauses) == 1:
+            where = clauses[0]
+        else:
+            where = {"$and": clauses}
+        return CompiledFilters(where=where, price_range=price_range, unresolved=unresolved)
+
+    @staticmethod
+    def _intersect(current: Optional[PriceRange], parsed: PriceRange) -> PriceRange:
+        if current is None:
+            return parsed
+        low = max(current.min_price, parsed.min_price)
+        high = min(current.max_price, parsed.max_price)
+        return PriceRange(min_price=low, max_price=high) if low <= high else parsed
+
+    @staticmethod
+    def _collect(table: AliasTable, value: str, resolved: List[str], unresolved: List[str]) -> None:
+        canonical = table.resolve(value)
+        if canonical is None:
+            unresolved.append(value)
+        elif canonical not in resolved:
+            resolved.append(canonical)
+
+    @staticmethod
+    def _membership(field: str, values: List[str]) -> Dict[str, Any]:
+        return {field: values[0]} if len(values) == 1 else {field: {"$in": values}}
+
+
+def product_matches_filters(product: Product, filters: Optional[Dict[str, Any]]) -> bool:
+    return _matches(lambda key: getattr(product, key, None), filters)
+
+
+def hit_matches_filters(hit: SearchHit, filters: Optional[Dict[str, Any]]) -> bool:
+    return _matches(hit.metadata.get, filters)
+
+
+def _matches(lookup: Callable[[str], Any], filters: Optional[Dict[str, Any]]) -> bool:
+    if not filters:
+        return True
+
+    for key, condition in filters.items():
+        if key == "$and":
+            if not all(_matches(lookup, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(_matches(lookup, clause) for clause in condition):
+                return False
+        elif not _field_matches(lookup(key), condition):
+            return False
+    return True
+
+
+def _field_matches(value: Any, condition: Any) -> bool:
+    operators = condition if isinstance(condition, dict) else {"$eq": condition}
+    for operator, expected in operators.items():
+        if operator == "$eq" and value != expected:
+            return False
+        if operator == "$ne" and value == expected:
+            return False
+        if operator == "$in" and value not in expected:
+            return False
+        if operator == "$nin" and value in expected:
+            return False
+        if operator in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            if operator == "$gt" and not value > expected:
+                return False
+            if operator == "$gte" and not value >= expected:
+                return False
+            if operator == "$lt" and not value < expected:
+                return False
+            if operator == "$lte" and not value <= expected:
+                return False
+    return True
+
+
+def filter_fields(filters: Optional[Dict[str, Any]]) -> List[str]:
+    if not filters:
+        return []
+
+    fields = set()
+    for key, condition in filters.items():
+        if key in ("$and", "$or"):
+            for clause in condition:
+                fields.update(filter_fields(clause))
+        else:
+            fields.add(key)
+    return sorted(fields)
@@ -5,6 +5,7 @@ from datetime import datetime
 from src.domain.models import DetectedIntent
 from src.domain.value_objects import IntentType, EntityType, Entity
 from src.infrastructure.llm import OllamaClient, OllamaConnectionError, OllamaTimeoutError
+from src.infrastructure.tracing import span
 
 
 class IntentDetectionError(Exception):
@@ -108,15 +109,18 @@ Now analyze the user message and return only the JSON response."""
     
     def detect_intent(self, text: str) -> DetectedIntent:
         try:
-            response = self.ollama.generate(
-                prompt=f"User message: \"{text}\"\n\nAnalyze and return JSON:",
-                system=self.system_prompt,
-                temperature=0.1,
-                format="json"
-            )
-            
-            result = self._parse_response(response, text)
-            return result
+            with span("intent.detect") as detect:
+                response = self.ollama.generate(
+                    prompt=f"User message: \"{text}\"\n\nAnalyze and return JSON:",
+                    system=self.system_prompt,
+                    temperature=0.1,
+                    format="json"
+                )
+                
+                result = self._parse_response(response, text)
+                if detect:
+                    detect.set(intent=str(getattr(result.intent_type, "value", result.intent_type)))
+                return result
         
         except (OllamaConnectionError, OllamaTimeoutError) as e:
             raise IntentDetectionError(f"LLM service unavailable: {e}")
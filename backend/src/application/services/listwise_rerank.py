@@ -0,0 +1,179 @@
+import asyncio
+import re
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from src.domain.models.rag import RAGRequest, RetrievedContext
+from src.application.services.context_retrieval import ContextRetrievalStrategy
+from src.infrastructure.llm.ollama_client import OllamaClient
+from src.infrastructure.tracing import current_span, traced
+
+_NUMBER = re.compile(r"\d+")
+
+
+class ListwiseRerankConfig(BaseModel):
+    enabled: bool = Field(default=True)
+    model_name: str = Field(default="llama2")
+    window: int = Field(default=8, ge=2, le=20)
+    skip_margin: float = Field(default=0.2, ge=0.0, le=1.0)
+    latency_budget_ms: float = Field(default=800.0, gt=0.0)
+    max_tokens: int = Field(default=48, ge=8)
+    title_chars: int = Field(default=80, ge=10)
+    cache_entries: int = Field(default=512, ge=0)
+
+
+class ListwiseRerankStats(BaseModel):
+    requests: int = 0
+    reranked: int = 0
+    cache_hits: int = 0
+    skipped_margin: int = 0
+    skipped_small: int = 0
+    timeouts: int = 0
+    failures: int = 0
+
+    @property
+    def llm_calls(self) -> int:
+        return self.reranked - self.cache_hits + self.timeouts + self.failures
+
+    @property
+    def skip_rate(self) -> float:
+        skipped = self.skipped_margin + self.skipped_small
+        return skipped / self.requests if self.requests else 0.0
+
+
+def build_listwise_prompt(query: str, contexts: List[RetrievedContext], title_chars: int = 80) -> str:
+    lines = []
+    for position, ctx in enumerate(contexts, 1):
+        product = ctx.product
+        title = product.name if not product.brand or product.brand in product.name else f"{product.brand} {product.name}"
+        lines.append(f"[{position}] {title[:title_chars]} - ${product.price:.0f}, {product.category}")
+    return (
+        f"Rank the products by how well they match the request: \"{query}\"\n"
+        + "\n".join(lines)
+        + "\nAnswer with the product numbers only, best first, separated by spaces."
+    )
+
+
+def parse_permutation(raw: str, count: int) -> Optional[List[int]]:
+    order: List[int] = []
+    for match in _NUMBER.findall(raw):
+        position = int(match)
+        if 1 <= position <= count and position - 1 not in order:
+            order.append(position - 1)
+    if not order:
+        return None
+    return order + [index for index in range(count) if index not in order]
+
+
+class ListwiseReranker:
+    def __init__(
+        self,
+        llm_client: OllamaClient,
+        config: Optional[ListwiseRerankConfig] = None,
+        generation: Optional[Callable[[], int]] = None
+    ):
+        self._llm_client = llm_client
+        self._config = config or ListwiseRerankConfig()
+        self._generation = generation or (lambda: 0)
+        self._cache: "OrderedDict[Tuple[str, Tuple[str, ...], int], Tuple[str, ...]]" = OrderedDict()
+        self._stats = ListwiseRerankStats()
+
+    @property
+    def stats(self) -> ListwiseRerankStats:
+        return self._stats
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @traced("retrieval.listwise_rerank")
+    async def rerank(self, query: str, contexts: List[RetrievedContext]) -> List[RetrievedContext]:
+        if not self._config.enabled:
+            return contexts
+        self._stats.requests += 1
+        outcome, reranked = await self._rerank(query, contexts)
+        stage = current_span()
+        if stage:
+            stage.set(outcome=outcome, candidates=min(len(contexts), self._config.window))
+        return reranked
+
+    async def _rerank(self, query: str, contexts: List[RetrievedContext]) -> Tuple[str, List[RetrievedContext]]:
+        window, tail = contexts[:self._config.window], contexts[self._config.window:]
+        if len(window) < 2:
+            self._stats.skipped_small += 1
+            return "skipped_small", contexts
+        leader, runner_up = sorted((ctx.relevance_score for ctx in window), reverse=True)[:2]
+        if leader - runner_up >= self._config.skip_margin:
+            self._stats.skipped_margin += 1
+            return "skipped_margin", contexts
+
+        ids = tuple(str(ctx.product.id) for ctx in window)
+        key = (" ".join(query.lower().split()), tuple(sorted(ids)), self._generation())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._stats.cache_hits += 1
+            self._stats.reranked += 1
+            by_id = {str(ctx.product.id): ctx for ctx in window}
+            return "cache_hit", self._rescore([by_id[product_id] for product_id in cached]) + tail
+
+        prompt = build_listwise_prompt(query, window, self._config.title_chars)
+        try:
+            raw = await asyncio.wait_for(self._complete(prompt), timeout=self._config.latency_budget_ms / 1000)
+        except asyncio.TimeoutError:
+            self._stats.timeouts += 1
+            return "timeout", contexts
+        except Exception:
+            self._stats.failures += 1
+            return "failed", contexts
+
+        order = parse_permutation(raw, len(window))
+        if order is None:
+            self._stats.failures += 1
+            return "unparseable", contexts
+
+        reranked = [window[index] for index in order]
+        self._store(key, tuple(str(ctx.product.id) for ctx in reranked))
+        self._stats.reranked += 1
+        return "reranked", self._rescore(reranked) + tail
+
+    @staticmethod
+    def _rescore(reranked: List[RetrievedContext]) -> List[RetrievedContext]:
+        scores = sorted((ctx.relevance_score for ctx in reranked), reverse=True)
+        return [
+            ctx if ctx.relevance_score == score else ctx.model_copy(update={"relevance_score": score})
+            for ctx, score in zip(reranked, scores)
+        ]
+
+    async def _complete(self, prompt: str) -> str:
+        return await self._llm_client.generate(
+            prompt=prompt,
+            model=self._config.model_name,
+            temperature=0.0,
+            max_tokens=self._config.max_tokens
+        )
+
+    def _store(self, key: Tuple[str, Tuple[str, ...], int], order: Tuple[str, ...]) -> None:
+        if self._config.cache_entries == 0:
+            return
+        self._cache[key] = order
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._config.cache_entries:
+            self._cache.popitem(last=False)
+
+
+class ListwiseRerankingStrategy:
+    def __init__(self, base_strategy: ContextRetrievalStrategy, reranker: ListwiseReranker):
+        self._base_strategy = base_strategy
+        self._reranker = reranker
+
+    @property
+    def reranker(self) -> ListwiseReranker:
+        return self._reranker
+
+    async def retrieve_context(self, query: str, request: RAGRequest) -> List[RetrievedContext]:
+        contexts = await self._base_strategy.retrieve_context(query, request)
+        return await self._reranker.rerank(query, contexts)
+
+    async def retrieve_many(self, queries: List[str], request: RAGRequest) -> List[List[RetrievedContext]]:
+        return await self._base_strategy.retrieve_many(queries, request)
@@ -0,0 +1,87 @@
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+
+FragmentKey = Tuple[str, int, Optional[int], Optional[int]]
+
+
+class FragmentCacheConfig(BaseModel):
+    max_entries: int = Field(default=2048, ge=1)
+
+
+class FragmentCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def render_fragment(product: Product, description: str, max_features: Optional[int] = None) -> str:
+    features = product.features if max_features is None else product.features[:max_features]
+    fragment = (
+        f"{product.name}\n"
+        f"Category: {product.category} | Price: ${product.price:.2f}\n"
+        f"Description: {description}"
+    )
+    if features:
+        fragment += f"\nFeatures: {', '.join(features)}"
+    return fragment
+
+
+def fragment_prefix(position: int, ctx: RetrievedContext) -> str:
+    return f"Product {position} (relevance {ctx.relevance_score:.0%}): "
+
+
+class ProductFragmentCache:
+    def __init__(
+        self,
+        config: Optional[FragmentCacheConfig] = None,
+        generation: Optional[Callable[[], int]] = None
+    ):
+        self._config = config or FragmentCacheConfig()
+        self._generation = generation or (lambda: 0)
+        self._fragments: "OrderedDict[FragmentKey, str]" = OrderedDict()
+        self._stats = FragmentCacheStats()
+
+    @property
+    def stats(self) -> FragmentCacheStats:
+        self._stats.entries = len(self._fragments)
+        return self._stats
+
+    def render(
+        self,
+        position: int,
+        ctx: RetrievedContext,
+        description: Optional[str] = None,
+        max_features: Optional[int] = None
+    ) -> str:
+        if description is not None:
+            return fragment_prefix(position, ctx) + render_fragment(ctx.product, description, max_features)
+        return fragment_prefix(position, ctx) + self.fragment(ctx, max_features)
+
+    def fragment(self, ctx: RetrievedContext, max_features: Optional[int] = None) -> str:
+        key = (str(ctx.product.id), self._generation(), ctx.chunk_position, max_features)
+        cached = self._fragments.get(key)
+        if cached is not None:
+            self._fragments.move_to_end(key)
+            self._stats.hits += 1
+            return cached
+
+        self._stats.misses += 1
+        fragment = render_fragment(ctx.product, ctx.chunk_text or ctx.product.description, max_features)
+        self._fragments[key] = fragment
+        if len(self._fragments) > self._config.max_entries:
+            self._fragments.popitem(last=False)
+            self._stats.evictions += 1
+        return fragment
+
+    def clear(self) -> None:
+        self._fragments.clear()
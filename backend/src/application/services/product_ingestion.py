@@ -1,29 +1,137 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 from src.domain.models.product import Product
 from src.domain.repositories.embedding_repository import EmbeddingRepository
-from src.domain.repositories.vector_repository import VectorRepository
+from src.infrastructure.lexical.bm25_index import BM25Index
+from src.infrastructure.vector_store.chroma_repository import ChromaVectorRepository, UpsertSummary, content_hash
+from src.infrastructure.vector_store.sharded_chroma_repository import ShardedChromaVectorRepository
+from src.application.services.filter_compiler import FilterCompiler
+from src.application.services.similar_products import SimilarProductsService
+from src.application.services.text_chunker import TextChunker
 
 class ProductIngestionService:
     def __init__(
         self,
         embedding_service: EmbeddingRepository,
-        vector_repository: VectorRepository
+        vector_repository: ChromaVectorRepository,
+        lexical_index: Optional[BM25Index] = None,
+        similar_products: Optional[SimilarProductsService] = None,
+        text_chunker: Optional[TextChunker] = None,
+        filter_compiler: Optional[FilterCompiler] = None,
+        shard_repository: Optional[ShardedChromaVectorRepository] = None,
+        embedding_batch_size: int = 32
     ):
         self._embedding_service = embedding_service
         self._vector_repository = vector_repository
+        self._lexical_index = lexical_index
+        self._similar_products = similar_products
+        self._text_chunker = text_chunker
+        self._filter_compiler = filter_compiler
+        self._shard_repository = shard_repository
+        self._embedding_batch_size = embedding_batch_size
     
     async def ingest_products(self, products: List[Product]) -> int:
         if not products:
             return 0
         
         await self._vector_repository.add_products(products)
+        await self._index_chunks(products)
+        if self._shard_repository is not None:
+            await self._shard_repository.add_products(products)
+        if self._lexical_index is not None:
+            self._lexical_index.add_products(products)
+        if self._filter_compiler is not None:
+            self._filter_compiler.learn_catalog(products)
+        if self._similar_products is not None:
+            await self._similar_products.index_products([str(product.id) for product in products])
         return len(products)
     
     async def ingest_product(self, product: Product) -> None:
         await self._vector_repository.add_products([product])
+        await self._index_chunks([product])
+        if self._shard_repository is not None:
+            await self._shard_repository.add_products([product])
+        if self._lexical_index is not None:
+            self._lexical_index.add_product(product)
+        if self._filter_compiler is not None:
+            self._filter_compiler.learn_catalog([product])
+        if self._similar_products is not None:
+            await self._similar_products.index_products([str(product.id)])
+    
+    async def update_products(self, products: List[Product]) -> UpsertSummary:
+        summary = await self._vector_repository.upsert_products(products)
+        await self._index_chunks(products, skip_unchanged=True)
+        if self._shard_repository is not None:
+            await self._shard_repository.upsert_products(products)
+        if self._lexical_index is not None:
+            self._lexical_index.add_products(products)
+        if self._filter_compiler is not None:
+            self._filter_compiler.learn_catalog(products)
+        if self._similar_products is not None:
+            await self._similar_products.index_products([str(product.id) for product in products])
+        return summary
+    
+    async def apply_metadata_updates(self, deltas: Dict[str, Dict[str, Any]]) -> int:
+        updated = await self._vector_repository.apply_deltas(deltas)
+        if self._shard_repository is not None:
+            await self._shard_repository.apply_deltas(deltas)
+        if self._lexical_index is not None:
+            for product_id, changes in deltas.items():
+                product = self._lexical_index.get_product(product_id)
+                if product is not None:
+                    self._lexical_index.add_product(product.model_copy(update=changes))
+        return updated
+    
+    async def rebuild_indexes(self) -> int:
+        products = await self._vector_repository.list_products()
+        self._vector_repository.index_metadata(products)
+        if self._shard_repository is not None and await self._shard_repository.get_product_count() == 0:
+            await self._shard_repository.add_products(products)
+        if self._lexical_index is not None:
+            self._lexical_index.add_products(products)
+        if self._filter_compiler is not None:
+            self._filter_compiler.learn_catalog(products)
+        if self._similar_products is not None:
+            await self._similar_products.refresh()
+        return len(products)
     
     async def remove_product(self, product_id: str) -> None:
         await self._vector_repository.delete_product(product_id)
+        if self._shard_repository is not None:
+            await self._shard_repository.delete_product(product_id)
+        if self._lexical_index is not None:
+            self._lexical_index.remove(product_id)
+        if self._similar_products is not None:
+            self._similar_products.remove_product(product_id)
+    
+    async def _index_chunks(self, products: List[Product], skip_unchanged: bool = False) -> int:
+        if self._text_chunker is None or not products:
+            return 0
+        
+        chunk_texts = [
+            [chunk.text for chunk in self._text_chunker.chunk_text(_chunk_source(product))]
+            for product in products
+        ]
+        if skip_unchanged:
+            known_hashes = await self._vector_repository.get_chunk_hashes(
+                [str(product.id) for product in products]
+            )
+            changed = [
+                (product, texts) for product, texts in zip(products, chunk_texts)
+                if known_hashes.get(str(product.id)) != content_hash("\n".join(texts))
+            ]
+            products = [product for product, _ in changed]
+            chunk_texts = [texts for _, texts in changed]
+        
+        flat_texts = [text for texts in chunk_texts for text in texts]
+        if not flat_texts:
+            return 0
+        
+        embeddings: List[List[float]] = []
+        for start in range(0, len(flat_texts), self._embedding_batch_size):
+            batch = flat_texts[start:start + self._embedding_batch_size]
+            embeddings.extend(await self._embedding_service.embed_batch(batch))
+        
+        return await self._vector_repository.add_chunks(products, chunk_texts, embeddings)
     
     async def get_total_products(self) -> int:
         return await self._vector_repository.get_product_count()
@@ -42,4 +150,12 @@ class ProductIngestionService:
             filters=filters
         )
         
-        return results
\ No newline at end of file
+        return results
+
+
+_VOLATILE_DOCUMENT_LINES = ("Price:",)
+
+
+def _chunk_source(product: Product) -> str:
+    lines = (line.strip() for line in product.to_document().strip().splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith(_VOLATILE_DOCUMENT_LINES))
@@ -0,0 +1,201 @@
+import math
+import re
+from typing import List, Optional, Sequence
+from pydantic import BaseModel, Field
+
+from src.domain.models.rag import RetrievedContext
+from src.application.services.prompt_template import PromptTemplate
+from src.application.services.product_fragments import ProductFragmentCache
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+class PromptBudget(BaseModel):
+    max_prompt_tokens: int = Field(default=1536, ge=128)
+    history_share: float = Field(default=0.2, ge=0.0, le=1.0)
+    min_product_tokens: int = Field(default=32, ge=8)
+    max_features: int = Field(default=5, ge=0)
+    chars_per_token: float = Field(default=4.0, gt=0.0)
+
+
+class PromptBuildResult(BaseModel):
+    prompt: str
+    tokens_used: int
+    tokens_uncompressed: int
+    few_shots_dropped: bool = False
+    products_included: int = 0
+    products_dropped: int = 0
+    products_truncated: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.tokens_uncompressed - self.tokens_used, 0)
+
+
+class ApproximateTokenizer:
+    def __init__(self, chars_per_token: float = 4.0):
+        self._chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self._chars_per_token) if text else 0
+
+    def truncate_sentences(self, text: str, max_tokens: int) -> str:
+        if self.count(text) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+
+        kept: List[str] = []
+        used = 0
+        for sentence in _SENTENCE_BOUNDARY.split(text.strip()):
+            cost = self.count(sentence) + (1 if kept else 0)
+            if used + cost > max_tokens:
+                break
+            kept.append(sentence)
+            used += cost
+
+        if kept:
+            return " ".join(kept)
+        max_chars = int(max_tokens * self._chars_per_token) - 1
+        return text[:max_chars].rsplit(" ", 1)[0].rstrip(",;:") + "…"
+
+    def keep_recent_lines(self, text: str, max_tokens: int) -> str:
+        if self.count(text) <= max_tokens:
+            return text
+
+        kept: List[str] = []
+        used = 0
+        for line in reversed(text.splitlines()):
+            cost = self.count(line) + 1
+            if used + cost > max_tokens:
+                break
+            kept.append(line)
+            used += cost
+        return "\n".join(reversed(kept))
+
+
+class PromptBuilder:
+    def __init__(
+        self,
+        budget: Optional[PromptBudget] = None,
+        fragments: Optional[ProductFragmentCache] = None
+    ):
+        self._budget = budget or PromptBudget()
+        self._tokenizer = ApproximateTokenizer(self._budget.chars_per_token)
+        self._fragments = fragments or ProductFragmentCache()
+
+    @property
+    def tokenizer(self) -> ApproximateTokenizer:
+        return self._tokenizer
+
+    def build(
+        self,
+        template: PromptTemplate,
+        query: str,
+        contexts: Sequence[RetrievedContext],
+        history: Optional[str] = None
+    ) -> PromptBuildResult:
+        full_blocks = [self._fragments.render(i, ctx) for i, ctx in enumerate(contexts, 1)]
+        uncompressed = self._assemble(template, query, full_blocks, history, include_few_shots=True)
+        tokens_uncompressed = self._tokenizer.count(uncompressed)
+        if tokens_uncompressed <= self._budget.max_prompt_tokens:
+            return PromptBuildResult(
+                prompt=uncompressed,
+                tokens_used=tokens_uncompressed,
+                tokens_uncompressed=tokens_uncompressed,
+                products_included=len(contexts)
+            )
+
+        count = self._tokenizer.count
+        if history:
+            history = self._tokenizer.keep_recent_lines(
+                history,
+                int(self._budget.max_prompt_tokens * self._budget.history_share)
+            )
+
+        frame = count(self._assemble(template, query, [], history, include_few_shots=False))
+        available = self._budget.max_prompt_tokens - frame
+        few_shot_cost = count(template.few_shot_text)
+        full_cost = sum(count(block) + 1 for block in full_blocks)
+        include_few_shots = bool(template.few_shot_examples) and available - few_shot_cost >= full_cost
+        if include_few_shots:
+            available -= few_shot_cost
+
+        blocks, truncated = self._fit_products(list(contexts), full_blocks, available)
+        prompt = self._assemble(template, query, blocks, history, include_few_shots)
+        return PromptBuildResult(
+            prompt=prompt,
+            tokens_used=count(prompt),
+            tokens_uncompressed=tokens_uncompressed,
+            few_shots_dropped=bool(template.few_shot_examples) and not include_few_shots,
+            products_included=len(blocks),
+            products_dropped=len(contexts) - len(blocks),
+            products_truncated=truncated
+        )
+
+    def _fit_products(
+        self,
+        contexts: List[RetrievedContext],
+        full_blocks: List[str],
+        available: int
+    ) -> tuple[List[str], int]:
+        count = self._tokenizer.count
+        kept = list(range(len(contexts)))
+        allocations: List[int] = []
+
+        while kept:
+            allocations = self._allocate(
+                [max(contexts[i].relevance_score, 1e-3) for i in kept],
+                [count(full_blocks[i]) + 1 for i in kept],
+                available
+            )
+            if min(allocations) >= self._budget.min_product_tokens or len(kept) == 1:
+                break
+            kept.pop()
+
+        blocks: List[str] = []
+        truncated = 0
+        for position, (index, allocation) in enumerate(zip(kept, allocations), 1):
+            ctx = contexts[index]
+            if count(full_blocks[index]) + 1 <= allocation:
+                blocks.append(self._fragments.render(position, ctx))
+                continue
+
+            header = self._fragments.render(position, ctx, description="", max_features=self._budget.max_features)
+            description = self._tokenizer.truncate_sentences(
+                ctx.chunk_text or ctx.product.description,
+                allocation - count(header) - 1
+            )
+            blocks.append(self._fragments.render(position, ctx, description, self._budget.max_features))
+            truncated += 1
+        return blocks, truncated
+
+    @staticmethod
+    def _allocate(weights: List[float], costs: List[int], available: int) -> List[int]:
+        allocations = [0] * len(weights)
+        remaining_budget = float(max(available, 0))
+        remaining_weight = sum(weights)
+
+        for i in sorted(range(len(weights)), key=lambda i: costs[i] / weights[i]):
+            share = remaining_budget * weights[i] / remaining_weight if remaining_weight else 0.0
+            allocations[i] = int(min(costs[i], share))
+            remaining_budget -= allocations[i]
+            remaining_weight -= weights[i]
+        return allocations
+
+    @staticmethod
+    def _assemble(
+        template: PromptTemplate,
+        query: str,
+        blocks: List[str],
+        history: Optional[str],
+        include_few_shots: bool
+    ) -> str:
+        products_context = "\n\n".join(blocks) if blocks else "No relevant products found."
+        if history:
+            query = f"{query}\n\nConversation so far:\n{history}"
+        return template.build_full_prompt(
+            include_few_shots=include_few_shots,
+            query=query,
+            products_context=products_context
+        )
@@ -1,7 +1,17 @@
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import List, Dict, Any, Optional
 from pydantic import BaseModel, Field
 
 from src.domain.models.rag import RetrievedContext
+from src.application.services.product_fragments import (
+    ProductFragmentCache,
+    fragment_prefix,
+    render_fragment
+)
+
+
+def normalize_whitespace(text: str) -> str:
+    return "\n".join(line.strip() for line in text.strip().splitlines())
 
 
 class PromptTemplate(BaseModel):
@@ -12,23 +22,68 @@ class PromptTemplate(BaseModel):
     def format_user_prompt(self, **kwargs) -> str:
         return self.user_prompt_template.format(**kwargs)
     
-    def build_full_prompt(self, **kwargs) -> str:
+    @cached_property
+    def few_shot_text(self) -> str:
+        return "\n\n".join([
+            f"Example {i+1}:\nUser: {ex['user']}\nAssistant: {ex['assistant']}"
+            for i, ex in enumerate(self.few_shot_examples)
+        ])
+    
+    @cached_property
+    def _few_shot_prefix(self) -> str:
+        return f"{self.system_prompt}\n\n{self.few_shot_text}\n\nNow respond to:\nUser: "
+    
+    @cached_property
+    def _plain_prefix(self) -> str:
+        return f"{self.system_prompt}\n\nUser: "
+    
+    def compiled(self) -> "PromptTemplate":
+        return PromptTemplate(
+            system_prompt=normalize_whitespace(self.system_prompt),
+            user_prompt_template=normalize_whitespace(self.user_prompt_template),
+            few_shot_examples=[
+                {role: text.strip() for role, text in example.items()}
+                for example in self.few_shot_examples
+            ]
+        )
+    
+    def build_full_prompt(self, include_few_shots: bool = True, **kwargs) -> str:
         user_prompt = self.format_user_prompt(**kwargs)
         
-        if self.few_shot_examples:
-            examples_text = "\n\n".join([
-                f"Example {i+1}:\nUser: {ex['user']}\nAssistant: {ex['assistant']}"
-                for i, ex in enumerate(self.few_shot_examples)
-            ])
-            return f"{self.system_prompt}\n\n{examples_text}\n\nNow respond to:\nUser: {user_prompt}"
+        if self.few_shot_examples and include_few_shots:
+            return self._few_shot_prefix + user_prompt
         
-        return f"{self.system_prompt}\n\nUser: {user_prompt}"
+        return self._plain_prefix + user_prompt
 
 
 class RAGPromptTemplates:
     
     @staticmethod
     def get_recommendation_template() -> PromptTemplate:
+        return _RECOMMENDATION_TEMPLATE
+    
+    @staticmethod
+    def get_comparison_template() -> PromptTemplate:
+        return _COMPARISON_TEMPLATE
+    
+    @staticmethod
+    def format_products_context(
+        contexts: List[RetrievedContext],
+        fragments: Optional[ProductFragmentCache] = None
+    ) -> str:
+        if not contexts:
+            return "No relevant products found."
+        
+        if fragments is not None:
+            return "\n\n".join(fragments.render(i, ctx) for i, ctx in enumerate(contexts, 1))
+        
+        return "\n\n".join(
+            fragment_prefix(i, ctx) + render_fragment(ctx.product, ctx.chunk_text or ctx.product.description)
+            for i, ctx in enumerate(contexts, 1)
+        )
+    
+    @staticmethod
+    def _recommendation_template() -> PromptTemplate:
         system_prompt = """You are an expert product recommendation assistant. Your task is to analyze the user's query and the retrieved product information, then provide personalized recommendations with clear reasoning.
 
                             Guidelines:
@@ -63,29 +118,7 @@ class RAGPromptTemplates:
         )
     
     @staticmethod
-    def format_products_context(contexts: List[RetrievedContext]) -> str:
-        if not contexts:
-            return "No relevant products found."
-        
-        formatted_products = []
-        for i, ctx in enumerate(contexts, 1):
-            product = ctx.product
-            relevance = f"{ctx.relevance_score:.2%}"
-            
-            product_info = f"""Product {i}:
-                                - Name: {product.name}
-                                - Category: {product.category}
-                                - Price: ${product.price:.2f}
-                                - Description: {product.description}
-                                - Features: {', '.join(product.features)}
-                                - Relevance Score: {relevance}"""
-            
-            formatted_products.append(product_info)
-        
-        return "\n\n".join(formatted_products)
-    
-    @staticmethod
-    def get_comparison_template() -> PromptTemplate:
+    def _comparison_template() -> PromptTemplate:
         system_prompt = """You are a product comparison expert. Compare the given products objectively, highlighting strengths and weaknesses of each."""
 
         user_prompt_template = """Compare these products:
@@ -97,4 +130,8 @@ class RAGPromptTemplates:
         return PromptTemplate(
             system_prompt=system_prompt,
             user_prompt_template=user_prompt_template
-        )
\ No newline at end of file
+        )
+
+
+_RECOMMENDATION_TEMPLATE = RAGPromptTemplates._recommendation_template().compiled()
+_COMPARISON_TEMPLATE = RAGPromptTemplates._comparison_template().compiled()
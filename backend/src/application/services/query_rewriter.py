@@ -0,0 +1,278 @@
+import asyncio
+import math
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from src.domain.models.conversation_state import ConversationContext
+from src.domain.repositories.embedding_repository import EmbeddingRepository
+from src.application.services.filter_compiler import PriceTiers, parse_price_expression
+from src.infrastructure.llm.ollama_client import OllamaClient
+from src.infrastructure.tracing import current_span, traced
+
+_WORD = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+_PRICE_PHRASE = re.compile(
+    r"(?:between|from|under|below|over|above|less than|more than|cheaper than|up to|at most|at least|"
+    r"around|about|roughly|within|max(?:imum)?|min(?:imum)?)?\s*\$?\d[\d,]*(?:\.\d+)?\s*k?"
+    r"(?:\s*(?:-|to|and)\s*\$?\d[\d,]*(?:\.\d+)?\s*k?)?(?:\s*(?:dollars|usd|bucks))?",
+    re.IGNORECASE
+)
+_REFERENCE = re.compile(r"\b(?:ones?|them|those|these|others?|another|else|similar)\b")
+_FOLLOW_UP = re.compile(r"\b(?:what about|how about|instead)\b")
+_CHEAPER = re.compile(r"\b(?:cheaper|less expensive|lower[- ]priced|more affordable|inexpensive)\b")
+_PRICIER = re.compile(r"\b(?:pricier|more expensive|higher[- ]end|fancier|more premium)\b")
+_FILLER = frozenset("""
+    a about above affordable all also an and another any anything are at be below but can cheaper could do does else
+    expensive fancier for from get give got have higher how i if in inexpensive instead is it just less like
+    looking lower maybe me more my need of on one ones or other others please premium priced pricier show similar
+    some something than that the them then there these they this those to under want what which with would you
+""".split())
+
+
+class RewriteConfig(BaseModel):
+    enabled: bool = Field(default=True)
+    llm_fallback: bool = Field(default=True)
+    model_name: str = Field(default="llama2")
+    llm_budget_ms: float = Field(default=600.0, gt=0.0)
+    max_tokens: int = Field(default=48, ge=8)
+    min_content_terms: int = Field(default=1, ge=0)
+    cheaper_factor: float = Field(default=0.8, gt=0.0, lt=1.0)
+    embeddings_per_conversation: int = Field(default=16, ge=0)
+    max_conversations: int = Field(default=256, ge=1)
+
+
+class RewriteStats(BaseModel):
+    passthrough: int = 0
+    template: int = 0
+    llm: int = 0
+    llm_failures: int = 0
+    embedding_hits: int = 0
+    embedding_misses: int = 0
+
+    @property
+    def rewrite_rate(self) -> float:
+        total = self.passthrough + self.template + self.llm
+        return (self.template + self.llm) / total if total else 0.0
+
+    @property
+    def embedding_hit_rate(self) -> float:
+        total = self.embedding_hits + self.embedding_misses
+        return self.embedding_hits / total if total else 0.0
+
+
+class RewrittenQuery(BaseModel):
+    query: str
+    entities: List[Tuple[str, str]] = Field(default_factory=list)
+    method: str = Field(default="passthrough", pattern="^(passthrough|template|llm)$")
+
+    @property
+    def rewritten(self) -> bool:
+        return self.method != "passthrough"
+
+
+def entity_kind(entity_type) -> str:
+    return str(getattr(entity_type, "value", entity_type) or "").lower()
+
+
+def content_terms(text: str) -> List[str]:
+    stripped = _PRICE_PHRASE.sub(" ", text.lower())
+    terms: List[str] = []
+    for term in _WORD.findall(stripped):
+        if term not in _FILLER and not term.isdigit() and term not in terms:
+            terms.append(term)
+    return terms
+
+
+def latest_entities(context: ConversationContext) -> Dict[str, str]:
+    return {
+        entity_kind(entity_type): values[-1]
+        for entity_type, values in context.collected_entities.items()
+        if values
+    }
+
+
+class QueryRewriter:
+    def __init__(
+        self,
+        embedding_service: Optional[EmbeddingRepository] = None,
+        llm_client: Optional[OllamaClient] = None,
+        config: Optional[RewriteConfig] = None,
+        price_tiers: Optional[PriceTiers] = None
+    ):
+        self._embedding_service = embedding_service
+        self._llm_client = llm_client
+        self._config = config or RewriteConfig()
+        self._price_tiers = price_tiers or PriceTiers()
+        self._embeddings: "OrderedDict[UUID, OrderedDict[str, List[float]]]" = OrderedDict()
+        self._stats = RewriteStats()
+
+    @property
+    def stats(self) -> RewriteStats:
+        return self._stats
+
+    @traced("conversation.rewrite_query")
+    async def rewrite(
+        self,
+        message: str,
+        context: ConversationContext,
+        message_entities: List[Tuple[str, str]]
+    ) -> RewrittenQuery:
+        rewritten = await self._rewrite(message, context, [(entity_kind(t), v) for t, v in message_entities])
+        setattr(self._stats, rewritten.method, getattr(self._stats, rewritten.method) + 1)
+        stage = current_span()
+        if stage:
+            stage.set(method=rewritten.method)
+        return rewritten
+
+    async def embed(self, conversation_id: UUID, query: str) -> Optional[List[float]]:
+        if self._embedding_service is None:
+            return None
+
+        key = " ".join(query.lower().split())
+        cache = self._embeddings.get(conversation_id)
+        if cache is not None and key in cache:
+            cache.move_to_end(key)
+            self._embeddings.move_to_end(conversation_id)
+            self._stats.embedding_hits += 1
+            return cache[key]
+
+        self._stats.embedding_misses += 1
+        embedding = await self._embedding_service.embed_text(query)
+        if self._config.embeddings_per_conversation:
+            self._remember(conversation_id, key, embedding)
+        return embedding
+
+    def forget(self, conversation_id: UUID) -> None:
+        self._embeddings.pop(conversation_id, None)
+
+    async def _rewrite(
+        self,
+        message: str,
+        context: ConversationContext,
+        message_entities: List[Tuple[str, str]]
+    ) -> RewrittenQuery:
+        passthrough = RewrittenQuery(query=message, entities=message_entities)
+        if not self._config.enabled or not context.search_history:
+            return passthrough
+
+        last_query = context.search_history[-1]
+        current = dict(message_entities)
+        if "category" in current and not set(content_terms(current["category"])) & set(content_terms(last_query)):
+            return passthrough
+
+        lowered = message.lower()
+
+        message_terms = content_terms(message)
+        known_terms = set(content_terms(last_query))
+        for _, value in message_entities:
+            known_terms.update(content_terms(value))
+        novel_terms = [term for term in message_terms if term not in known_terms]
+        is_follow_up = _REFERENCE.search(lowered) is not None or (not novel_terms and (
+            _FOLLOW_UP.search(lowered) is not None
+            or _CHEAPER.search(lowered) is not None
+            or _PRICIER.search(lowered) is not None
+            or len(message_terms) < self._config.min_content_terms
+        ))
+        if not is_follow_up:
+            return passthrough
+
+        previous = latest_entities(context)
+        price_phrase = _PRICE_PHRASE.search(last_query)
+        if "price_range" not in previous and price_phrase:
+            previous["price_range"] = price_phrase.group(0).strip()
+        entities = self._merge_entities(lowered, previous, current)
+        query = self._template_query(last_query, message_terms, entities)
+        if len(content_terms(query)) > len(message_terms):
+            return RewrittenQuery(query=query, entities=entities, method="template")
+
+        llm_query = await self._llm_rewrite(message, context, entities)
+        if llm_query:
+            return RewrittenQuery(query=llm_query, entities=entities, method="llm")
+        return RewrittenQuery(query=message, entities=entities, method="template")
+
+    def _merge_entities(
+        self,
+        message: str,
+        previous: Dict[str, str],
+        current: Dict[str, str]
+    ) -> List[Tuple[str, str]]:
+        merged = {**previous, **current}
+        if "price_range" not in current:
+            adjusted = self._adjust_price(message, previous.get("price_range"))
+            if adjusted is not None:
+                merged["price_range"] = adjusted
+        return list(merged.items())
+
+    def _adjust_price(self, message: str, previous_price: Optional[str]) -> Optional[str]:
+        cheaper = _CHEAPER.search(message) is not None
+        pricier = _PRICIER.search(message) is not None
+        if not cheaper and not pricier:
+            return previous_price
+
+        price_range = parse_price_expression(previous_price, self._price_tiers) if previous_price else None
+        if price_range is None:
+            return "cheap" if cheaper else "premium"
+        bounded = math.isfinite(price_range.max_price)
+        if cheaper:
+            ceiling = price_range.max_price * self._config.cheaper_factor if bounded else price_range.min_price
+            return f"under {ceiling:.0f}" if ceiling > 0 else previous_price
+        floor = price_range.max_price if bounded else price_range.min_price / self._config.cheaper_factor
+        return f"over {floor:.0f}" if floor > 0 else "premium"
+
+    @staticmethod
+    def _template_query(last_query: str, message_terms: List[str], entities: List[Tuple[str, str]]) -> str:
+        terms: List[str] = []
+        for kind, value in entities:
+            if kind in ("brand", "category", "feature", "color", "size", "product_name"):
+                terms.extend(content_terms(value))
+        terms.extend(content_terms(last_query))
+        terms.extend(message_terms)
+        return " ".join(dict.fromkeys(terms))
+
+    async def _llm_rewrite(
+        self,
+        message: str,
+        context: ConversationContext,
+        entities: List[Tuple[str, str]]
+    ) -> Optional[str]:
+        if not self._config.llm_fallback or self._llm_client is None:
+            return None
+
+        known = ", ".join(f"{kind}={value}" for kind, value in entities) or "none"
+        prompt = (
+            "Rewrite the latest message as a short standalone product search query.\n"
+            f"Previous search: {context.search_history[-1]}\n"
+            f"Known preferences: {known}\n"
+            f"Latest message: {message}\n"
+            "Reply with the search query only."
+        )
+        try:
+            raw = await asyncio.wait_for(
+                self._llm_client.generate(
+                    prompt=prompt,
+                    model=self._config.model_name,
+                    temperature=0.0,
+                    max_tokens=self._config.max_tokens
+                ),
+                timeout=self._config.llm_budget_ms / 1000
+            )
+        except Exception:
+            self._stats.llm_failures += 1
+            return None
+
+        query = " ".join(raw.strip().strip('"').split())
+        if not content_terms(query):
+            self._stats.llm_failures += 1
+            return None
+        return query
+
+    def _remember(self, conversation_id: UUID, key: str, embedding: List[float]) -> None:
+        cache = self._embeddings.setdefault(conversation_id, OrderedDict())
+        self._embeddings.move_to_end(conversation_id)
+        cache[key] = embedding
+        while len(cache) > self._config.embeddings_per_conversation:
+            cache.popitem(last=False)
+        while len(self._embeddings) > self._config.max_conversations:
+            self._embeddings.popitem(last=False)
@@ -1,14 +1,29 @@
-🔷 Phase 5 Step 5d: Create RAG Pipeline Orchestrator
-Add the main RAG pipeline that orchestrates retrieval and generation.
-📝 Create ONE File
-backend/src/application/services/rag_pipeline.py (NEW)
-pythonfrom typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from src.domain.models.rag import RAGRequest, RAGResponse, RetrievedContext
 from src.application.services.context_retrieval import ContextRetrievalStrategy
 from src.application.services.prompt_template import RAGPromptTemplates
+from src.application.services.prompt_builder import PromptBudget, PromptBuilder
+from src.application.services.product_fragments import ProductFragmentCache
+from src.application.services.semantic_cache import SemanticAnswerCache
+from src.application.services.structured_output import (
+    STRUCTURED_OUTPUT_INSTRUCTIONS,
+    parse_structured_recommendation,
+    render_structured_reasoning,
+    structured_product_ids
+)
+from src.application.services.answer_policy import (
+    AnswerDecision,
+    AnswerPath,
+    AnswerPathMetrics,
+    AnswerPolicy,
+    AnswerPolicyConfig,
+    render_templated_answer
+)
+from src.application.services.self_consistency import ConsistencyMetrics, SelfConsistencySampler
 from src.infrastructure.llm.ollama_client import OllamaClient
+from src.infrastructure.tracing import current_span, span, traced
 
 
 class RAGPipelineConfig(BaseModel):
@@ -18,6 +33,12 @@ class RAGPipelineConfig(BaseModel):
     enable_reasoning: bool = Field(default=True)
     enable_self_consistency: bool = Field(default=False)
     consistency_samples: int = Field(default=3, ge=2, le=5)
+    consistency_concurrency: int = Field(default=2, ge=1, le=8)
+    consistency_quorum: Optional[int] = Field(default=None, ge=1, le=5)
+    comparison_results_per_query: int = Field(default=2, ge=1, le=10)
+    prompt_budget: PromptBudget = Field(default_factory=PromptBudget)
+    answer_policy: AnswerPolicyConfig = Field(default_factory=AnswerPolicyConfig)
+    structured_output: bool = Field(default=False)
 
 
 class RAGPipeline:
@@ -25,24 +46,69 @@ class RAGPipeline:
         self,
         retrieval_strategy: ContextRetrievalStrategy,
         llm_client: OllamaClient,
-        config: RAGPipelineConfig
+        config: RAGPipelineConfig,
+        fragment_cache: Optional[ProductFragmentCache] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None
     ):
         self._retrieval_strategy = retrieval_strategy
         self._llm_client = llm_client
         self._config = config
         self._prompt_templates = RAGPromptTemplates()
+        self._fragment_cache = fragment_cache or ProductFragmentCache()
+        self._prompt_builder = PromptBuilder(config.prompt_budget, self._fragment_cache)
+        self._answer_cache = answer_cache
+        self._answer_policy = AnswerPolicy(config.answer_policy)
+        self._consistency_sampler = SelfConsistencySampler(
+            samples=config.consistency_samples,
+            max_concurrency=config.consistency_concurrency,
+            quorum=config.consistency_quorum
+        )
+    
+    @property
+    def consistency_metrics(self) -> ConsistencyMetrics:
+        return self._consistency_sampler.metrics
+    
+    @property
+    def answer_path_metrics(self) -> AnswerPathMetrics:
+        return self._answer_policy.metrics
     
+    @traced("rag.process_query")
     async def process_query(self, request: RAGRequest) -> RAGResponse:
+        if self._answer_cache is None or not self._answer_cache.cacheable(request):
+            return await self._answer_query(request)
+        
+        with span("rag.cache_lookup") as cache_span:
+            lookup = await self._answer_cache.lookup(request)
+            if cache_span:
+                cache_span.set(hit=lookup.response is not None)
+        if lookup.response is not None:
+            return lookup.response
+        
+        response = await self._answer_query(request.model_copy(update={"query_embedding": lookup.embedding}))
+        if response.context_used:
+            self._answer_cache.store(lookup, request.query, response)
+        return response
+    
+    async def _answer_query(self, request: RAGRequest) -> RAGResponse:
         contexts = await self._retrieve_contexts(request)
+        decision = self._answer_policy.decide(request, contexts)
+        query_span = current_span()
+        if query_span:
+            query_span.set(answer_path=decision.path.value, contexts=len(contexts))
         
-        if not contexts:
+        if decision.path == AnswerPath.EMPTY:
             return self._create_empty_response(request)
         
-        reasoning, recommended_products = await self._generate_recommendations(
-            request.query,
-            contexts,
-            request.include_reasoning
-        )
+        if decision.uses_llm:
+            reasoning, recommended_products, reasons, metadata = await self._generate_recommendations(
+                request.query,
+                contexts,
+                request.include_reasoning,
+                request.conversation_context
+            )
+        else:
+            reasoning, recommended_products, reasons, metadata = self._render_fast_path(decision, contexts)
+        metadata["answer_path"] = {"path": decision.path.value, "reason": decision.reason}
         
         confidence = self._calculate_confidence(contexts, reasoning)
         
@@ -52,7 +118,10 @@ class RAGPipeline:
             reasoning=reasoning if request.include_reasoning else None,
             context_used=contexts,
             confidence_score=confidence,
-            model_used=self._config.model_name
+            model_used=self._config.model_name,
+            ranked_product_ids=[str(product.id) for product in recommended_products],
+            product_reasons=reasons,
+            metadata=metadata
         )
     
     async def _retrieve_contexts(self, request: RAGRequest) -> List[RetrievedContext]:
@@ -66,59 +135,89 @@ class RAGPipeline:
         self,
         query: str,
         contexts: List[RetrievedContext],
-        include_reasoning: bool
-    ) -> tuple[Optional[str], List]:
+        include_reasoning: bool,
+        history: Optional[str] = None
+    ) -> tuple[Optional[str], List, Dict[str, str], Dict[str, Any]]:
         template = self._prompt_templates.get_recommendation_template()
         
-        products_context = self._prompt_templates.format_products_context(contexts)
+        with span("rag.prompt_build") as build_span:
+            built = self._prompt_builder.build(template, query, contexts, history)
+            if build_span:
+                build_span.set(tokens_used=built.tokens_used, tokens_saved=built.tokens_saved)
+        prompt = built.prompt
+        if self._config.structured_output:
+            prompt = f"{prompt}\n\n{STRUCTURED_OUTPUT_INSTRUCTIONS}"
         
-        prompt = template.build_full_prompt(
-            query=query,
-            products_context=products_context
-        )
+        metadata: Dict[str, Any] = {
+            "prompt": {
+                "tokens_used": built.tokens_used,
+                "tokens_saved": built.tokens_saved,
+                "few_shots_dropped": built.few_shots_dropped,
+                "products_dropped": built.products_dropped,
+                "products_truncated": built.products_truncated
+            }
+        }
+        with span("rag.generate", self_consistency=self._config.enable_self_consistency):
+            if self._config.enable_self_consistency:
+                response, metadata["self_consistency"] = await self._generate_with_self_consistency(prompt, contexts)
+            else:
+                response = await self._complete(prompt, self._config.temperature)
         
-        if self._config.enable_self_consistency:
-            response = await self._generate_with_self_consistency(prompt)
-        else:
-            response = await self._llm_client.generate(
-                prompt=prompt,
-                model=self._config.model_name,
-                temperature=self._config.temperature,
-                max_tokens=self._config.max_tokens
-            )
+        if not self._config.structured_output:
+            reasoning = response if include_reasoning else None
+            return reasoning, [ctx.product for ctx in contexts], {}, metadata
         
-        reasoning = response if include_reasoning else None
-        recommended_products = [ctx.product for ctx in contexts]
+        parsed = parse_structured_recommendation(response, contexts)
+        metadata["structured"] = {
+            "fallback_reason": parsed.fallback_reason,
+            "invalid_ids": parsed.invalid_ids
+        }
+        products_by_id = {str(ctx.product.id): ctx.product for ctx in contexts}
+        recommended_products = [products_by_id[product_id] for product_id in parsed.product_ids]
+        reasoning = (render_structured_reasoning(parsed, contexts) or response) if include_reasoning else None
         
-        return reasoning, recommended_products
+        return reasoning, recommended_products, parsed.reasons, metadata
     
-    async def _generate_with_self_consistency(self, prompt: str) -> str:
-        responses = []
-        
-        for _ in range(self._config.consistency_samples):
-            response = await self._llm_client.generate(
+    async def _complete(self, prompt: str, temperature: float) -> str:
+        if self._config.structured_output:
+            return await self._llm_client.generate(
                 prompt=prompt,
                 model=self._config.model_name,
-                temperature=self._config.temperature + 0.2,
-                max_tokens=self._config.max_tokens
+                temperature=temperature,
+                max_tokens=self._config.max_tokens,
+                format="json"
             )
-            responses.append(response)
-        
-        return self._select_most_consistent_response(responses)
+        return await self._llm_client.generate(
+            prompt=prompt,
+            model=self._config.model_name,
+            temperature=temperature,
+            max_tokens=self._config.max_tokens
+        )
     
-    def _select_most_consistent_response(self, responses: List[str]) -> str:
-        if len(responses) == 1:
-            return responses[0]
+    def _render_fast_path(
+        self,
+        decision: AnswerDecision,
+        contexts: List[RetrievedContext]
+    ) -> tuple[Optional[str], List, Dict[str, str], Dict[str, Any]]:
+        if decision.path == AnswerPath.SINGLE_MATCH:
+            recommended_products = [max(contexts, key=lambda ctx: ctx.relevance_score).product]
+        else:
+            recommended_products = [ctx.product for ctx in contexts]
         
-        word_counts = []
-        for response in responses:
-            word_count = len(response.split())
-            word_counts.append((response, word_count))
+        return render_templated_answer(decision, contexts), recommended_products, {}, {}
+    
+    async def _generate_with_self_consistency(
+        self,
+        prompt: str,
+        contexts: List[RetrievedContext]
+    ) -> tuple[str, Dict[str, Any]]:
+        async def generate_sample() -> str:
+            return await self._complete(prompt, min(self._config.temperature + 0.2, 1.0))
         
-        word_counts.sort(key=lambda x: x[1])
-        median_idx = len(word_counts) // 2
+        extract = structured_product_ids if self._config.structured_output else None
+        response, stats = await self._consistency_sampler.sample(generate_sample, contexts, extract)
         
-        return word_counts[median_idx][0]
+        return response, {**stats.model_dump(), "latency_spread": stats.latency_spread}
     
     def _calculate_confidence(
         self,
@@ -155,17 +254,22 @@ class RAGPipeline:
             reasoning="No products found matching your query. Please try different search terms or relax your filters.",
             context_used=[],
             confidence_score=0.0,
-            model_used=self._config.model_name
+            model_used=self._config.model_name,
+            metadata={"answer_path": {"path": AnswerPath.EMPTY.value, "reason": "no products retrieved"}}
         )
     
     async def compare_products(
         self,
         product_ids: List[str],
-        contexts: List[RetrievedContext]
+        contexts: Optional[List[RetrievedContext]] = None,
+        queries: Optional[List[str]] = None
     ) -> str:
+        if contexts is None:
+            contexts = await self._retrieve_comparison_contexts(queries or [])
+        
         template = self._prompt_templates.get_comparison_template()
         
-        products_context = self._prompt_templates.format_products_context(contexts)
+        products_context = self._prompt_templates.format_products_context(contexts, self._fragment_cache)
         
         prompt = template.build_full_prompt(
             products_context=products_context
@@ -178,4 +282,28 @@ class RAGPipeline:
             max_tokens=self._config.max_tokens
         )
         
-        return response
\ No newline at end of file
+        return response
+    
+    async def _retrieve_comparison_contexts(self, queries: List[str]) -> List[RetrievedContext]:
+        if not queries:
+            return []
+        
+        request = RAGRequest(
+            query=" vs ".join(queries),
+            max_results=self._config.comparison_results_per_query
+        )
+        per_query_contexts = await self._retrieval_strategy.retrieve_many(queries, request)
+        
+        merged = []
+        seen_ids = set()
+        longest = max((len(contexts) for contexts in per_query_contexts), default=0)
+        for rank in range(longest):
+            for contexts in per_query_contexts:
+                if rank >= len(contexts):
+                    continue
+                product_id = str(contexts[rank].product.id)
+                if product_id not in seen_ids:
+                    seen_ids.add(product_id)
+                    merged.append(contexts[rank])
+        
+        return merged
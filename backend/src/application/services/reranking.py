@@ -0,0 +1,86 @@
+from typing import List, Optional
+import numpy as np
+from pydantic import BaseModel, Field, model_validator
+
+from src.domain.models.rag import RetrievedContext
+from src.domain.value_objects.entities import PriceRange
+
+
+class RerankWeights(BaseModel):
+    relevance: float = Field(default=0.7, ge=0.0)
+    price: float = Field(default=0.2, ge=0.0)
+    rating: float = Field(default=0.1, ge=0.0)
+    stock: float = Field(default=0.0, ge=0.0)
+
+
+class RerankConfig(BaseModel):
+    weights: RerankWeights = Field(default_factory=RerankWeights)
+    price_breakpoints: List[float] = Field(default_factory=lambda: [50.0, 200.0, 500.0])
+    price_scores: List[float] = Field(default_factory=lambda: [1.0, 0.8, 0.6, 0.4])
+    price_range_tolerance: float = Field(default=0.25, gt=0.0)
+    max_rating: float = Field(default=5.0, gt=0.0)
+    stock_saturation: int = Field(default=10, ge=1)
+
+    @model_validator(mode="after")
+    def scores_match_breakpoints(self) -> "RerankConfig":
+        if len(self.price_scores) != len(self.price_breakpoints) + 1:
+            raise ValueError("price_scores must have one more entry than price_breakpoints")
+        return self
+
+
+class MultiFactorScorer:
+    def __init__(self, config: Optional[RerankConfig] = None):
+        self._config = config or RerankConfig()
+        self._breakpoints = np.asarray(self._config.price_breakpoints, dtype=np.float64)
+        self._price_scores = np.asarray(self._config.price_scores, dtype=np.float64)
+
+    def score(
+        self,
+        contexts: List[RetrievedContext],
+        relevance_scores: Optional[List[float]] = None,
+        price_range: Optional[PriceRange] = None
+    ) -> np.ndarray:
+        count = len(contexts)
+        weights = self._config.weights
+
+        relevance = (
+            np.asarray(relevance_scores, dtype=np.float64)
+            if relevance_scores is not None
+            else np.fromiter((ctx.relevance_score for ctx in contexts), dtype=np.float64, count=count)
+        )
+        prices = np.fromiter((ctx.product.price for ctx in contexts), dtype=np.float64, count=count)
+        ratings = np.fromiter((ctx.product.rating or 0.0 for ctx in contexts), dtype=np.float64, count=count)
+
+        scores = relevance * weights.relevance
+        scores += self._price_curve(prices, price_range) * weights.price
+        scores += np.clip(ratings / self._config.max_rating, 0.0, 1.0) * weights.rating
+        if weights.stock:
+            stock = np.fromiter((ctx.product.stock_quantity for ctx in contexts), dtype=np.float64, count=count)
+            scores += np.clip(stock / self._config.stock_saturation, 0.0, 1.0) * weights.stock
+        return scores
+
+    def rerank(
+        self,
+        contexts: List[RetrievedContext],
+        relevance_scores: Optional[List[float]] = None,
+        price_range: Optional[PriceRange] = None,
+        top_n: Optional[int] = None
+    ) -> List[RetrievedContext]:
+        if not contexts:
+            return []
+
+        scores = self.score(contexts, relevance_scores, price_range)
+        if top_n is not None and top_n < len(contexts):
+            candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+            order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        else:
+            order = np.argsort(-scores, kind="stable")
+        return [contexts[i] for i in order]
+
+    def _price_curve(self, prices: np.ndarray, price_range: Optional[PriceRange]) -> np.ndarray:
+        if price_range is None:
+            return self._price_scores[np.searchsorted(self._breakpoints, prices, side="left")]
+
+        falloff = max(price_range.max_price, 1.0) * self._config.price_range_tolerance
+        overshoot = np.maximum(price_range.min_price - prices, 0.0) + np.maximum(prices - price_range.max_price, 0.0)
+        return np.clip(1.0 - overshoot / falloff, 0.0, 1.0)
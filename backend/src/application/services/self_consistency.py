@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, FrozenSet, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from src.domain.models.rag import RetrievedContext
+
+
+class ConsistencyStats(BaseModel):
+    samples_requested: int = 0
+    samples_completed: int = 0
+    samples_cancelled: int = 0
+    early_exit: bool = False
+    agreement: float = 0.0
+    agreed_product_ids: List[str] = Field(default_factory=list)
+    latency_min: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def latency_spread(self) -> float:
+        return self.latency_max - self.latency_min
+
+
+class ConsistencyMetrics(BaseModel):
+    runs: int = 0
+    early_exits: int = 0
+    samples_completed: int = 0
+    samples_cancelled: int = 0
+    total_latency_spread: float = 0.0
+
+    @property
+    def early_exit_rate(self) -> float:
+        return self.early_exits / self.runs if self.runs else 0.0
+
+    @property
+    def mean_latency_spread(self) -> float:
+        return self.total_latency_spread / self.runs if self.runs else 0.0
+
+    def record(self, stats: ConsistencyStats) -> None:
+        self.runs += 1
+        self.early_exits += int(stats.early_exit)
+        self.samples_completed += stats.samples_completed
+        self.samples_cancelled += stats.samples_cancelled
+        self.total_latency_spread += stats.latency_spread
+
+
+def mentioned_product_ids(response: str, contexts: List[RetrievedContext]) -> FrozenSet[str]:
+    text = response.lower()
+    mentioned = set()
+    for ctx in sorted(contexts, key=lambda ctx: len(ctx.product.name), reverse=True):
+        name = ctx.product.name.lower()
+        if name and name in text:
+            mentioned.add(str(ctx.product.id))
+            text = text.replace(name, " ")
+    return frozenset(mentioned)
+
+
+def agreement_scores(id_sets: List[FrozenSet[str]]) -> List[float]:
+    if len(id_sets) <= 1:
+        return [1.0] * len(id_sets)
+
+    scores = []
+    for i, ids in enumerate(id_sets):
+        total = 0.0
+        for j, other in enumerate(id_sets):
+            if i == j:
+                continue
+            union = ids | other
+            total += len(ids & other) / len(union) if union else 1.0
+        scores.append(total / (len(id_sets) - 1))
+    return scores
+
+
+class SelfConsistencySampler:
+    def __init__(self, samples: int, max_concurrency: int, quorum: Optional[int] = None):
+        self._samples = samples
+        self._quorum = min(quorum, samples) if quorum else samples // 2 + 1
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._metrics = ConsistencyMetrics()
+
+    @property
+    def metrics(self) -> ConsistencyMetrics:
+        return self._metrics
+
+    async def sample(
+        self,
+        generate: Callable[[], Awaitable[str]],
+        contexts: List[RetrievedContext],
+        extract: Optional[Callable[[str, List[RetrievedContext]], FrozenSet[str]]] = None
+    ) -> Tuple[str, ConsistencyStats]:
+        extract = extract or mentioned_product_ids
+        tasks = [asyncio.create_task(self._timed(generate)) for _ in range(self._samples)]
+        completed: List[Tuple[str, FrozenSet[str], float]] = []
+        early_exit = False
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                response, latency = await next_done
+                completed.append((response, extract(response, contexts), latency))
+                if len(completed) < self._samples and self._has_quorum(completed):
+                    early_exit = True
+                    break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        scores = agreement_scores([ids for _, ids, _ in completed])
+        best = max(range(len(completed)), key=lambda i: (scores[i], -i))
+        latencies = [latency for _, _, latency in completed]
+
+        stats = ConsistencyStats(
+            samples_requested=self._samples,
+            samples_completed=len(completed),
+            samples_cancelled=self._samples - len(completed),
+            early_exit=early_exit,
+            agreement=scores[best],
+            agreed_product_ids=sorted(completed[best][1]),
+            latency_min=min(latencies),
+            latency_max=max(latencies)
+        )
+        self._metrics.record(stats)
+        return completed[best][0], stats
+
+    async def _timed(self, generate: Callable[[], Awaitable[str]]) -> Tuple[str, float]:
+        async with self._semaphore:
+            started = time.perf_counter()
+            response = await generate()
+            return response, time.perf_counter() - started
+
+    def _has_quorum(self, completed: List[Tuple[str, FrozenSet[str], float]]) -> bool:
+        counts = {}
+        for _, ids, _ in completed:
+            if not ids:
+                continue
+            counts[ids] = counts.get(ids, 0) + 1
+            if counts[ids] >= self._quorum:
+                return True
+        return False
+
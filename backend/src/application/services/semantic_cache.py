@@ -0,0 +1,242 @@
+import json
+import time
+from collections import OrderedDict, deque
+from itertools import count
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.domain.models.rag import RAGRequest, RAGResponse
+from src.domain.repositories.embedding_repository import EmbeddingRepository
+
+
+class SemanticCacheConfig(BaseModel):
+    similarity_threshold: float = Field(default=0.92, ge=0.0, le=1.0)
+    max_entries: int = Field(default=1024, ge=1)
+    ttl_seconds: float = Field(default=3600.0, gt=0.0)
+    audit_log_size: int = Field(default=1000, ge=1)
+    cache_follow_ups: bool = Field(default=True)
+
+
+class SemanticCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    false_hits: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def false_hit_rate(self) -> float:
+        return self.false_hits / self.hits if self.hits else 0.0
+
+
+class CacheAuditEntry(BaseModel):
+    audit_id: int
+    outcome: str
+    query: str
+    matched_query: Optional[str] = None
+    similarity: Optional[float] = None
+    generation: int
+    recorded_at: float = Field(default_factory=time.time)
+
+
+class CacheLookup(BaseModel):
+    embedding: List[float]
+    partition: str
+    generation: int
+    response: Optional[RAGResponse] = None
+    audit_id: Optional[int] = None
+
+
+class _CachedAnswer:
+    __slots__ = ("query", "response", "partition_id", "stored_at")
+
+    def __init__(self, query: str, response: RAGResponse, partition_id: int, stored_at: float):
+        self.query = query
+        self.response = response
+        self.partition_id = partition_id
+        self.stored_at = stored_at
+
+
+def request_partition(request: RAGRequest) -> str:
+    price_range = request.price_range.model_dump() if request.price_range else None
+    return json.dumps(
+        {
+            "filters": request.filters,
+            "price_range": price_range,
+            "max_results": request.max_results,
+            "min_relevance": round(request.min_relevance, 4),
+            "include_reasoning": request.include_reasoning,
+            "intent_type": request.intent_type,
+            "response_mode": request.response_mode
+        },
+        sort_keys=True,
+        default=str
+    )
+
+
+class SemanticAnswerCache:
+    def __init__(
+        self,
+        embedding_service: EmbeddingRepository,
+        config: Optional[SemanticCacheConfig] = None,
+        generation: Optional[Callable[[], int]] = None
+    ):
+        self._embedding_service = embedding_service
+        self._config = config or SemanticCacheConfig()
+        self._generation = generation or (lambda: 0)
+        self._vectors: Optional[np.ndarray] = None
+        self._partitions = np.full(self._config.max_entries, -1, dtype=np.int64)
+        self._partition_ids: Dict[Tuple[str, int], int] = {}
+        self._slots: "OrderedDict[int, _CachedAnswer]" = OrderedDict()
+        self._free_slots = list(range(self._config.max_entries - 1, -1, -1))
+        self._audit_log: Deque[CacheAuditEntry] = deque(maxlen=self._config.audit_log_size)
+        self._audit_ids = count(1)
+        self._audited_slots: Dict[int, int] = {}
+        self._stats = SemanticCacheStats()
+        self._last_generation: Optional[int] = None
+
+    @property
+    def stats(self) -> SemanticCacheStats:
+        self._stats.entries = len(self._slots)
+        return self._stats
+
+    @property
+    def audit_log(self) -> List[CacheAuditEntry]:
+        return list(self._audit_log)
+
+    def cacheable(self, request: RAGRequest) -> bool:
+        return self._config.cache_follow_ups or not request.conversation_context
+
+    async def lookup(self, request: RAGRequest) -> CacheLookup:
+        embedding = request.query_embedding or await self._embedding_service.embed_text(request.query)
+        generation = self._generation()
+        self._expire_generation(generation)
+
+        lookup = CacheLookup(embedding=embedding, partition=request_partition(request), generation=generation)
+        partition_id = self._partition_ids.get((lookup.partition, generation))
+        match = self._nearest(embedding, partition_id) if partition_id is not None else None
+
+        if match is None:
+            self._stats.misses += 1
+            return lookup
+
+        slot, similarity = match
+        cached = self._slots[slot]
+        self._slots.move_to_end(slot)
+        self._stats.hits += 1
+        lookup.audit_id = self._audit("hit", request.query, generation, cached.query, similarity)
+        self._audited_slots[lookup.audit_id] = slot
+        lookup.response = cached.response.model_copy(update={
+            "query": request.query,
+            "metadata": {
+                **cached.response.metadata,
+                "semantic_cache": {
+                    "matched_query": cached.query,
+                    "similarity": similarity,
+                    "audit_id": lookup.audit_id
+                }
+            }
+        })
+        return lookup
+
+    def store(self, lookup: CacheLookup, query: str, response: RAGResponse) -> None:
+        if lookup.generation != self._generation():
+            return
+
+        vector = self._normalize(lookup.embedding)
+        if self._vectors is None:
+            self._vectors = np.zeros((self._config.max_entries, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._vectors.shape[1]:
+            return
+
+        if not self._free_slots:
+            self._evict(next(iter(self._slots)))
+            self._stats.evictions += 1
+        slot = self._free_slots.pop()
+
+        key = (lookup.partition, lookup.generation)
+        partition_id = self._partition_ids.setdefault(key, len(self._partition_ids))
+        self._vectors[slot] = vector
+        self._partitions[slot] = partition_id
+        self._slots[slot] = _CachedAnswer(query, response, partition_id, time.monotonic())
+
+    def flag_false_hit(self, audit_id: int) -> bool:
+        slot = self._audited_slots.pop(audit_id, None)
+        entry = next((entry for entry in self._audit_log if entry.audit_id == audit_id), None)
+        if entry is None or entry.outcome != "hit":
+            return False
+
+        self._stats.false_hits += 1
+        self._audit("false_hit", entry.query, entry.generation, entry.matched_query, entry.similarity)
+        if slot is not None and slot in self._slots and self._slots[slot].query == entry.matched_query:
+            self._evict(slot)
+        return True
+
+    def clear(self) -> None:
+        for slot in list(self._slots):
+            self._evict(slot)
+        self._partition_ids.clear()
+
+    def _nearest(self, embedding: List[float], partition_id: int) -> Optional[Tuple[int, float]]:
+        if self._vectors is None or not self._slots:
+            return None
+        query = self._normalize(embedding)
+        if query.shape[0] != self._vectors.shape[1]:
+            return None
+
+        candidates = np.flatnonzero(self._partitions == partition_id)
+        if candidates.size == 0:
+            return None
+
+        similarities = self._vectors[candidates] @ query
+        best = int(np.argmax(similarities))
+        slot, similarity = int(candidates[best]), float(similarities[best])
+        if similarity < self._config.similarity_threshold:
+            return None
+        if time.monotonic() - self._slots[slot].stored_at > self._config.ttl_seconds:
+            self._evict(slot)
+            return None
+        return slot, similarity
+
+    def _expire_generation(self, generation: int) -> None:
+        if self._last_generation is not None and generation != self._last_generation:
+            self.clear()
+        self._last_generation = generation
+
+    def _evict(self, slot: int) -> None:
+        self._slots.pop(slot, None)
+        self._partitions[slot] = -1
+        self._free_slots.append(slot)
+
+    def _audit(
+        self,
+        outcome: str,
+        query: str,
+        generation: int,
+        matched_query: Optional[str] = None,
+        similarity: Optional[float] = None
+    ) -> int:
+        audit_id = next(self._audit_ids)
+        self._audit_log.append(CacheAuditEntry(
+            audit_id=audit_id,
+            outcome=outcome,
+            query=query,
+            matched_query=matched_query,
+            similarity=similarity,
+            generation=generation
+        ))
+        if len(self._audited_slots) > self._config.audit_log_size:
+            self._audited_slots.pop(next(iter(self._audited_slots)))
+        return audit_id
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
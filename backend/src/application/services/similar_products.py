@@ -0,0 +1,48 @@
+from typing import List
+
+from src.domain.models.search_result import SearchResult
+from src.infrastructure.vector_store.chroma_repository import ChromaVectorRepository
+from src.infrastructure.vector_store.neighbor_graph import NeighborGraph
+
+
+class SimilarProductsService:
+    def __init__(
+        self,
+        vector_repository: ChromaVectorRepository,
+        neighbor_graph: NeighborGraph
+    ):
+        self._vector_repository = vector_repository
+        self._graph = neighbor_graph
+    
+    async def refresh(self) -> int:
+        ids, vectors = await self._vector_repository.get_embeddings()
+        self._graph.build(ids, vectors)
+        return len(ids)
+    
+    async def index_products(self, product_ids: List[str]) -> None:
+        ids, vectors = await self._vector_repository.get_embeddings(product_ids)
+        self._graph.add(ids, vectors)
+    
+    def remove_product(self, product_id: str) -> None:
+        self._graph.remove(product_id)
+    
+    async def has_product(self, product_id: str) -> bool:
+        return product_id in self._graph
+    
+    async def find_similar(self, product_id: str, limit: int = 10) -> List[SearchResult]:
+        neighbors = self._graph.neighbors(product_id, limit)
+        if not neighbors:
+            return []
+        
+        scores = dict(neighbors)
+        products = await self._vector_repository.get_products([neighbor_id for neighbor_id, _ in neighbors])
+        
+        return [
+            SearchResult.model_construct(
+                product=product,
+                score=max(0.0, min(1.0, scores[str(product.id)])),
+                chunk_text=None,
+                metadata={}
+            )
+            for product in products
+        ]
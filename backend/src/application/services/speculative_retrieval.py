@@ -0,0 +1,106 @@
+import asyncio
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from src.domain.models.search_result import CandidatePool
+from src.domain.repositories.vector_repository import VectorRepository
+from src.domain.repositories.embedding_repository import EmbeddingRepository
+from src.infrastructure.tracing import traced
+
+
+class SpeculationConfig(BaseModel):
+    enabled: bool = Field(default=True)
+    candidate_pool: int = Field(default=40, ge=1, le=200)
+    include_embeddings: bool = Field(default=True)
+
+
+class SpeculationMetrics(BaseModel):
+    started: int = 0
+    used: int = 0
+    cancelled: int = 0
+    failed: int = 0
+
+    @property
+    def waste_rate(self) -> float:
+        return self.cancelled / self.started if self.started else 0.0
+
+
+class SpeculativeResult:
+    __slots__ = ("embedding", "pool")
+
+    def __init__(self, embedding: List[float], pool: CandidatePool):
+        self.embedding = embedding
+        self.pool = pool
+
+
+class Speculation:
+    def __init__(self, task: "asyncio.Task[SpeculativeResult]", metrics: SpeculationMetrics):
+        self._task = task
+        self._metrics = metrics
+        self._settled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._task.cancelled()
+
+    def cancel(self) -> None:
+        if self._settled:
+            return
+        self._settled = True
+        self._task.cancel()
+        self._metrics.cancelled += 1
+
+    async def result(self) -> Optional[SpeculativeResult]:
+        if self._settled and not self._task.done():
+            return None
+        try:
+            result = await self._task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if not self._task.cancelled() or (current is not None and current.cancelling()):
+                raise
+            return None
+        except Exception:
+            if not self._settled:
+                self._settled = True
+                self._metrics.failed += 1
+            return None
+
+        if not self._settled:
+            self._settled = True
+            self._metrics.used += 1
+        return result
+
+
+class SpeculativeRetriever:
+    def __init__(
+        self,
+        embedding_service: EmbeddingRepository,
+        vector_repository: VectorRepository,
+        config: Optional[SpeculationConfig] = None
+    ):
+        self._embedding_service = embedding_service
+        self._vector_repository = vector_repository
+        self._config = config or SpeculationConfig()
+        self._metrics = SpeculationMetrics()
+
+    @property
+    def metrics(self) -> SpeculationMetrics:
+        return self._metrics
+
+    def start(self, query: str) -> Optional[Speculation]:
+        if not self._config.enabled or not query.strip():
+            return None
+        self._metrics.started += 1
+        return Speculation(asyncio.create_task(self._retrieve(query)), self._metrics)
+
+    @traced("retrieval.speculative")
+    async def _retrieve(self, query: str) -> SpeculativeResult:
+        embedding = await self._embedding_service.embed_text(query)
+        hits = await self._vector_repository.search_hits(
+            query_embedding=embedding,
+            top_k=self._config.candidate_pool,
+            filters=None,
+            include_embeddings=self._config.include_embeddings
+        )
+        return SpeculativeResult(embedding, CandidatePool(hits, exhaustive=len(hits) < self._config.candidate_pool))
@@ -0,0 +1,116 @@
+import json
+import re
+from typing import Dict, FrozenSet, List, Optional
+from pydantic import BaseModel, Field, ValidationError
+
+from src.domain.models.rag import RetrievedContext
+
+STRUCTURED_OUTPUT_INSTRUCTIONS = (
+    "Respond only with JSON matching this schema:\n"
+    '{"recommendations": [{"product_id": "<product number or id>", "reason": "<one short sentence>"}], '
+    '"summary": "<one or two sentences>"}\n'
+    "List recommendations best first and only use products from the list above."
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+_PRODUCT_NUMBER = re.compile(r"^(?:product\s*)?#?(\d+)$", re.IGNORECASE)
+
+
+class RecommendationItem(BaseModel):
+    product_id: str = Field(min_length=1)
+    reason: str = Field(default="", max_length=500)
+
+
+class StructuredRecommendation(BaseModel):
+    recommendations: List[RecommendationItem] = Field(default_factory=list)
+    summary: Optional[str] = None
+
+
+class StructuredParseResult(BaseModel):
+    product_ids: List[str] = Field(default_factory=list)
+    reasons: Dict[str, str] = Field(default_factory=dict)
+    summary: Optional[str] = None
+    invalid_ids: List[str] = Field(default_factory=list)
+    fallback_reason: Optional[str] = None
+
+    @property
+    def used_fallback(self) -> bool:
+        return self.fallback_reason is not None
+
+
+def parse_structured_recommendation(raw: str, contexts: List[RetrievedContext]) -> StructuredParseResult:
+    retrieved_ids = [str(ctx.product.id) for ctx in contexts]
+
+    try:
+        payload = _load_json(raw)
+        parsed = StructuredRecommendation.model_validate(payload)
+    except (ValueError, ValidationError) as e:
+        return _fallback(retrieved_ids, f"invalid structured output: {type(e).__name__}")
+
+    product_ids: List[str] = []
+    reasons: Dict[str, str] = {}
+    invalid_ids: List[str] = []
+    for item in parsed.recommendations:
+        product_id = _resolve_product_id(item.product_id.strip(), retrieved_ids)
+        if product_id is None:
+            invalid_ids.append(item.product_id)
+            continue
+        if product_id in reasons:
+            continue
+        product_ids.append(product_id)
+        reasons[product_id] = item.reason.strip()
+
+    if not product_ids:
+        result = _fallback(retrieved_ids, "no recommended product matched the retrieved set")
+        result.invalid_ids = invalid_ids
+        result.summary = parsed.summary
+        return result
+
+    return StructuredParseResult(
+        product_ids=product_ids,
+        reasons=reasons,
+        summary=parsed.summary,
+        invalid_ids=invalid_ids
+    )
+
+
+def structured_product_ids(raw: str, contexts: List[RetrievedContext]) -> FrozenSet[str]:
+    result = parse_structured_recommendation(raw, contexts)
+    return frozenset() if result.used_fallback else frozenset(result.product_ids)
+
+
+def render_structured_reasoning(result: StructuredParseResult, contexts: List[RetrievedContext]) -> Optional[str]:
+    names = {str(ctx.product.id): ctx.product.name for ctx in contexts}
+    lines = [
+        f"{position}. {names[product_id]} - {result.reasons[product_id]}"
+        for position, product_id in enumerate(result.product_ids, 1)
+        if result.reasons.get(product_id)
+    ]
+    if result.summary:
+        lines.insert(0, result.summary.strip())
+    return "\n".join(lines) if lines else None
+
+
+def _load_json(raw: str):
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        match = _JSON_OBJECT.search(raw)
+        if match is None:
+            raise
+        return json.loads(match.group(0))
+
+
+def _resolve_product_id(reference: str, retrieved_ids: List[str]) -> Optional[str]:
+    if reference in retrieved_ids:
+        return reference
+    match = _PRODUCT_NUMBER.match(reference)
+    if match:
+        position = int(match.group(1))
+        if 1 <= position <= len(retrieved_ids):
+            return retrieved_ids[position - 1]
+    return None
+
+
+def _fallback(retrieved_ids: List[str], reason: str) -> StructuredParseResult:
+    return StructuredParseResult(product_ids=list(retrieved_ids), fallback_reason=reason)
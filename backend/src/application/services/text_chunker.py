@@ -37,8 +37,8 @@ class TextChunker:
                     end_index=end
                 ))
             
-            start = end - self._config.chunk_overlap
-            if start >= len(text):
+            if end >= len(text):
                 break
+            start = max(end - self._config.chunk_overlap, start + 1)
         
         return chunks
\ No newline at end of file
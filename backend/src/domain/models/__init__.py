@@ -4,7 +4,7 @@ from src.domain.models.conversation import Conversation
 from src.domain.models.message import Message
 from src.domain.models.intent import DetectedIntent
 from src.domain.models.entity import Entity
-from src.domain.models.search_result import SearchResult
+from src.domain.models.search_result import SearchResult, SearchHit, merge_search_hits
 from src.domain.models.text_chunk import TextChunk, ChunkConfig
 from src.domain.models.rag import (
     RetrievedContext,
@@ -32,6 +32,8 @@ __all__ = [
     "DetectedIntent",
     "Entity",
     "SearchResult",
+    "SearchHit",
+    "merge_search_hits",
     "TextChunk",
     "ChunkConfig",
     "RetrievedContext",
@@ -28,6 +28,8 @@ class ConversationContext(BaseModel):
     collected_entities: dict[str, list[str]] = Field(default_factory=dict)
     search_history: list[str] = Field(default_factory=list)
     recommended_products: list[UUID] = Field(default_factory=list)
+    ranked_product_ids: list[str] = Field(default_factory=list)
+    product_reasons: dict[str, str] = Field(default_factory=dict)
     user_preferences: dict[str, str] = Field(default_factory=dict)
     clarification_needed: Optional[str] = None
 
@@ -71,6 +73,11 @@ class ConversationState(BaseModel):
             self.context.recommended_products.append(product_id)
         self.update_activity()
 
+    def set_ranking(self, ranked_product_ids: list[str], product_reasons: dict[str, str]) -> None:
+        self.context.ranked_product_ids = list(ranked_product_ids)
+        self.context.product_reasons = dict(product_reasons)
+        self.update_activity()
+
     def mark_completed(self) -> None:
         self.status = ConversationStatus.COMPLETED
         self.current_state = DialogState.CLOSING
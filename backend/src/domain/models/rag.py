@@ -1,9 +1,11 @@
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 from src.domain.value_objects.identifiers import ProductId
+from src.domain.value_objects.entities import PriceRange
 from src.domain.models.product import Product
+from src.domain.models.search_result import CandidatePool
 
 
 class RetrievedContext(BaseModel):
@@ -14,10 +16,19 @@ class RetrievedContext(BaseModel):
 
 
 class RAGRequest(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     query: str = Field(min_length=1)
     max_results: int = Field(default=5, ge=1, le=20)
     min_relevance: float = Field(default=0.5, ge=0.0, le=1.0)
     include_reasoning: bool = Field(default=True)
+    price_range: Optional[PriceRange] = None
+    filters: Optional[Dict[str, Any]] = None
+    conversation_context: Optional[str] = None
+    intent_type: Optional[str] = None
+    response_mode: str = Field(default="auto", pattern="^(auto|generate|list)$")
+    query_embedding: Optional[List[float]] = Field(default=None, exclude=True)
+    candidate_pool: Optional[CandidatePool] = Field(default=None, exclude=True)
 
 
 class RAGResponse(BaseModel):
@@ -28,6 +39,9 @@ class RAGResponse(BaseModel):
     confidence_score: float = Field(ge=0.0, le=1.0)
     generated_at: datetime = Field(default_factory=datetime.utcnow)
     model_used: str
+    ranked_product_ids: List[str] = Field(default_factory=list)
+    product_reasons: Dict[str, str] = Field(default_factory=dict)
+    metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
 class PromptContext(BaseModel):
@@ -0,0 +1,113 @@
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from src.domain.models.product import Product
+from src.domain.value_objects.identifiers import ProductIdentifier
+
+
+class SearchResult(BaseModel):
+    product: Product
+    score: float = Field(ge=0.0, le=1.0)
+    chunk_text: Optional[str] = None
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+class SearchHit:
+    __slots__ = ("product_id", "score", "document", "metadata", "embedding")
+
+    def __init__(
+        self,
+        product_id: str,
+        score: float,
+        document: str,
+        metadata: Mapping[str, Any],
+        embedding: Optional[Sequence[float]] = None
+    ):
+        self.product_id = product_id
+        self.score = score
+        self.document = document
+        self.metadata = MappingProxyType(metadata)
+        self.embedding = embedding
+
+    @property
+    def category(self) -> str:
+        return self.metadata.get("category", "")
+
+    @property
+    def brand(self) -> Optional[str]:
+        return self.metadata.get("brand") or None
+
+    @property
+    def price(self) -> float:
+        return self.metadata.get("price", 0.0)
+
+    @property
+    def rating(self) -> Optional[float]:
+        return self.metadata.get("rating")
+
+    @property
+    def chunk_position(self) -> Optional[int]:
+        return self.metadata.get("chunk_position")
+
+    def to_product(self) -> Product:
+        features = self.metadata.get("features", "")
+        return Product.model_construct(
+            id=_product_identifier(self.product_id),
+            name=self.metadata.get("name", ""),
+            description=self.document,
+            category=self.category,
+            price=self.price,
+            brand=self.brand,
+            features=features.split(",") if features else [],
+            rating=self.rating,
+            stock_quantity=self.metadata.get("stock_quantity", 0)
+        )
+
+    def to_search_result(self) -> SearchResult:
+        return SearchResult.model_construct(
+            product=self.to_product(),
+            score=self.score,
+            chunk_text=self.document,
+            metadata=dict(self.metadata)
+        )
+
+    def __repr__(self) -> str:
+        return f"SearchHit(product_id={self.product_id!r}, score={self.score:.4f})"
+
+
+class CandidatePool:
+    __slots__ = ("hits", "exhaustive")
+
+    def __init__(self, hits: Sequence[SearchHit], exhaustive: bool):
+        self.hits = list(hits)
+        self.exhaustive = exhaustive
+
+    def __len__(self) -> int:
+        return len(self.hits)
+
+    def __repr__(self) -> str:
+        return f"CandidatePool(hits={len(self.hits)}, exhaustive={self.exhaustive})"
+
+
+def merge_search_hits(
+    per_query_hits: List[List[SearchHit]],
+    top_k: Optional[int] = None
+) -> List[SearchHit]:
+    best: Dict[str, SearchHit] = {}
+    for hits in per_query_hits:
+        for hit in hits:
+            current = best.get(hit.product_id)
+            if current is None or hit.score > current.score:
+                best[hit.product_id] = hit
+
+    merged = sorted(best.values(), key=lambda hit: hit.score, reverse=True)
+    return merged if top_k is None else merged[:top_k]
+
+
+def _product_identifier(product_id: str) -> Union[ProductIdentifier, str]:
+    try:
+        return ProductIdentifier.model_construct(value=UUID(product_id))
+    except ValueError:
+        return product_id
@@ -1,6 +1,6 @@
 from typing import Protocol, List, Optional
 from src.domain.models.product import Product
-from src.domain.models.search_result import SearchResult
+from src.domain.models.search_result import SearchHit, SearchResult
 
 class VectorRepository(Protocol):
     async def add_products(self, products: List[Product]) -> None:
@@ -14,8 +14,30 @@ class VectorRepository(Protocol):
     ) -> List[SearchResult]:
         ...
     
+    async def search_hits(
+        self, 
+        query_embedding: List[float], 
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[SearchHit]:
+        ...
+    
+    async def search_many(
+        self, 
+        query_embeddings: List[List[float]], 
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[SearchHit]]:
+        ...
+    
     async def delete_product(self, product_id: str) -> None:
         ...
     
     async def get_product_count(self) -> int:
+        ...
+    
+    @property
+    def generation(self) -> int:
         ...
\ No newline at end of file
@@ -1,5 +1,6 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class OllamaSettings(BaseSettings):
@@ -26,6 +27,40 @@ class Settings(BaseSettings):
     debug: bool = False
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    vector_snapshot_path: Optional[str] = None
+    columnar_metadata_index_enabled: bool = True
+    chunk_retrieval_enabled: bool = False
+    category_sharding_enabled: bool = False
+    category_shard_buckets: int = Field(default=0, ge=0, le=256)
+    search_cache_enabled: bool = True
+    search_cache_max_entries: int = Field(default=1024, ge=1)
+    search_cache_ttl_seconds: float = Field(default=300.0, gt=0.0)
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = Field(default=0.92, ge=0.0, le=1.0)
+    speculative_retrieval_enabled: bool = True
+    listwise_rerank_enabled: bool = False
+    listwise_rerank_budget_ms: float = Field(default=800.0, gt=0.0)
+    structured_output_enabled: bool = False
+    query_rewrite_enabled: bool = True
+    query_rewrite_llm_fallback: bool = True
+    query_rewrite_budget_ms: float = Field(default=600.0, gt=0.0)
+    category_aliases: Dict[str, List[str]] = Field(default_factory=lambda: {
+        "Headphones": ["earbuds", "earphones", "headset", "in-ear", "over-ear"],
+        "Laptops": ["notebook", "ultrabook"],
+        "Smartphones": ["phone", "cell phone", "mobile phone"],
+        "Smartwatches": ["watch", "fitness tracker"],
+        "Speakers": ["soundbar", "bluetooth speaker"],
+    })
+    brand_aliases: Dict[str, List[str]] = Field(default_factory=lambda: {
+        "Hewlett-Packard": ["HP"],
+        "Ultimate Ears": ["UE"],
+    })
+    tracing_enabled: bool = True
+    trace_log_path: Optional[str] = "./data/traces/traces.jsonl"
+    trace_log_max_bytes: int = Field(default=10 * 1024 * 1024, ge=0)
+    trace_log_backups: int = Field(default=3, ge=0)
+    trace_buffer_size: int = Field(default=200, ge=1)
+    slow_trace_ms: float = Field(default=1000.0, ge=0.0)
     
     ollama: OllamaSettings = OllamaSettings()
 
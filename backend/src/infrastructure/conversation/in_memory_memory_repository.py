@@ -3,15 +3,18 @@ from uuid import UUID
 
 from src.domain.models.memory import ConversationMemory
 from src.domain.repositories.conversation_state_repository import ConversationMemoryRepository
+from src.infrastructure.tracing import traced
 
 
 class InMemoryMemoryRepository:
     def __init__(self):
         self._memories: dict[UUID, ConversationMemory] = {}
 
+    @traced("memory_repository.save_memory")
     async def save_memory(self, memory: ConversationMemory) -> None:
         self._memories[memory.conversation_id] = memory
 
+    @traced("memory_repository.get_memory")
     async def get_memory(self, conversation_id: UUID) -> Optional[ConversationMemory]:
         return self._memories.get(conversation_id)
 
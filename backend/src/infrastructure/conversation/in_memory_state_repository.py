@@ -4,15 +4,18 @@ from datetime import datetime, timedelta
 
 from src.domain.models.conversation_state import ConversationState, ConversationStatus
 from src.domain.repositories.conversation_state_repository import ConversationStateRepository
+from src.infrastructure.tracing import traced
 
 
 class InMemoryStateRepository:
     def __init__(self):
         self._states: dict[UUID, ConversationState] = {}
 
+    @traced("state_repository.save_state")
     async def save_state(self, state: ConversationState) -> None:
         self._states[state.conversation_id] = state
 
+    @traced("state_repository.get_state")
     async def get_state(self, conversation_id: UUID) -> Optional[ConversationState]:
         return self._states.get(conversation_id)
 
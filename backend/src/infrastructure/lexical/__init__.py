@@ -0,0 +1,3 @@
+from .bm25_index import BM25Index, BM25Config, tokenize
+
+__all__ = ["BM25Index", "BM25Config", "tokenize"]
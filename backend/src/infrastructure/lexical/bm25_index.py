@@ -0,0 +1,162 @@
+import heapq
+import math
+import re
+from array import array
+from typing import Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from src.domain.models.product import Product
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+TOKEN_SEPARATORS = re.compile(r"[-./]")
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        tokens.append(token)
+        if TOKEN_SEPARATORS.search(token):
+            parts = [part for part in TOKEN_SEPARATORS.split(token) if part]
+            tokens.extend(parts)
+            tokens.append("".join(parts))
+    return tokens
+
+
+class BM25Config(BaseModel):
+    k1: float = Field(default=1.2, ge=0.0)
+    b: float = Field(default=0.75, ge=0.0, le=1.0)
+    compaction_ratio: float = Field(default=0.25, gt=0.0, le=1.0)
+
+
+class _PostingList:
+    __slots__ = ("slots", "frequencies")
+
+    def __init__(self) -> None:
+        self.slots = array("I")
+        self.frequencies = array("I")
+
+    def append(self, slot: int, frequency: int) -> None:
+        self.slots.append(slot)
+        self.frequencies.append(frequency)
+
+
+class BM25Index:
+    def __init__(self, config: Optional[BM25Config] = None):
+        self._config = config or BM25Config()
+        self._postings: Dict[str, _PostingList] = {}
+        self._doc_freq: Dict[str, int] = {}
+        self._doc_lengths = array("I")
+        self._slot_ids: List[Optional[str]] = []
+        self._slot_terms: List[Tuple[str, ...]] = []
+        self._slots: Dict[str, int] = {}
+        self._products: Dict[str, Product] = {}
+        self._total_length = 0
+        self._dead_slots = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add_products(self, products: List[Product]) -> None:
+        for product in products:
+            self.add_product(product)
+
+    def add_product(self, product: Product) -> None:
+        product_id = str(product.id)
+        if product_id in self._slots:
+            self.remove(product_id)
+
+        frequencies: Dict[str, int] = {}
+        tokens = tokenize(product.to_document())
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        slot = len(self._slot_ids)
+        self._slot_ids.append(product_id)
+        self._slot_terms.append(tuple(frequencies))
+        self._doc_lengths.append(len(tokens))
+        self._slots[product_id] = slot
+        self._products[product_id] = product
+        self._total_length += len(tokens)
+
+        for term, frequency in frequencies.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = _PostingList()
+            posting.append(slot, frequency)
+            self._doc_freq[term] = self._doc_freq.get(term, 0) + 1
+
+    def remove(self, product_id: str) -> bool:
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return False
+
+        for term in self._slot_terms[slot]:
+            self._doc_freq[term] -= 1
+        self._total_length -= self._doc_lengths[slot]
+        self._slot_ids[slot] = None
+        self._slot_terms[slot] = ()
+        self._products.pop(product_id, None)
+        self._dead_slots += 1
+
+        if self._dead_slots > len(self._slot_ids) * self._config.compaction_ratio:
+            self.compact()
+        return True
+
+    def get_product(self, product_id: str) -> Optional[Product]:
+        return self._products.get(product_id)
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        doc_count = len(self._slots)
+        if doc_count == 0:
+            return []
+
+        k1, b = self._config.k1, self._config.b
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            doc_freq = self._doc_freq.get(term, 0)
+            if posting is None or doc_freq == 0:
+                continue
+
+            idf = math.log(1.0 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+            for slot, frequency in zip(posting.slots, posting.frequencies):
+                if self._slot_ids[slot] is None:
+                    continue
+                norm = k1 * (1.0 - b + b * self._doc_lengths[slot] / avg_length)
+                scores[slot] = scores.get(slot, 0.0) + idf * frequency * (k1 + 1.0) / (frequency + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self._slot_ids[slot], score) for slot, score in best]
+
+    def compact(self) -> None:
+        remap: Dict[int, int] = {}
+        slot_ids: List[Optional[str]] = []
+        slot_terms: List[Tuple[str, ...]] = []
+        doc_lengths = array("I")
+
+        for old_slot, product_id in enumerate(self._slot_ids):
+            if product_id is None:
+                continue
+            remap[old_slot] = len(slot_ids)
+            slot_ids.append(product_id)
+            slot_terms.append(self._slot_terms[old_slot])
+            doc_lengths.append(self._doc_lengths[old_slot])
+
+        postings: Dict[str, _PostingList] = {}
+        for term, posting in self._postings.items():
+            compacted = _PostingList()
+            for slot, frequency in zip(posting.slots, posting.frequencies):
+                if slot in remap:
+                    compacted.append(remap[slot], frequency)
+            if compacted.slots:
+                postings[term] = compacted
+
+        self._postings = postings
+        self._doc_freq = {term: len(posting.slots) for term, posting in postings.items()}
+        self._slot_ids = slot_ids
+        self._slot_terms = slot_terms
+        self._doc_lengths = doc_lengths
+        self._slots = {product_id: slot for slot, product_id in enumerate(slot_ids)}
+        self._dead_slots = 0
@@ -0,0 +1,30 @@
+from .tracer import (
+    Span,
+    Trace,
+    TraceExporter,
+    Tracer,
+    current_request_id,
+    current_span,
+    set_request_id,
+    span,
+    traced,
+    tracer,
+)
+from .exporters import JsonlTraceExporter, TraceRingBuffer
+from .waterfall import render_waterfall
+
+__all__ = [
+    "Span",
+    "Trace",
+    "TraceExporter",
+    "Tracer",
+    "current_request_id",
+    "current_span",
+    "set_request_id",
+    "span",
+    "traced",
+    "tracer",
+    "JsonlTraceExporter",
+    "TraceRingBuffer",
+    "render_waterfall",
+]
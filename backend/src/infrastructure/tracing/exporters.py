@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+from src.infrastructure.tracing.tracer import Trace
+
+
+class JsonlTraceExporter:
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._lock = threading.Lock()
+        self._stream = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(trace.to_dict(), default=str) + "\n"
+        with self._lock:
+            stream = self._open()
+            if self._max_bytes and stream.tell() + len(line) > self._max_bytes and stream.tell() > 0:
+                self._rotate()
+                stream = self._open()
+            stream.write(line)
+            stream.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def _open(self):
+        if self._stream is None:
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._stream = open(self._path, "a", encoding="utf-8")
+        return self._stream
+
+    def _rotate(self) -> None:
+        self._stream.close()
+        self._stream = None
+        if self._backup_count <= 0:
+            os.remove(self._path)
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{self._path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self._path}.{index + 1}")
+        os.replace(self._path, f"{self._path}.1")
+
+
+class TraceRingBuffer:
+    def __init__(self, capacity: int = 200):
+        self._traces: Deque[Trace] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    def export(self, trace: Trace) -> None:
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: int = 20, min_duration_ms: float = 0.0, name: Optional[str] = None) -> List[Trace]:
+        with self._lock:
+            traces = list(self._traces)
+        matched = [
+            trace for trace in reversed(traces)
+            if trace.duration_ms >= min_duration_ms and (name is None or trace.root.name == name)
+        ]
+        return matched[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._traces.clear()
@@ -0,0 +1,164 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import count
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, TypeVar
+from uuid import uuid4
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_span_ids = count(1)
+
+
+class Span:
+    __slots__ = ("span_id", "parent_id", "name", "start", "end", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[int], attributes: Dict[str, Any]):
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+class Trace:
+    __slots__ = ("trace_id", "request_id", "started_at", "spans", "finished")
+
+    def __init__(self, request_id: str):
+        self.trace_id = uuid4().hex
+        self.request_id = request_id
+        self.started_at = time.time()
+        self.spans: List[Span] = []
+        self.finished = False
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        origin = self.root.start
+        return {
+            "trace_id": self.trace_id,
+            "request_id": self.request_id,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "spans": [
+                {
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "name": span.name,
+                    "offset_ms": round((span.start - origin) * 1000, 3),
+                    "duration_ms": round(span.duration_ms, 3),
+                    "attributes": span.attributes,
+                    "error": span.error
+                }
+                for span in self.spans
+            ]
+        }
+
+
+class TraceExporter(Protocol):
+    def export(self, trace: Trace) -> None:
+        ...
+
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str] = None) -> str:
+    request_id = request_id or uuid4().hex
+    _request_id.set(request_id)
+    return request_id
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+class Tracer:
+    def __init__(self, exporters: Optional[List[TraceExporter]] = None, enabled: bool = True):
+        self._exporters: List[TraceExporter] = list(exporters or [])
+        self.enabled = enabled
+
+    def add_exporter(self, exporter: TraceExporter) -> None:
+        self._exporters.append(exporter)
+
+    def clear_exporters(self) -> None:
+        self._exporters.clear()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        if not self.enabled:
+            yield None
+            return
+
+        trace = _current_trace.get()
+        owns_trace = trace is None or trace.finished
+        if owns_trace:
+            trace = Trace(_request_id.get() or uuid4().hex)
+        parent = None if owns_trace else _current_span.get()
+
+        span = Span(name, parent.span_id if parent else None, attributes)
+        trace.spans.append(span)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if owns_trace:
+                trace.finished = True
+                self._export(trace)
+
+    def traced(self, name: str) -> Callable[[F], F]:
+        def decorator(func: F) -> F:
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _export(self, trace: Trace) -> None:
+        for exporter in self._exporters:
+            try:
+                exporter.export(trace)
+            except Exception:
+                continue
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes: Any):
+    return tracer.span(name, **attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    return tracer.traced(name)
@@ -0,0 +1,34 @@
+from typing import Any, Dict, List
+
+from src.infrastructure.tracing.tracer import Trace
+
+
+def render_waterfall(trace: Trace, width: int = 40) -> Dict[str, Any]:
+    data = trace.to_dict()
+    total = data["duration_ms"] or 1.0
+    depths: Dict[int, int] = {}
+    rows: List[Dict[str, Any]] = []
+
+    for span in data["spans"]:
+        depth = depths.get(span["parent_id"], -1) + 1 if span["parent_id"] is not None else 0
+        depths[span["span_id"]] = depth
+        start = min(width - 1, int(span["offset_ms"] / total * width))
+        length = max(1, round(span["duration_ms"] / total * width))
+        rows.append({
+            "name": span["name"],
+            "depth": depth,
+            "offset_ms": span["offset_ms"],
+            "duration_ms": span["duration_ms"],
+            "share": round(span["duration_ms"] / total, 4),
+            "bar": (" " * start + "█" * length)[:width].ljust(width),
+            "attributes": span["attributes"],
+            "error": span["error"]
+        })
+
+    return {
+        "trace_id": data["trace_id"],
+        "request_id": data["request_id"],
+        "started_at": data["started_at"],
+        "duration_ms": data["duration_ms"],
+        "spans": rows
+    }
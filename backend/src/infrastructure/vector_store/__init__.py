@@ -1,3 +1,23 @@
 from .chroma_repository import ChromaVectorRepository
+from .sharded_chroma_repository import ShardedChromaVectorRepository, ShardedChromaConfig
+from .columnar_index import ColumnarMetadataIndex, UnsupportedFilterError
+from .cached_repository import CachingVectorRepository, SearchCacheConfig
+from .neighbor_graph import NeighborGraph, NeighborGraphConfig
+from .snapshot import SnapshotError, SnapshotManifest, VectorSnapshot, read_snapshot, warm_snapshot
 
-__all__ = ["ChromaVectorRepository"]
\ No newline at end of file
+__all__ = [
+    "ChromaVectorRepository",
+    "ShardedChromaVectorRepository",
+    "ShardedChromaConfig",
+    "ColumnarMetadataIndex",
+    "UnsupportedFilterError",
+    "CachingVectorRepository",
+    "SearchCacheConfig",
+    "NeighborGraph",
+    "NeighborGraphConfig",
+    "SnapshotError",
+    "SnapshotManifest",
+    "VectorSnapshot",
+    "read_snapshot",
+    "warm_snapshot",
+]
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, Field
+from src.domain.models.product import Product
+from src.domain.models.search_result import SearchHit, SearchResult
+from src.domain.repositories.vector_repository import VectorRepository
+
+
+class SearchCacheConfig(BaseModel):
+    max_entries: int = Field(default=1024, ge=1)
+    ttl_seconds: float = Field(default=300.0, gt=0.0)
+    quantization_decimals: int = Field(default=4, ge=1, le=8)
+
+
+class SearchCacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CachingVectorRepository:
+    def __init__(self, repository: VectorRepository, config: Optional[SearchCacheConfig] = None):
+        self._repository = repository
+        self._config = config or SearchCacheConfig()
+        self._entries: "OrderedDict[str, Tuple[float, List[SearchResult]]]" = OrderedDict()
+        self._stats = SearchCacheStats()
+
+    @property
+    def generation(self) -> int:
+        return self._repository.generation
+
+    @property
+    def stats(self) -> SearchCacheStats:
+        self._stats.entries = len(self._entries)
+        return self._stats
+
+    async def add_products(self, products: List[Product]) -> None:
+        await self._repository.add_products(products)
+        self._entries.clear()
+
+    async def delete_product(self, product_id: str) -> None:
+        await self._repository.delete_product(product_id)
+        self._entries.clear()
+
+    async def get_product_count(self) -> int:
+        return await self._repository.get_product_count()
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None
+    ) -> List[SearchResult]:
+        key = self._cache_key("search", query_embedding, top_k, filters)
+        cached = self._lookup(key)
+        if cached is not None:
+            return list(cached)
+
+        results = await self._repository.search(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filters=filters
+        )
+        self._store(key, results)
+        return results
+
+    async def search_hits(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[SearchHit]:
+        key = self._cache_key(self._hits_operation(include_embeddings), query_embedding, top_k, filters)
+        cached = self._lookup(key)
+        if cached is not None:
+            return list(cached)
+
+        hits = await self._repository.search_hits(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filters=filters,
+            include_embeddings=include_embeddings
+        )
+        self._store(key, hits)
+        return hits
+
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[SearchHit]]:
+        operation = self._hits_operation(include_embeddings)
+        keys = [
+            self._cache_key(operation, query_embedding, top_k, filters)
+            for query_embedding in query_embeddings
+        ]
+        results: List[Optional[List[SearchHit]]] = [self._lookup(key) for key in keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+
+        if missing:
+            fetched = await self._repository.search_many(
+                query_embeddings=[query_embeddings[i] for i in missing],
+                top_k=top_k,
+                filters=filters,
+                include_embeddings=include_embeddings
+            )
+            for i, hits in zip(missing, fetched):
+                self._store(keys[i], hits)
+                results[i] = hits
+
+        return [list(hits) for hits in results]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._repository, name)
+
+    @staticmethod
+    def _hits_operation(include_embeddings: bool) -> str:
+        return "search_hits+embeddings" if include_embeddings else "search_hits"
+
+    def _cache_key(
+        self,
+        operation: str,
+        query_embedding: List[float],
+        top_k: int,
+        filters: Optional[dict]
+    ) -> str:
+        quantized = np.round(
+            np.asarray(query_embedding, dtype=np.float32),
+            self._config.quantization_decimals
+        ) + 0.0
+        digest = hashlib.blake2b(quantized.tobytes(), digest_size=16)
+        normalized_filters = json.dumps(filters or {}, sort_keys=True, default=str)
+        digest.update(f"|{operation}|{top_k}|{normalized_filters}|{self.generation}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _lookup(self, key: str) -> Optional[List[Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        expires_at, results = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return results
+
+    def _store(self, key: str, results: List[Any]) -> None:
+        self._entries[key] = (time.monotonic() + self._config.ttl_seconds, list(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._config.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
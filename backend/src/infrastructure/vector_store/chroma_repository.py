@@ -1,17 +1,134 @@
-from typing import List, Optional
+import asyncio
+import hashlib
+import heapq
+from typing import Any, Dict, List, Optional, Set, Tuple
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from pydantic import BaseModel, Field
 from src.domain.models.product import Product
-from src.domain.models.search_result import SearchResult
+from src.domain.models.search_result import SearchHit, SearchResult
+from src.infrastructure.vector_store.columnar_index import (
+    ColumnarMetadataIndex,
+    UnsupportedFilterError
+)
+from src.infrastructure.vector_store.snapshot import (
+    SnapshotManifest,
+    VectorSnapshot,
+    write_snapshot
+)
+from src.infrastructure.tracing import traced
 
 class ChromaConfig(BaseModel):
     persist_directory: str = Field(default="./data/chroma")
+    persistent: bool = Field(default=False)
     collection_name: str = Field(default="products")
+    prefilter_exact_threshold: int = Field(default=256, ge=0)
+    compaction_interval_seconds: float = Field(default=30.0, gt=0.0)
+    compaction_min_tombstones: int = Field(default=64, ge=1)
+    chunk_candidates_per_result: int = Field(default=4, ge=1)
+
+
+class UpsertSummary(BaseModel):
+    inserted: int = 0
+    reembedded: int = 0
+    metadata_only: int = 0
+
+
+METADATA_DELTA_FIELDS = {"price", "stock_quantity", "rating"}
+
+QUERY_INCLUDE_WITH_EMBEDDINGS = ["metadatas", "documents", "distances", "embeddings"]
+
+
+def query_include(include_embeddings: bool) -> Dict[str, Any]:
+    return {"include": QUERY_INCLUDE_WITH_EMBEDDINGS} if include_embeddings else {}
+
+
+def content_hash(document: str) -> str:
+    return hashlib.blake2b(document.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def build_product_metadata(product: Product) -> Dict[str, Any]:
+    metadata = {
+        "name": product.name,
+        "category": product.category,
+        "price": product.price,
+        "brand": product.brand or "",
+        "features": ",".join(product.features) if product.features else "",
+        "stock_quantity": product.stock_quantity,
+        "content_hash": content_hash(product.description)
+    }
+    if product.rating is not None:
+        metadata["rating"] = product.rating
+    return metadata
+
+
+def parse_query_hits(results: Dict[str, Any], query_index: int = 0) -> List[SearchHit]:
+    if not results["ids"] or not results["ids"][query_index]:
+        return []
+
+    embeddings = results.get("embeddings")
+    embeddings = embeddings[query_index] if embeddings else None
+    return [
+        SearchHit(
+            product_id=doc_id,
+            score=max(0.0, min(1.0, 1.0 - results["distances"][query_index][i])),
+            document=results["documents"][query_index][i],
+            metadata=results["metadatas"][query_index][i],
+            embedding=embeddings[i] if embeddings is not None else None
+        )
+        for i, doc_id in enumerate(results["ids"][query_index])
+    ]
+
+
+def aggregate_chunk_hits(
+    hits: List[SearchHit],
+    top_k: int,
+    aggregation: str = "max"
+) -> List[SearchHit]:
+    best_chunks: Dict[str, SearchHit] = {}
+    scores: Dict[str, float] = {}
+    for hit in hits:
+        parent_id = hit.metadata.get("parent_id", hit.product_id)
+        if aggregation == "sum":
+            scores[parent_id] = scores.get(parent_id, 0.0) + hit.score
+        else:
+            scores[parent_id] = max(scores.get(parent_id, 0.0), hit.score)
+        if parent_id not in best_chunks or hit.score > best_chunks[parent_id].score:
+            best_chunks[parent_id] = hit
+
+    top = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+    return [
+        SearchHit(
+            product_id=parent_id,
+            score=min(1.0, score),
+            document=best_chunks[parent_id].document,
+            metadata=best_chunks[parent_id].metadata,
+            embedding=best_chunks[parent_id].embedding
+        )
+        for parent_id, score in top
+    ]
+
+
+def parse_query_results(results: Dict[str, Any], query_index: int = 0) -> List[SearchResult]:
+    return [hit.to_search_result() for hit in parse_query_hits(results, query_index)]
+
 
 class ChromaVectorRepository:
-    def __init__(self, config: ChromaConfig):
+    def __init__(
+        self,
+        config: ChromaConfig,
+        metadata_index: Optional[ColumnarMetadataIndex] = None
+    ):
+        self._config = config
+        self._metadata_index = metadata_index
+        self._generation = 0
+        self._content_hashes: Dict[str, str] = {}
+        self._tombstones: Set[str] = set()
+        self._compaction_task: Optional[asyncio.Task] = None
+        self._chunk_collection = None
         self._client = chromadb.Client(Settings(
+            is_persistent=config.persistent,
             persist_directory=config.persist_directory,
             anonymized_telemetry=False
         ))
@@ -19,74 +136,479 @@ class ChromaVectorRepository:
             name=config.collection_name,
             metadata={"hnsw:space": "cosine"}
         )
-    
+
     async def add_products(self, products: List[Product]) -> None:
         if not products:
             return
-        
+
         ids = [str(product.id) for product in products]
-        documents = [product.description for product in products]
-        metadatas = [
-            {
-                "name": product.name,
-                "category": product.category,
-                "price": product.price,
-                "brand": product.brand or "",
-                "features": ",".join(product.features) if product.features else ""
-            }
-            for product in products
-        ]
-        
-        self._collection.add(
+        metadatas = [build_product_metadata(product) for product in products]
+        revives_tombstones = any(product_id in self._tombstones for product_id in ids)
+        write = self._collection.upsert if revives_tombstones else self._collection.add
+        write(
             ids=ids,
-            documents=documents,
+            documents=[product.description for product in products],
             metadatas=metadatas
         )
-    
+        self._record_written(products, metadatas)
+
+    async def upsert_products(self, products: List[Product]) -> UpsertSummary:
+        summary = UpsertSummary()
+        if not products:
+            return summary
+
+        known_hashes = self._known_hashes([str(product.id) for product in products])
+        changed: List[Product] = []
+        unchanged: List[Product] = []
+        for product in products:
+            previous = known_hashes.get(str(product.id))
+            if previous is None:
+                summary.inserted += 1
+                changed.append(product)
+            elif previous != content_hash(product.description):
+                summary.reembedded += 1
+                changed.append(product)
+            else:
+                summary.metadata_only += 1
+                unchanged.append(product)
+
+        if changed:
+            metadatas = [build_product_metadata(product) for product in changed]
+            self._collection.upsert(
+                ids=[str(product.id) for product in changed],
+                documents=[product.description for product in changed],
+                metadatas=metadatas
+            )
+            self._record_written(changed, metadatas)
+
+        if unchanged:
+            metadatas = [build_product_metadata(product) for product in unchanged]
+            self._collection.update(
+                ids=[str(product.id) for product in unchanged],
+                metadatas=metadatas
+            )
+            self._record_written(unchanged, metadatas)
+
+        return summary
+
+    async def apply_deltas(self, deltas: Dict[str, Dict[str, Any]]) -> int:
+        ids: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for product_id, changes in deltas.items():
+            unknown_fields = set(changes) - METADATA_DELTA_FIELDS
+            if unknown_fields:
+                raise ValueError(f"Fields cannot be changed without re-embedding: {sorted(unknown_fields)}")
+            if product_id in self._tombstones:
+                continue
+
+            ids.append(product_id)
+            metadatas.append(dict(changes))
+
+        if not ids:
+            return 0
+
+        self._collection.update(ids=ids, metadatas=metadatas)
+        if self._chunk_collection is not None:
+            self._update_chunk_metadata(dict(zip(ids, metadatas)))
+        if self._metadata_index is not None:
+            for product_id, changes in zip(ids, metadatas):
+                self._metadata_index.update_fields(product_id, changes)
+        self._generation += 1
+        return len(ids)
+
+    async def apply_delta(self, product_id: str, changes: Dict[str, Any]) -> bool:
+        return await self.apply_deltas({product_id: changes}) == 1
+
+    async def add_chunks(
+        self,
+        products: List[Product],
+        chunk_texts: List[List[str]],
+        embeddings: List[List[float]]
+    ) -> int:
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict[str, Any]] = []
+        for product, texts in zip(products, chunk_texts):
+            product_metadata = build_product_metadata(product)
+            product_metadata["content_hash"] = content_hash("\n".join(texts))
+            for position, text in enumerate(texts):
+                ids.append(f"{product.id}#{position}")
+                documents.append(text)
+                metadatas.append({
+                    **product_metadata,
+                    "parent_id": str(product.id),
+                    "chunk_position": position
+                })
+
+        if not ids:
+            return 0
+
+        collection = self._chunks()
+        collection.delete(where={"parent_id": {"$in": [str(product.id) for product in products]}})
+        collection.add(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+        self._generation += 1
+        return len(ids)
+
+    async def get_chunk_hashes(self, product_ids: List[str]) -> Dict[str, str]:
+        if not product_ids:
+            return {}
+        records = self._chunks().get(
+            ids=[f"{product_id}#0" for product_id in product_ids],
+            include=["metadatas"]
+        )
+        return {
+            metadata["parent_id"]: metadata["content_hash"]
+            for metadata in records["metadatas"]
+            if metadata and metadata.get("content_hash")
+        }
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
     async def search(
-        self, 
-        query_embedding: List[float], 
+        self,
+        query_embedding: List[float],
         top_k: int = 5,
         filters: Optional[dict] = None
     ) -> List[SearchResult]:
+        hits = await self.search_hits(query_embedding, top_k, filters)
+        return [hit.to_search_result() for hit in hits]
+
+    async def search_hits(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[SearchHit]:
+        return (await self.search_many([query_embedding], top_k, filters, include_embeddings))[0]
+
+    @traced("vector_store.search")
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[SearchHit]]:
+        if not query_embeddings:
+            return []
+
+        query_count = len(query_embeddings)
+        candidate_ids = self._prefilter(filters)
+        if candidate_ids is not None:
+            if not candidate_ids:
+                return [[] for _ in range(query_count)]
+            if len(candidate_ids) <= self._config.prefilter_exact_threshold:
+                results = self._exact_search(candidate_ids, query_embeddings, top_k, include_embeddings)
+                return [parse_query_hits(results, i) for i in range(query_count)]
+
         results = self._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=top_k + len(self._tombstones),
+            where=filters,
+            **query_include(include_embeddings)
+        )
+
+        per_query = [parse_query_hits(results, i) for i in range(query_count)]
+        if self._tombstones:
+            per_query = [
+                [hit for hit in hits if hit.product_id not in self._tombstones]
+                for hits in per_query
+            ]
+        return [hits[:top_k] for hits in per_query]
+
+    @traced("vector_store.search_chunks")
+    async def search_chunk_hits(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        aggregation: str = "max",
+        include_embeddings: bool = False
+    ) -> List[SearchHit]:
+        candidate_ids = self._prefilter(filters)
+        if candidate_ids is not None and not candidate_ids:
+            return []
+
+        collection = self._chunks()
+        results = collection.query(
             query_embeddings=[query_embedding],
-            n_results=top_k,
-            where=filters
+            n_results=(top_k + len(self._tombstones)) * self._config.chunk_candidates_per_result,
+            where=filters,
+            **query_include(include_embeddings)
         )
-        
-        search_results = []
-        if results["ids"] and results["ids"][0]:
-            for i, doc_id in enumerate(results["ids"][0]):
-                metadata = results["metadatas"][0][i]
-                distance = results["distances"][0][i]
-                score = 1.0 - distance
-                
-                features_str = metadata.get("features", "")
-                features = features_str.split(",") if features_str else []
-                
-                product = Product(
-                    id=doc_id,
-                    name=metadata["name"],
-                    description=results["documents"][0][i],
-                    category=metadata["category"],
-                    price=metadata["price"],
-                    brand=metadata.get("brand") or None,
-                    features=features if features else None
-                )
-                
-                search_result = SearchResult(
-                    product=product,
-                    score=max(0.0, min(1.0, score)),
-                    chunk_text=results["documents"][0][i],
-                    metadata=metadata
-                )
-                search_results.append(search_result)
-        
-        return search_results
-    
+
+        hits = parse_query_hits(results)
+        if self._tombstones:
+            hits = [hit for hit in hits if hit.metadata.get("parent_id") not in self._tombstones]
+        return aggregate_chunk_hits(hits, top_k, aggregation)
+
     async def delete_product(self, product_id: str) -> None:
-        self._collection.delete(ids=[product_id])
-    
+        if product_id in self._tombstones or not self._is_stored(product_id):
+            return
+        self._tombstones.add(product_id)
+        if self._metadata_index is not None:
+            self._metadata_index.remove(product_id)
+        self._generation += 1
+
     async def get_product_count(self) -> int:
-        return self._collection.count()
\ No newline at end of file
+        return self._collection.count() - len(self._tombstones)
+
+    def index_metadata(self, products: List[Product]) -> None:
+        if self._metadata_index is not None:
+            self._metadata_index.upsert(products)
+
+    async def get_products(self, product_ids: List[str]) -> List[Product]:
+        live_ids = [product_id for product_id in product_ids if product_id not in self._tombstones]
+        if not live_ids:
+            return []
+
+        records = self._collection.get(ids=live_ids, include=["metadatas", "documents"])
+        by_id = {
+            product_id: SearchHit(product_id, 1.0, document, metadata)
+            for product_id, document, metadata in zip(
+                records["ids"], records["documents"], records["metadatas"]
+            )
+        }
+        return [by_id[product_id].to_product() for product_id in live_ids if product_id in by_id]
+
+    async def list_products(self, batch_size: int = 1024) -> List[Product]:
+        products: List[Product] = []
+        offset = 0
+        while True:
+            records = self._collection.get(include=["metadatas", "documents"], limit=batch_size, offset=offset)
+            if not records["ids"]:
+                return products
+            products.extend(
+                SearchHit(product_id, 1.0, document, metadata).to_product()
+                for product_id, document, metadata in zip(
+                    records["ids"], records["documents"], records["metadatas"]
+                )
+                if product_id not in self._tombstones
+            )
+            offset += len(records["ids"])
+
+    async def get_embeddings(
+        self,
+        product_ids: Optional[List[str]] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        records = self._collection.get(ids=product_ids, include=["embeddings"])
+        rows = [
+            (product_id, embedding)
+            for product_id, embedding in zip(records["ids"], records["embeddings"] or [])
+            if product_id not in self._tombstones
+        ]
+        if not rows:
+            return [], np.zeros((0, 0), dtype=np.float32)
+
+        ids, embeddings = zip(*rows)
+        return list(ids), np.asarray(embeddings, dtype=np.float32)
+
+    async def export_snapshot(self, directory: str) -> SnapshotManifest:
+        records = self._collection.get(include=["embeddings", "documents", "metadatas"])
+        rows = [
+            i for i, product_id in enumerate(records["ids"])
+            if product_id not in self._tombstones
+        ]
+        vectors = (
+            np.asarray([records["embeddings"][i] for i in rows], dtype=np.float32)
+            if rows else np.zeros((0, 0), dtype=np.float32)
+        )
+        snapshot = VectorSnapshot(
+            manifest=SnapshotManifest(
+                collection_name=self._config.collection_name,
+                generation=self._generation,
+                count=len(rows),
+                dimension=vectors.shape[1]
+            ),
+            ids=[records["ids"][i] for i in rows],
+            documents=[records["documents"][i] for i in rows],
+            metadatas=[records["metadatas"][i] for i in rows],
+            vectors=vectors
+        )
+        return await asyncio.to_thread(write_snapshot, directory, snapshot)
+
+    async def import_snapshot(self, snapshot: VectorSnapshot, batch_size: int = 1024) -> int:
+        for start in range(0, len(snapshot), batch_size):
+            rows = range(start, min(start + batch_size, len(snapshot)))
+            stored = self._collection.get(ids=list(snapshot.ids[start:rows.stop]), include=["metadatas"])
+            stored_metadata = dict(zip(stored["ids"], stored["metadatas"]))
+            stale, drifted = [], []
+            for row in rows:
+                current = stored_metadata.get(snapshot.ids[row])
+                expected = snapshot.metadatas[row]
+                content_hash = expected.get("content_hash")
+                if current is None or not content_hash or current.get("content_hash") != content_hash:
+                    stale.append(row)
+                elif current != expected:
+                    drifted.append(row)
+
+            if stale:
+                self._collection.upsert(
+                    ids=[snapshot.ids[row] for row in stale],
+                    embeddings=np.asarray(snapshot.vectors[stale], dtype=np.float32).tolist(),
+                    documents=[snapshot.documents[row] for row in stale],
+                    metadatas=[snapshot.metadatas[row] for row in stale]
+                )
+            if drifted:
+                self._collection.update(
+                    ids=[snapshot.ids[row] for row in drifted],
+                    metadatas=[snapshot.metadatas[row] for row in drifted]
+                )
+
+        for product_id, metadata in zip(snapshot.ids, snapshot.metadatas):
+            if metadata.get("content_hash"):
+                self._content_hashes[product_id] = metadata["content_hash"]
+        self._tombstones.difference_update(snapshot.ids)
+        if self._metadata_index is not None:
+            self._metadata_index.upsert([
+                SearchHit(product_id, 1.0, document, metadata).to_product()
+                for product_id, document, metadata in zip(
+                    snapshot.ids, snapshot.documents, snapshot.metadatas
+                )
+            ])
+        self._generation = max(self._generation + 1, snapshot.manifest.generation)
+        return len(snapshot)
+
+    @property
+    def tombstone_count(self) -> int:
+        return len(self._tombstones)
+
+    async def compact(self) -> int:
+        if not self._tombstones:
+            return 0
+
+        tombstones = list(self._tombstones)
+        self._collection.delete(ids=tombstones)
+        if self._chunk_collection is not None:
+            self._chunk_collection.delete(where={"parent_id": {"$in": tombstones}})
+        self._tombstones.difference_update(tombstones)
+        for product_id in tombstones:
+            self._content_hashes.pop(product_id, None)
+        return len(tombstones)
+
+    def start_background_compaction(self) -> None:
+        if self._compaction_task is None or self._compaction_task.done():
+            self._compaction_task = asyncio.create_task(self._compaction_loop())
+
+    async def stop_background_compaction(self) -> None:
+        if self._compaction_task is None:
+            return
+        self._compaction_task.cancel()
+        try:
+            await self._compaction_task
+        except asyncio.CancelledError:
+            pass
+        self._compaction_task = None
+
+    async def _compaction_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._config.compaction_interval_seconds)
+            if len(self._tombstones) >= self._config.compaction_min_tombstones:
+                await self.compact()
+
+    async def count_products(self, filters: Optional[dict] = None) -> int:
+        if self._metadata_index is None:
+            return len(self._collection.get(where=filters, include=[])["ids"])
+        return self._metadata_index.count(filters)
+
+    async def get_facets(self, field: str, filters: Optional[dict] = None) -> Dict[str, int]:
+        if self._metadata_index is None:
+            raise UnsupportedFilterError("Facets require a columnar metadata index")
+        return self._metadata_index.facets(field, filters)
+
+    def _record_written(self, products: List[Product], metadatas: List[Dict[str, Any]]) -> None:
+        for product, metadata in zip(products, metadatas):
+            product_id = str(product.id)
+            self._content_hashes[product_id] = metadata["content_hash"]
+            self._tombstones.discard(product_id)
+        if self._metadata_index is not None:
+            self._metadata_index.upsert(products)
+        self._generation += 1
+
+    def _chunks(self):
+        if self._chunk_collection is None:
+            self._chunk_collection = self._client.get_or_create_collection(
+                name=f"{self._config.collection_name}_chunks",
+                metadata={"hnsw:space": "cosine"}
+            )
+        return self._chunk_collection
+
+    def _update_chunk_metadata(self, changes_by_parent: Dict[str, Dict[str, Any]]) -> None:
+        records = self._chunk_collection.get(
+            where={"parent_id": {"$in": list(changes_by_parent)}},
+            include=["metadatas"]
+        )
+        if not records["ids"]:
+            return
+        self._chunk_collection.update(
+            ids=records["ids"],
+            metadatas=[changes_by_parent[metadata["parent_id"]] for metadata in records["metadatas"]]
+        )
+
+    def _is_stored(self, product_id: str) -> bool:
+        if product_id in self._content_hashes:
+            return True
+        return bool(self._collection.get(ids=[product_id], include=[])["ids"])
+
+    def _known_hashes(self, product_ids: List[str]) -> Dict[str, str]:
+        known = {
+            product_id: self._content_hashes[product_id]
+            for product_id in product_ids if product_id in self._content_hashes
+        }
+        missing = [product_id for product_id in product_ids if product_id not in known]
+        if missing:
+            records = self._collection.get(ids=missing, include=["metadatas"])
+            for product_id, metadata in zip(records["ids"], records["metadatas"]):
+                if metadata and metadata.get("content_hash"):
+                    known[product_id] = metadata["content_hash"]
+        return known
+
+    def _prefilter(self, filters: Optional[dict]) -> Optional[List[str]]:
+        if self._metadata_index is None or not filters:
+            return None
+        try:
+            return self._metadata_index.filter_ids(filters)
+        except UnsupportedFilterError:
+            return None
+
+    def _exact_search(
+        self,
+        candidate_ids: List[str],
+        query_embeddings: List[List[float]],
+        top_k: int,
+        include_embeddings: bool = False
+    ) -> Dict[str, Any]:
+        records = self._collection.get(
+            ids=candidate_ids,
+            include=["embeddings", "metadatas", "documents"]
+        )
+        if not records["ids"]:
+            empty = [[] for _ in query_embeddings]
+            return {"ids": empty, "documents": empty, "metadatas": empty, "distances": empty}
+
+        matrix = np.asarray(records["embeddings"], dtype=np.float32)
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.outer(np.linalg.norm(queries, axis=1), np.linalg.norm(matrix, axis=1))
+        similarities = queries @ matrix.T / np.where(norms == 0.0, 1.0, norms)
+
+        k = min(top_k, similarities.shape[1])
+        best = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        best = np.take_along_axis(
+            best, np.argsort(-np.take_along_axis(similarities, best, axis=1), axis=1), axis=1
+        )
+
+        results = {
+            "ids": [[records["ids"][i] for i in row] for row in best],
+            "documents": [[records["documents"][i] for i in row] for row in best],
+            "metadatas": [[records["metadatas"][i] for i in row] for row in best],
+            "distances": [
+                [float(1.0 - similarities[query, i]) for i in row]
+                for query, row in enumerate(best)
+            ]
+        }
+        if include_embeddings:
+            results["embeddings"] = [[matrix[i] for i in row] for row in best]
+        return results
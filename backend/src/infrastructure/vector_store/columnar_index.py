@@ -0,0 +1,188 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from src.domain.models.product import Product
+
+
+class UnsupportedFilterError(ValueError):
+    pass
+
+
+class ColumnarMetadataIndex:
+    NUMERIC_FIELDS = ("price", "rating", "stock_quantity")
+    CATEGORICAL_FIELDS = ("category", "brand")
+
+    def __init__(self, initial_capacity: int = 1024):
+        capacity = max(initial_capacity, 1)
+        self._numeric: Dict[str, np.ndarray] = {
+            "price": np.zeros(capacity, dtype=np.float64),
+            "rating": np.full(capacity, np.nan, dtype=np.float32),
+            "stock_quantity": np.zeros(capacity, dtype=np.int32),
+        }
+        self._codes: Dict[str, np.ndarray] = {
+            field: np.full(capacity, -1, dtype=np.int32) for field in self.CATEGORICAL_FIELDS
+        }
+        self._dictionaries: Dict[str, Dict[str, int]] = {field: {} for field in self.CATEGORICAL_FIELDS}
+        self._values: Dict[str, List[str]] = {field: [] for field in self.CATEGORICAL_FIELDS}
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._rows
+
+    def upsert(self, products: List[Product]) -> None:
+        for product in products:
+            row = self._allocate_row(str(product.id))
+            self._numeric["price"][row] = product.price
+            self._numeric["rating"][row] = np.nan if product.rating is None else product.rating
+            self._numeric["stock_quantity"][row] = product.stock_quantity
+            self._codes["category"][row] = self._encode("category", product.category)
+            self._codes["brand"][row] = self._encode("brand", product.brand)
+
+    def update_fields(self, product_id: str, changes: Dict[str, Any]) -> bool:
+        row = self._rows.get(product_id)
+        if row is None:
+            return False
+
+        for field, value in changes.items():
+            if field == "rating":
+                self._numeric[field][row] = np.nan if value is None else value
+            elif field in self.NUMERIC_FIELDS:
+                self._numeric[field][row] = value
+            elif field in self.CATEGORICAL_FIELDS:
+                self._codes[field][row] = self._encode(field, value)
+        return True
+
+    def remove(self, product_id: str) -> bool:
+        row = self._rows.pop(product_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._ids[row] = None
+        self._free_rows.append(row)
+        return True
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        size = len(self._ids)
+        alive = self._alive[:size]
+        if not filters:
+            return alive.copy()
+        return alive & self._evaluate(filters, size)
+
+    def filter_ids(self, filters: Optional[Dict[str, Any]]) -> List[str]:
+        rows = np.flatnonzero(self.filter_mask(filters))
+        return [self._ids[row] for row in rows]
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        return int(np.count_nonzero(self.filter_mask(filters)))
+
+    def facets(self, field: str, filters: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        if field not in self.CATEGORICAL_FIELDS:
+            raise UnsupportedFilterError(f"Facets are only available for {self.CATEGORICAL_FIELDS}")
+
+        codes = self._codes[field][:len(self._ids)][self.filter_mask(filters)]
+        codes = codes[codes >= 0]
+        if codes.size == 0:
+            return {}
+
+        counts = np.bincount(codes, minlength=len(self._values[field]))
+        return {
+            self._values[field][code]: int(total)
+            for code, total in enumerate(counts) if total
+        }
+
+    def _evaluate(self, filters: Dict[str, Any], size: int) -> np.ndarray:
+        mask = np.ones(size, dtype=bool)
+        for key, condition in filters.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._evaluate(clause, size)
+            elif key == "$or":
+                combined = np.zeros(size, dtype=bool)
+                for clause in condition:
+                    combined |= self._evaluate(clause, size)
+                mask &= combined
+            else:
+                mask &= self._evaluate_field(key, condition, size)
+        return mask
+
+    def _evaluate_field(self, field: str, condition: Any, size: int) -> np.ndarray:
+        operators = condition if isinstance(condition, dict) else {"$eq": condition}
+
+        if field in self.CATEGORICAL_FIELDS:
+            column = self._codes[field][:size]
+            encode = lambda value: self._dictionaries[field].get(value, -2)
+        elif field in self.NUMERIC_FIELDS:
+            column = self._numeric[field][:size]
+            encode = lambda value: value
+        else:
+            raise UnsupportedFilterError(f"Field '{field}' is not indexed")
+
+        mask = np.ones(size, dtype=bool)
+        for operator, value in operators.items():
+            if operator == "$eq":
+                mask &= column == encode(value)
+            elif operator == "$ne":
+                mask &= column != encode(value)
+            elif operator == "$in":
+                mask &= np.isin(column, [encode(item) for item in value])
+            elif operator == "$nin":
+                mask &= ~np.isin(column, [encode(item) for item in value])
+            elif field in self.CATEGORICAL_FIELDS:
+                raise UnsupportedFilterError(f"Operator '{operator}' is not supported for '{field}'")
+            elif operator == "$gt":
+                mask &= column > value
+            elif operator == "$gte":
+                mask &= column >= value
+            elif operator == "$lt":
+                mask &= column < value
+            elif operator == "$lte":
+                mask &= column <= value
+            else:
+                raise UnsupportedFilterError(f"Operator '{operator}' is not supported")
+        return mask
+
+    def _encode(self, field: str, value: Optional[str]) -> int:
+        if not value:
+            return -1
+        dictionary = self._dictionaries[field]
+        if value not in dictionary:
+            dictionary[value] = len(self._values[field])
+            self._values[field].append(value)
+        return dictionary[value]
+
+    def _allocate_row(self, product_id: str) -> int:
+        if product_id in self._rows:
+            return self._rows[product_id]
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = product_id
+        else:
+            row = len(self._ids)
+            if row >= self._alive.shape[0]:
+                self._grow()
+            self._ids.append(product_id)
+
+        self._rows[product_id] = row
+        self._alive[row] = True
+        return row
+
+    def _grow(self) -> None:
+        capacity = self._alive.shape[0] * 2
+        for field, column in self._numeric.items():
+            fill = np.nan if field == "rating" else 0
+            grown = np.full(capacity, fill, dtype=column.dtype)
+            grown[:column.shape[0]] = column
+            self._numeric[field] = grown
+        for field, column in self._codes.items():
+            grown = np.full(capacity, -1, dtype=np.int32)
+            grown[:column.shape[0]] = column
+            self._codes[field] = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._alive.shape[0]] = self._alive
+        self._alive = alive
@@ -0,0 +1,130 @@
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from pydantic import BaseModel, Field
+
+
+class NeighborGraphConfig(BaseModel):
+    k: int = Field(default=10, ge=1, le=100)
+    block_size: int = Field(default=512, ge=1)
+
+
+class NeighborGraph:
+    def __init__(self, config: NeighborGraphConfig):
+        self._config = config
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        self._neighbors: Dict[str, List[Tuple[str, float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._rows
+
+    def neighbors(self, product_id: str, limit: int) -> List[Tuple[str, float]]:
+        return self._neighbors.get(product_id, [])[:limit]
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        self._ids = list(ids)
+        self._rows = {product_id: row for row, product_id in enumerate(self._ids)}
+        self._vectors = self._normalize(vectors)
+        self._neighbors = {}
+
+        for start in range(0, len(self._ids), self._config.block_size):
+            rows = np.arange(start, min(start + self._config.block_size, len(self._ids)))
+            similarities = self._vectors[rows] @ self._vectors.T
+            similarities[np.arange(rows.size), rows] = -np.inf
+            self._store_top_k(rows, similarities)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        if not len(ids):
+            return
+
+        for product_id in ids:
+            if product_id in self._rows:
+                self.remove(product_id)
+        if not self._ids:
+            self.build(ids, vectors)
+            return
+
+        new_vectors = self._normalize(vectors)
+        existing_count = len(self._ids)
+        self._ids.extend(ids)
+        self._rows.update({product_id: existing_count + i for i, product_id in enumerate(ids)})
+        self._vectors = np.vstack([self._vectors, new_vectors])
+
+        new_rows = np.arange(existing_count, len(self._ids))
+        for start in range(0, new_rows.size, self._config.block_size):
+            rows = new_rows[start:start + self._config.block_size]
+            similarities = self._vectors[rows] @ self._vectors.T
+            similarities[np.arange(rows.size), rows] = -np.inf
+            self._store_top_k(rows, similarities)
+
+        self._merge_into_existing(existing_count, new_rows)
+
+    def remove(self, product_id: str) -> bool:
+        row = self._rows.pop(product_id, None)
+        if row is None:
+            return False
+
+        self._ids.pop(row)
+        self._vectors = np.delete(self._vectors, row, axis=0)
+        self._rows = {other_id: index for index, other_id in enumerate(self._ids)}
+        self._neighbors.pop(product_id, None)
+        affected = np.array([
+            self._rows[other_id] for other_id, neighbors in self._neighbors.items()
+            if any(neighbor_id == product_id for neighbor_id, _ in neighbors)
+        ], dtype=np.int64)
+        for start in range(0, affected.size, self._config.block_size):
+            rows = affected[start:start + self._config.block_size]
+            similarities = self._vectors[rows] @ self._vectors.T
+            similarities[np.arange(rows.size), rows] = -np.inf
+            self._store_top_k(rows, similarities)
+        return True
+
+    def _store_top_k(self, rows: np.ndarray, similarities: np.ndarray) -> None:
+        k = min(self._config.k, similarities.shape[1] - 1)
+        if k <= 0:
+            for row in rows:
+                self._neighbors[self._ids[row]] = []
+            return
+
+        candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        candidate_scores = np.take_along_axis(similarities, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        for row, neighbor_rows, scores in zip(rows, candidates, candidate_scores):
+            self._neighbors[self._ids[row]] = [
+                (self._ids[neighbor_row], float(score))
+                for neighbor_row, score in zip(neighbor_rows, scores)
+            ]
+
+    def _merge_into_existing(self, existing_count: int, new_rows: np.ndarray) -> None:
+        k = self._config.k
+        for start in range(0, existing_count, self._config.block_size):
+            rows = np.arange(start, min(start + self._config.block_size, existing_count))
+            similarities = self._vectors[rows] @ self._vectors[new_rows].T
+
+            for row, row_scores in zip(rows, similarities):
+                product_id = self._ids[row]
+                current = self._neighbors.get(product_id, [])
+                floor = current[-1][1] if len(current) >= k else -np.inf
+                improving = np.flatnonzero(row_scores > floor)
+                if improving.size == 0:
+                    continue
+
+                merged = current + [
+                    (self._ids[new_rows[column]], float(row_scores[column]))
+                    for column in improving
+                ]
+                merged.sort(key=lambda item: item[1], reverse=True)
+                self._neighbors[product_id] = merged[:k]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0.0, 1.0, norms)
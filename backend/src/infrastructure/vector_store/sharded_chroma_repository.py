@@ -0,0 +1,282 @@
+import asyncio
+import hashlib
+import heapq
+import re
+from typing import Any, Dict, List, Optional
+import chromadb
+from chromadb.config import Settings
+from pydantic import BaseModel, Field
+from src.domain.models.product import Product
+from src.domain.models.search_result import SearchHit, SearchResult
+from src.infrastructure.vector_store.chroma_repository import (
+    METADATA_DELTA_FIELDS,
+    build_product_metadata,
+    parse_query_hits,
+    query_include
+)
+
+
+class ShardedChromaConfig(BaseModel):
+    persist_directory: str = Field(default="./data/chroma")
+    persistent: bool = Field(default=False)
+    collection_prefix: str = Field(default="products")
+    hash_buckets: int = Field(default=0, ge=0, le=256)
+
+
+class ShardedChromaVectorRepository:
+    def __init__(self, config: ShardedChromaConfig):
+        self._config = config
+        self._client = chromadb.Client(Settings(
+            is_persistent=config.persistent,
+            persist_directory=config.persist_directory,
+            anonymized_telemetry=False
+        ))
+        self._shards: Dict[str, Any] = {}
+        self._shard_locks: Dict[str, asyncio.Lock] = {}
+        self._product_shards: Dict[str, str] = {}
+        self._rebuild_counts: Dict[str, int] = {}
+        self._generation = 0
+        self._discover_shards()
+
+    def shard_key_for_category(self, category: str) -> str:
+        normalized = category.strip().lower()
+        if self._config.hash_buckets:
+            digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+            return f"bucket_{int.from_bytes(digest, 'big') % self._config.hash_buckets}"
+        return re.sub(r"[^a-z0-9]+", "_", normalized).strip("_")[:40] or "uncategorized"
+
+    @property
+    def shard_keys(self) -> List[str]:
+        return list(self._shards.keys())
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def add_products(self, products: List[Product]) -> None:
+        if not products:
+            return
+
+        for shard_key, shard_products in self._group_by_shard(products).items():
+            async with self._lock_for(shard_key):
+                self._add_to_collection(self._get_or_create_shard(shard_key), shard_products)
+                for product in shard_products:
+                    self._product_shards[str(product.id)] = shard_key
+        self._generation += 1
+
+    async def upsert_products(self, products: List[Product]) -> None:
+        if not products:
+            return
+
+        for product in products:
+            product_id = str(product.id)
+            previous = self._product_shards.get(product_id)
+            if previous is not None and previous != self.shard_key_for_category(product.category):
+                await self.delete_product(product_id)
+
+        for shard_key, shard_products in self._group_by_shard(products).items():
+            async with self._lock_for(shard_key):
+                self._get_or_create_shard(shard_key).upsert(
+                    ids=[str(product.id) for product in shard_products],
+                    documents=[product.description for product in shard_products],
+                    metadatas=[build_product_metadata(product) for product in shard_products]
+                )
+                for product in shard_products:
+                    self._product_shards[str(product.id)] = shard_key
+        self._generation += 1
+
+    async def apply_deltas(self, deltas: Dict[str, Dict[str, Any]]) -> int:
+        for changes in deltas.values():
+            unknown_fields = set(changes) - METADATA_DELTA_FIELDS
+            if unknown_fields:
+                raise ValueError(f"Fields cannot be changed without re-embedding: {sorted(unknown_fields)}")
+
+        updated = 0
+        for product_id, changes in deltas.items():
+            shard_key = self._product_shards.get(product_id)
+            for key in [shard_key] if shard_key in self._shards else list(self._shards):
+                async with self._lock_for(key):
+                    collection = self._shards[key]
+                    if not collection.get(ids=[product_id], include=[])["ids"]:
+                        continue
+                    collection.update(ids=[product_id], metadatas=[dict(changes)])
+                self._product_shards[product_id] = key
+                updated += 1
+                break
+
+        if updated:
+            self._generation += 1
+        return updated
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None
+    ) -> List[SearchResult]:
+        hits = await self.search_hits(query_embedding, top_k, filters)
+        return [hit.to_search_result() for hit in hits]
+
+    async def search_hits(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[SearchHit]:
+        return (await self.search_many([query_embedding], top_k, filters, include_embeddings))[0]
+
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[dict] = None,
+        include_embeddings: bool = False
+    ) -> List[List[SearchHit]]:
+        if not query_embeddings:
+            return []
+
+        category = self._category_from_filters(filters)
+        if category is not None:
+            shard_key = self.shard_key_for_category(category)
+            if shard_key not in self._shards:
+                return [[] for _ in query_embeddings]
+            return await self._search_shard(shard_key, query_embeddings, top_k, filters, include_embeddings)
+
+        shard_results = await asyncio.gather(*[
+            self._search_shard(shard_key, query_embeddings, top_k, filters, include_embeddings)
+            for shard_key in list(self._shards)
+        ])
+
+        return [
+            heapq.nlargest(
+                top_k,
+                (hit for per_query in shard_results for hit in per_query[query_index]),
+                key=lambda hit: hit.score
+            )
+            for query_index in range(len(query_embeddings))
+        ]
+
+    async def rebuild_shard(self, shard_key: str, products: List[Product]) -> None:
+        async with self._lock_for(shard_key):
+            generation = self._rebuild_counts.get(shard_key, 0) + 1
+            staging = self._client.get_or_create_collection(
+                name=self._collection_name(shard_key, generation),
+                metadata=self._shard_metadata(shard_key, generation)
+            )
+            self._add_to_collection(staging, products)
+
+            previous = self._shards.get(shard_key)
+            self._shards[shard_key] = staging
+            self._rebuild_counts[shard_key] = generation
+            self._product_shards = {
+                product_id: key for product_id, key in self._product_shards.items()
+                if key != shard_key
+            }
+            for product in products:
+                self._product_shards[str(product.id)] = shard_key
+
+            if previous is not None:
+                self._client.delete_collection(name=previous.name)
+            self._generation += 1
+
+    async def delete_product(self, product_id: str) -> None:
+        shard_key = self._product_shards.pop(product_id, None)
+        targets = [shard_key] if shard_key in self._shards else list(self._shards)
+
+        for key in targets:
+            async with self._lock_for(key):
+                self._shards[key].delete(ids=[product_id])
+        self._generation += 1
+
+    async def get_product_count(self) -> int:
+        return sum(shard.count() for shard in self._shards.values())
+
+    async def _search_shard(
+        self,
+        shard_key: str,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        filters: Optional[dict],
+        include_embeddings: bool = False
+    ) -> List[List[SearchHit]]:
+        collection = self._shards[shard_key]
+        if collection.count() == 0:
+            return [[] for _ in query_embeddings]
+
+        results = await asyncio.to_thread(
+            collection.query,
+            query_embeddings=query_embeddings,
+            n_results=top_k,
+            where=filters,
+            **query_include(include_embeddings)
+        )
+        return [parse_query_hits(results, i) for i in range(len(query_embeddings))]
+
+    def _get_or_create_shard(self, shard_key: str) -> Any:
+        if shard_key not in self._shards:
+            self._shards[shard_key] = self._client.get_or_create_collection(
+                name=self._collection_name(shard_key, 0),
+                metadata=self._shard_metadata(shard_key, 0)
+            )
+        return self._shards[shard_key]
+
+    def _discover_shards(self) -> None:
+        for collection in self._client.list_collections():
+            metadata = collection.metadata or {}
+            shard_key = metadata.get("shard_key")
+            if not shard_key or metadata.get("collection_prefix") != self._config.collection_prefix:
+                continue
+            generation = int(metadata.get("shard_generation", 0))
+            if shard_key in self._shards and generation <= self._rebuild_counts.get(shard_key, 0):
+                continue
+            self._shards[shard_key] = collection
+            self._rebuild_counts[shard_key] = generation
+
+    def _shard_metadata(self, shard_key: str, generation: int) -> Dict[str, Any]:
+        return {
+            "hnsw:space": "cosine",
+            "collection_prefix": self._config.collection_prefix,
+            "shard_key": shard_key,
+            "shard_generation": generation
+        }
+
+    def _group_by_shard(self, products: List[Product]) -> Dict[str, List[Product]]:
+        by_shard: Dict[str, List[Product]] = {}
+        for product in products:
+            by_shard.setdefault(self.shard_key_for_category(product.category), []).append(product)
+        return by_shard
+
+    def _lock_for(self, shard_key: str) -> asyncio.Lock:
+        if shard_key not in self._shard_locks:
+            self._shard_locks[shard_key] = asyncio.Lock()
+        return self._shard_locks[shard_key]
+
+    def _collection_name(self, shard_key: str, generation: int) -> str:
+        name = f"{self._config.collection_prefix}_{shard_key}"
+        return f"{name}_r{generation}" if generation else name
+
+    @staticmethod
+    def _add_to_collection(collection: Any, products: List[Product]) -> None:
+        if not products:
+            return
+        collection.add(
+            ids=[str(product.id) for product in products],
+            documents=[product.description for product in products],
+            metadatas=[build_product_metadata(product) for product in products]
+        )
+
+    @classmethod
+    def _category_from_filters(cls, filters: Optional[dict]) -> Optional[str]:
+        if not filters:
+            return None
+        category = filters.get("category")
+        if isinstance(category, dict):
+            category = category.get("$eq")
+        if isinstance(category, str):
+            return category
+        for clause in filters.get("$and", []):
+            category = cls._category_from_filters(clause)
+            if category is not None:
+                return category
+        return None
@@ -0,0 +1,109 @@
+import json
+import mmap
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pydantic import BaseModel, Field
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+RECORDS_FILE = "records.json"
+VECTORS_FILE = "vectors.npy"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class SnapshotManifest(BaseModel):
+    format_version: int = Field(default=SNAPSHOT_FORMAT_VERSION)
+    collection_name: str
+    generation: int = Field(ge=0)
+    count: int = Field(ge=0)
+    dimension: int = Field(ge=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class VectorSnapshot:
+    def __init__(
+        self,
+        manifest: SnapshotManifest,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: np.ndarray
+    ):
+        self.manifest = manifest
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def write_snapshot(directory: str, snapshot: VectorSnapshot) -> SnapshotManifest:
+    target = Path(directory)
+    version = target.with_name(f"{target.name}.v{datetime.utcnow():%Y%m%d%H%M%S%f}")
+    version.mkdir(parents=True)
+
+    np.save(version / VECTORS_FILE, np.ascontiguousarray(snapshot.vectors, dtype=np.float32))
+    with open(version / RECORDS_FILE, "w", encoding="utf-8") as records_file:
+        json.dump(
+            {"ids": snapshot.ids, "documents": snapshot.documents, "metadatas": snapshot.metadatas},
+            records_file
+        )
+    with open(version / MANIFEST_FILE, "w", encoding="utf-8") as manifest_file:
+        manifest_file.write(snapshot.manifest.model_dump_json())
+
+    pointer = target.with_name(f"{target.name}.tmp")
+    if pointer.is_symlink() or pointer.is_file():
+        pointer.unlink()
+    os.symlink(version.name, pointer, target_is_directory=True)
+    if target.is_dir() and not target.is_symlink():
+        shutil.rmtree(target)
+    os.replace(pointer, target)
+
+    for stale in target.parent.glob(f"{target.name}.v*"):
+        if stale != version:
+            shutil.rmtree(stale, ignore_errors=True)
+    return snapshot.manifest
+
+
+def read_snapshot(directory: str, mmap_vectors: bool = True) -> VectorSnapshot:
+    source = Path(directory)
+    try:
+        manifest = SnapshotManifest.model_validate_json((source / MANIFEST_FILE).read_text(encoding="utf-8"))
+        with open(source / RECORDS_FILE, encoding="utf-8") as records_file:
+            records = json.load(records_file)
+        vectors = np.load(source / VECTORS_FILE, mmap_mode="r" if mmap_vectors else None)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Failed to read snapshot from {directory}: {str(e)}")
+
+    if manifest.format_version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version: {manifest.format_version}")
+    if vectors.shape[0] != manifest.count or len(records["ids"]) != manifest.count:
+        raise SnapshotError("Snapshot files do not match the manifest count")
+
+    return VectorSnapshot(
+        manifest=manifest,
+        ids=records["ids"],
+        documents=records["documents"],
+        metadatas=records["metadatas"],
+        vectors=vectors
+    )
+
+
+def warm_snapshot(snapshot: VectorSnapshot, page_size: Optional[int] = None) -> int:
+    flat = snapshot.vectors.reshape(-1)
+    if flat.size == 0:
+        return 0
+
+    stride = max((page_size or mmap.PAGESIZE) // flat.itemsize, 1)
+    touched = flat[::stride]
+    float(np.add.reduce(touched, dtype=np.float64))
+    return int(touched.size)
@@ -1,15 +1,23 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from src.infrastructure.config.settings import Settings
-from src.api.dependencies import get_settings
-from src.api.routes import health_router, chat_router, product_router, intent_router
+from src.api.dependencies import (
+    configure_tracing,
+    get_product_ingestion_service,
+    get_settings,
+    get_vector_repository,
+)
+from src.api.routes import health_router, chat_router, product_router, intent_router, debug_router
 from src.api.middleware import (
     http_exception_handler,
     validation_exception_handler,
     general_exception_handler,
+    request_id_middleware,
 )
+from src.infrastructure.vector_store.snapshot import read_snapshot, warm_snapshot
 
 
 settings = get_settings()
@@ -30,6 +38,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.middleware("http")(request_id_middleware)
+
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
@@ -38,6 +48,36 @@ app.include_router(health_router)
 app.include_router(chat_router)
 app.include_router(product_router)
 app.include_router(intent_router)
+app.include_router(debug_router)
+
+
+@app.on_event("startup")
+def start_tracing():
+    configure_tracing()
+
+
+@app.on_event("startup")
+async def warm_load_vector_snapshot():
+    if not settings.vector_snapshot_path or not os.path.isdir(settings.vector_snapshot_path):
+        return
+    snapshot = read_snapshot(settings.vector_snapshot_path)
+    warm_snapshot(snapshot)
+    await get_vector_repository().import_snapshot(snapshot)
+
+
+@app.on_event("startup")
+async def rebuild_catalog_indexes():
+    await get_product_ingestion_service().rebuild_indexes()
+
+
+@app.on_event("startup")
+async def start_vector_compaction():
+    get_vector_repository().start_background_compaction()
+
+
+@app.on_event("shutdown")
+async def stop_vector_compaction():
+    await get_vector_repository().stop_background_compaction()
 
 
 @app.get("/")
@@ -0,0 +1,50 @@
+import pytest
+from src.application.services.adaptive_fetch import AdaptiveFetchConfig, SurvivalTracker
+
+
+@pytest.fixture
+def tracker():
+    return SurvivalTracker(AdaptiveFetchConfig(initial_multiplier=2.0, smoothing=0.5, max_fetch=50))
+
+
+def test_initial_fetch_uses_multiplier(tracker):
+    assert tracker.fetch_size("shape", 5) == 10
+
+def test_low_survival_grows_fetch_size(tracker):
+    tracker.observe("shape", fetched=10, survived=1)
+
+    assert tracker.survival_ratio("shape") == pytest.approx(0.3)
+    assert tracker.fetch_size("shape", 5) == 17
+    assert tracker.fetch_size("other", 5) == 10
+
+def test_high_survival_shrinks_to_over_fetch_floor(tracker):
+    for _ in range(10):
+        tracker.observe("shape", fetched=10, survived=10)
+
+    assert tracker.fetch_size("shape", 5) == 8
+
+    unfloored = SurvivalTracker(AdaptiveFetchConfig(initial_multiplier=2.0, min_multiplier=1.0, smoothing=0.5))
+    for _ in range(10):
+        unfloored.observe("shape", fetched=10, survived=10)
+
+    assert unfloored.fetch_size("shape", 5) == 6
+
+def test_fetch_size_is_capped(tracker):
+    tracker.observe("shape", fetched=100, survived=0)
+
+    assert tracker.fetch_size("shape", 20) == 50
+    assert tracker.widened_size(40) == 50
+
+def test_disabled_tracker_keeps_fixed_multiplier():
+    tracker = SurvivalTracker(AdaptiveFetchConfig(enabled=False))
+    tracker.observe("shape", fetched=10, survived=1)
+
+    assert tracker.fetch_size("shape", 5) == 10
+
+def test_metrics_track_retries_and_fill_rate(tracker):
+    tracker.record_request(wanted=5, returned=5, fetched=10, retries=0)
+    tracker.record_request(wanted=5, returned=3, fetched=40, retries=2)
+
+    assert tracker.metrics.fill_rate == pytest.approx(0.8)
+    assert tracker.metrics.retry_rate == pytest.approx(1.0)
+    assert tracker.metrics.short_requests == 1
@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.domain.models.product import Product
+from src.domain.models.rag import RAGRequest, RetrievedContext
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.application.services.answer_policy import (
+    AnswerPath,
+    AnswerPolicy,
+    AnswerPolicyConfig,
+    render_templated_answer
+)
+
+
+def make_contexts(*scores):
+    return [
+        RetrievedContext(
+            product=Product(
+                name=f"Phone {i}",
+                description="A phone",
+                category="Phones",
+                price=100.0 + i,
+                brand="Acme",
+                features=["5G", "OLED"],
+                rating=4.5
+            ),
+            relevance_score=score
+        )
+        for i, score in enumerate(scores, 1)
+    ]
+
+
+@pytest.fixture
+def policy():
+    return AnswerPolicy()
+
+
+@pytest.mark.parametrize("request_kwargs,scores,expected", [
+    ({}, (), AnswerPath.EMPTY),
+    ({}, (0.95, 0.6), AnswerPath.SINGLE_MATCH),
+    ({}, (0.95, 0.9), AnswerPath.GENERATE),
+    ({}, (0.7,), AnswerPath.GENERATE),
+    ({"intent_type": "SEARCH_PRODUCT"}, (0.7, 0.6), AnswerPath.GENERATE),
+    ({"response_mode": "list"}, (0.7, 0.6), AnswerPath.LIST),
+    ({"response_mode": "generate"}, (0.95,), AnswerPath.GENERATE),
+])
+def test_policy_decisions(policy, request_kwargs, scores, expected):
+    decision = policy.decide(RAGRequest(query="phones", **request_kwargs), make_contexts(*scores))
+
+    assert decision.path == expected
+
+def test_configured_list_intents_take_list_path():
+    policy = AnswerPolicy(AnswerPolicyConfig(list_intents=["filter_products"]))
+
+    assert policy.decide(RAGRequest(query="phones", intent_type="FILTER_PRODUCTS"), make_contexts(0.7, 0.6)).path == AnswerPath.LIST
+
+def test_disabled_policy_always_generates():
+    policy = AnswerPolicy(AnswerPolicyConfig(enabled=False))
+
+    assert policy.decide(RAGRequest(query="phones"), make_contexts(0.99)).path == AnswerPath.GENERATE
+
+def test_metrics_track_avoided_llm_calls(policy):
+    policy.decide(RAGRequest(query="phones"), make_contexts(0.99))
+    policy.decide(RAGRequest(query="phones"), make_contexts(0.7, 0.69))
+
+    assert policy.metrics.paths["single_match"] == 1
+    assert policy.metrics.llm_calls_avoided == 1
+    assert policy.metrics.fast_path_rate == 0.5
+
+def test_templated_answers_are_deterministic(policy):
+    contexts = make_contexts(0.7, 0.6)
+    decision = policy.decide(RAGRequest(query="phones", response_mode="list"), contexts)
+
+    assert render_templated_answer(decision, contexts) == (
+        "Here are 2 matching products:\n"
+        "1. Phone 1 - $101.00 (Acme), rated 4.5/5\n"
+        "2. Phone 2 - $102.00 (Acme), rated 4.5/5"
+    )
+
+@pytest.mark.asyncio
+async def test_pipeline_skips_llm_on_decisive_match():
+    retrieval = Mock()
+    retrieval.retrieve_context = AsyncMock(return_value=make_contexts(0.95, 0.5))
+    llm_client = Mock()
+    llm_client.generate = AsyncMock()
+    pipeline = RAGPipeline(retrieval, llm_client, RAGPipelineConfig())
+
+    response = await pipeline.process_query(RAGRequest(query="phone 1"))
+
+    llm_client.generate.assert_not_called()
+    assert response.reasoning.startswith("The best match is Phone 1")
+    assert [product.name for product in response.recommended_products] == ["Phone 1"]
+    assert response.metadata["answer_path"]["path"] == "single_match"
+    assert pipeline.answer_path_metrics.llm_calls_avoided == 1
@@ -0,0 +1,275 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.models.rag import RAGRequest, RetrievedContext
+from src.domain.models.product import Product
+from src.application.services.context_retrieval import (
+    HybridRetrievalStrategy,
+    RetrievalConfig,
+    VectorSearchStrategy
+)
+from src.infrastructure.lexical.bm25_index import BM25Index
+
+
+@pytest.fixture
+def products():
+    return [
+        Product(
+            name="Bose QuietComfort 45",
+            description="Comfortable noise cancelling headphones",
+            category="Headphones",
+            price=329.0,
+            rating=4.6
+        ),
+        Product(
+            name="Sony WH-1000XM5",
+            description="Premium noise-canceling wireless headphones",
+            category="Headphones",
+            price=399.99,
+            rating=4.8
+        )
+    ]
+
+@pytest.fixture
+def mock_vector_strategy():
+    strategy = Mock(spec=VectorSearchStrategy)
+    strategy.retrieve_context = AsyncMock()
+    return strategy
+
+
+@pytest.mark.asyncio
+async def test_hybrid_without_lexical_index_reranks_vector_results(mock_vector_strategy, products):
+    mock_vector_strategy.retrieve_context.return_value = [
+        RetrievedContext(product=products[0], relevance_score=0.6),
+        RetrievedContext(product=products[1], relevance_score=0.9)
+    ]
+    strategy = HybridRetrievalStrategy(mock_vector_strategy, RetrievalConfig())
+
+    contexts = await strategy.retrieve_context("headphones", RAGRequest(query="headphones"))
+
+    assert contexts[0].product.name == "Sony WH-1000XM5"
+
+@pytest.mark.asyncio
+async def test_hybrid_fuses_lexical_matches(mock_vector_strategy, products):
+    mock_vector_strategy.retrieve_context.return_value = [
+        RetrievedContext(product=products[0], relevance_score=0.8)
+    ]
+    lexical_index = BM25Index()
+    lexical_index.add_products(products)
+    strategy = HybridRetrievalStrategy(mock_vector_strategy, RetrievalConfig(), lexical_index)
+
+    contexts = await strategy.retrieve_context("WH-1000XM5", RAGRequest(query="WH-1000XM5"))
+
+    assert [ctx.product.name for ctx in contexts] == ["Sony WH-1000XM5", "Bose QuietComfort 45"]
+    assert contexts[0].relevance_score == pytest.approx(0.5)
+
+@pytest.mark.asyncio
+async def test_hybrid_drops_lexical_matches_outside_filters(mock_vector_strategy, products):
+    mock_vector_strategy.retrieve_context.return_value = [
+        RetrievedContext(product=products[0], relevance_score=0.8)
+    ]
+    lexical_index = BM25Index()
+    lexical_index.add_products(products)
+    strategy = HybridRetrievalStrategy(mock_vector_strategy, RetrievalConfig(), lexical_index)
+
+    contexts = await strategy.retrieve_context(
+        "WH-1000XM5",
+        RAGRequest(query="WH-1000XM5", filters={"price": {"$lte": 350.0}})
+    )
+
+    assert [ctx.product.name for ctx in contexts] == ["Bose QuietComfort 45"]
+
+@pytest.mark.asyncio
+async def test_hybrid_rrf_boosts_items_in_both_rankings(mock_vector_strategy, products):
+    mock_vector_strategy.retrieve_context.return_value = [
+        RetrievedContext(product=products[0], relevance_score=0.8),
+        RetrievedContext(product=products[1], relevance_score=0.79)
+    ]
+    lexical_index = BM25Index()
+    lexical_index.add_products(products)
+    strategy = HybridRetrievalStrategy(mock_vector_strategy, RetrievalConfig(), lexical_index)
+
+    contexts, fused = strategy._fuse_rankings(
+        mock_vector_strategy.retrieve_context.return_value,
+        lexical_index.search("sony wireless")
+    )
+
+    assert fused[1] > fused[0]
+    assert max(fused) <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_vector_strategy_hydrates_only_final_results():
+    from src.domain.models.search_result import SearchHit
+
+    hits = [
+        SearchHit(f"p{i}", 0.9 - i * 0.01, f"doc {i}", {"name": f"P{i}", "category": f"C{i}", "price": 10.0})
+        for i in range(6)
+    ]
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=hits)
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig())
+
+    contexts = await strategy.retrieve_context("query", RAGRequest(query="query", max_results=3))
+
+    assert [ctx.product.name for ctx in contexts] == ["P0", "P1", "P2"]
+    assert vector_repository.search_hits.call_args[1]["top_k"] == 6
+
+@pytest.mark.asyncio
+async def test_vector_strategy_uses_best_chunk_with_full_parent(products):
+    from src.domain.models.search_result import SearchHit
+
+    parent_id = str(products[0].id)
+    hit = SearchHit(parent_id, 0.9, "noise cancelling excerpt", {
+        "name": products[0].name, "category": "Headphones", "price": 329.0,
+        "parent_id": parent_id, "chunk_position": 3
+    })
+    vector_repository = Mock()
+    vector_repository.search_chunk_hits = AsyncMock(return_value=[hit])
+    vector_repository.get_products = AsyncMock(return_value=[products[0]])
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    strategy = VectorSearchStrategy(
+        vector_repository, embedding_service, RetrievalConfig(use_chunks=True, chunk_aggregation="sum")
+    )
+
+    contexts = await strategy.retrieve_context("quiet", RAGRequest(query="quiet"))
+
+    assert contexts[0].product.description == products[0].description
+    assert contexts[0].chunk_text == "noise cancelling excerpt"
+    assert contexts[0].chunk_position == 3
+    assert vector_repository.search_chunk_hits.call_args[1]["aggregation"] == "sum"
+
+@pytest.mark.asyncio
+async def test_vector_strategy_retrieve_many_batches_embeddings_and_search():
+    from src.domain.models.search_result import SearchHit
+
+    def hit(product_id, score):
+        return SearchHit(product_id, score, "doc", {"name": product_id, "category": product_id, "price": 10.0})
+
+    vector_repository = Mock()
+    vector_repository.search_many = AsyncMock(return_value=[[hit("a", 0.9)], [hit("b", 0.8), hit("c", 0.1)]])
+    embedding_service = Mock()
+    embedding_service.embed_batch = AsyncMock(return_value=[[0.1], [0.2]])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig())
+
+    per_query = await strategy.retrieve_many(["iphone 15", "galaxy s24"], RAGRequest(query="compare", max_results=2))
+
+    embedding_service.embed_batch.assert_called_once_with(["iphone 15", "galaxy s24"])
+    vector_repository.search_many.assert_called_once_with(
+        query_embeddings=[[0.1], [0.2]], top_k=4, filters=None, include_embeddings=True
+    )
+    assert [[ctx.product.name for ctx in contexts] for contexts in per_query] == [["a"], ["b"]]
+
+@pytest.mark.asyncio
+async def test_vector_strategy_pushes_filters_to_index():
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=[])
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig())
+    filters = {"$and": [{"category": "Headphones"}, {"price": {"$lte": 200.0}}]}
+
+    await strategy.retrieve_context("headphones", RAGRequest(query="headphones", filters=filters))
+
+    assert vector_repository.search_hits.call_args.kwargs["filters"] == filters
+
+@pytest.mark.asyncio
+async def test_vector_strategy_reuses_precomputed_query_embedding():
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=[])
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig())
+
+    await strategy.retrieve_context("headphones", RAGRequest(query="headphones", query_embedding=[0.5]))
+
+    embedding_service.embed_text.assert_not_called()
+    assert vector_repository.search_hits.call_args.kwargs["query_embedding"] == [0.5]
+
+def make_embedded_hits():
+    from src.domain.models.search_result import SearchHit
+
+    metadata = {"category": "Headphones", "brand": "Sony", "price": 399.0}
+    return [
+        SearchHit("xm5", 0.92, "doc", {**metadata, "name": "XM5"}, embedding=[1.0, 0.0, 0.0]),
+        SearchHit("xm5-black", 0.91, "doc", {**metadata, "name": "XM5 Black"}, embedding=[0.99, 0.05, 0.0]),
+        SearchHit("qc45", 0.85, "doc", {**metadata, "name": "QC45", "brand": "Bose"}, embedding=[0.3, 0.95, 0.0])
+    ]
+
+@pytest.mark.asyncio
+async def test_vector_strategy_uses_mmr_over_embeddings():
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=make_embedded_hits())
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(mmr_lambda=0.5))
+
+    contexts = await strategy.retrieve_context("headphones", RAGRequest(query="headphones", max_results=2))
+
+    assert [ctx.product.name for ctx in contexts] == ["XM5", "QC45"]
+    assert vector_repository.search_hits.call_args[1]["include_embeddings"] is True
+
+@pytest.mark.asyncio
+async def test_vector_strategy_heuristic_diversity_option():
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=make_embedded_hits())
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2, 0.3])
+    strategy = VectorSearchStrategy(
+        vector_repository, embedding_service, RetrievalConfig(diversity_method="heuristic", diversity_threshold=0.9)
+    )
+
+    contexts = await strategy.retrieve_context("headphones", RAGRequest(query="headphones", max_results=3))
+
+    assert [ctx.product.name for ctx in contexts] == ["XM5", "QC45"]
+    assert vector_repository.search_hits.call_args[1]["include_embeddings"] is False
+
+@pytest.mark.asyncio
+async def test_vector_strategy_widens_and_resumes_when_results_are_short():
+    from src.domain.models.search_result import SearchHit
+
+    catalog = [
+        SearchHit(f"p{i}", 0.95 - i * 0.01, "doc", {"name": f"P{i}", "category": f"C{i // 5}", "brand": "B", "price": 10.0})
+        for i in range(20)
+    ]
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(side_effect=lambda **kwargs: catalog[:kwargs["top_k"]])
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    strategy = VectorSearchStrategy(
+        vector_repository, embedding_service, RetrievalConfig(diversity_method="heuristic")
+    )
+
+    contexts = await strategy.retrieve_context("query", RAGRequest(query="query", max_results=3))
+
+    assert [ctx.product.name for ctx in contexts] == ["P0", "P5", "P10"]
+    assert [call[1]["top_k"] for call in vector_repository.search_hits.call_args_list] == [6, 12]
+    assert strategy.metrics.widening_retries == 1
+    assert strategy.metrics.fill_rate == 1.0
+
+    await strategy.retrieve_context("query", RAGRequest(query="query", max_results=3))
+
+    assert vector_repository.search_hits.call_args_list[2][1]["top_k"] > 6
+
+@pytest.mark.asyncio
+async def test_vector_strategy_does_not_widen_past_relevance_cutoff():
+    from src.domain.models.search_result import SearchHit
+
+    hits = [
+        SearchHit(f"p{i}", score, "doc", {"name": f"P{i}", "category": f"C{i}", "price": 10.0})
+        for i, score in enumerate([0.9, 0.4, 0.3, 0.2])
+    ]
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=hits)
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig())
+
+    contexts = await strategy.retrieve_context("query", RAGRequest(query="query", max_results=2))
+
+    assert len(contexts) == 1
+    vector_repository.search_hits.assert_called_once()
+    assert strategy.metrics.short_requests == 1
@@ -0,0 +1,29 @@
+import numpy as np
+from src.application.services.diversity import maximal_marginal_relevance
+
+
+def test_mmr_skips_near_duplicates():
+    embeddings = np.array([
+        [1.0, 0.0],
+        [0.99, 0.01],
+        [0.0, 1.0]
+    ])
+
+    selected = maximal_marginal_relevance([0.9, 0.89, 0.7], embeddings, k=2, lambda_mult=0.5)
+
+    assert selected == [0, 2]
+
+def test_mmr_lambda_one_is_pure_relevance():
+    embeddings = np.array([[1.0, 0.0], [1.0, 0.0], [0.0, 1.0]])
+
+    selected = maximal_marginal_relevance([0.9, 0.8, 0.1], embeddings, k=3, lambda_mult=1.0)
+
+    assert selected == [0, 1, 2]
+
+def test_mmr_limits_to_candidate_count():
+    selected = maximal_marginal_relevance([0.5], np.array([[1.0, 0.0]]), k=5)
+
+    assert selected == [0]
+
+def test_mmr_handles_empty_candidates():
+    assert maximal_marginal_relevance([], np.zeros((0, 2)), k=3) == []
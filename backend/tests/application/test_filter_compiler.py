@@ -0,0 +1,155 @@
+import math
+import pytest
+from src.domain.models.product import Product
+from src.domain.value_objects.entities import Entity, EntityType
+from src.application.services.filter_compiler import (
+    AliasTable,
+    FilterCompiler,
+    filter_fields,
+    normalize_entity_type,
+    parse_price_expression,
+    product_matches_filters
+)
+
+
+@pytest.fixture
+def compiler():
+    return FilterCompiler(
+        category_aliases=AliasTable.build(
+            ["Headphones", "Laptops"],
+            {"Headphones": ["earbuds", "headset"], "Laptops": ["notebook"]}
+        ),
+        brand_aliases=AliasTable.build(["Sony", "Hewlett-Packard"], {"Hewlett-Packard": ["HP"]})
+    )
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("under $200", (0.0, 200.0)),
+    ("less than 1,500", (0.0, 1500.0)),
+    ("between 50 and 100", (50.0, 100.0)),
+    ("$100-$50", (50.0, 100.0)),
+    ("around $100", (80.0, 120.0)),
+    ("cheap", (0.0, 50.0)),
+    ("up to 2k", (0.0, 2000.0)),
+])
+def test_parse_price_expression(text, expected):
+    price_range = parse_price_expression(text)
+
+    assert (price_range.min_price, price_range.max_price) == pytest.approx(expected)
+
+def test_parse_open_ended_and_unknown():
+    assert math.isinf(parse_price_expression("over $300").max_price)
+    assert parse_price_expression("something nice") is None
+
+def test_bare_numbers_only_parse_as_whole_amounts():
+    assert parse_price_expression("$300").max_price == 300.0
+    assert parse_price_expression("150 dollars").max_price == 150.0
+    assert parse_price_expression("iphone 15") is None
+
+def test_alias_table_resolves_case_plural_and_aliases():
+    table = AliasTable.build(["Headphones"], {"headphones": ["Earbuds"]})
+
+    assert table.resolve("headphone") == "Headphones"
+    assert table.resolve("EARBUDS") == "Headphones"
+    assert table.resolve("toaster") is None
+    assert AliasTable().resolve(" Toaster ") is None
+
+def test_alias_table_links_aliases_once_catalog_is_learned():
+    table = AliasTable(aliases={"Headphones": ["earbuds"], "Hewlett-Packard": ["HP"]})
+
+    assert table.resolve("earbuds") is None
+    table.add(["Headphones", "Earbuds"])
+
+    assert table.resolve("earbud") == "Earbuds"
+    assert table.resolve("headphones") == "Headphones"
+    assert table.resolve("hp") is None
+    assert len(table) == 2
+
+def test_learn_catalog_resolves_configured_synonyms():
+    compiler = FilterCompiler(
+        category_aliases=AliasTable(aliases={"Headphones": ["earbuds"]}),
+        brand_aliases=AliasTable(aliases={"Hewlett-Packard": ["HP"]})
+    )
+    compiler.learn_catalog([
+        Product(name="Envy", description="Laptop", category="Headphones", price=10.0, brand="Hewlett-Packard")
+    ])
+
+    compiled = compiler.compile([("CATEGORY", "earbuds"), ("BRAND", "HP")])
+
+    assert compiled.unresolved == []
+    assert "Headphones" in str(compiled.where)
+    assert "Hewlett-Packard" in str(compiled.where)
+
+def test_compile_emits_index_filters(compiler):
+    compiled = compiler.compile([
+        ("CATEGORY", "earbuds"),
+        ("BRAND", "sony"),
+        ("PRICE_RANGE", "between 50 and 100"),
+    ])
+
+    assert compiled.where == {"$and": [
+        {"category": "Headphones"},
+        {"brand": "Sony"},
+        {"price": {"$gte": 50.0}},
+        {"price": {"$lte": 100.0}},
+    ]}
+    assert compiled.price_range.max_price == 100.0
+
+def test_compile_single_clause_and_unresolved(compiler):
+    compiled = compiler.compile([("category", "notebooks"), ("BRAND", "acme")])
+
+    assert compiled.where == {"category": "Laptops"}
+    assert compiled.unresolved == ["acme"]
+
+def test_compile_merges_multiple_values(compiler):
+    compiled = compiler.compile([("BRAND", "HP"), ("BRAND", "Sony"), ("PRICE_RANGE", "over 40"), ("PRICE_RANGE", "cheap")])
+
+    assert compiled.where["$and"][0] == {"brand": {"$in": ["Hewlett-Packard", "Sony"]}}
+    assert (compiled.price_range.min_price, compiled.price_range.max_price) == (40.0, 50.0)
+
+def test_compile_accepts_detector_entities(compiler):
+    entities = [
+        Entity(type=EntityType.CATEGORY, value="earbuds", confidence=0.9),
+        Entity(type=EntityType.BRAND, value="Sony", confidence=0.8),
+        Entity(type=EntityType.PRICE_RANGE, value="under $100", confidence=0.8),
+    ]
+
+    compiled = compiler.compile((entity.type, entity.value) for entity in entities)
+
+    assert compiled.where == {"$and": [
+        {"category": "Headphones"},
+        {"brand": "Sony"},
+        {"price": {"$lte": 100.0}},
+    ]}
+    assert normalize_entity_type(EntityType.PRICE_RANGE) == "PRICE_RANGE"
+
+def test_compile_keeps_price_tiers_out_of_the_index(compiler):
+    compiled = compiler.compile([("CATEGORY", "laptops"), ("PRICE_RANGE", "cheap")])
+
+    assert compiled.where == {"category": "Laptops"}
+    assert compiled.price_range.max_price == 50.0
+
+def test_compile_learns_catalog_values():
+    compiler = FilterCompiler()
+    assert compiler.compile([("CATEGORY", "laptops")]).where is None
+
+    compiler.learn_catalog([
+        Product(name="X1", description="d", price=999.0, category="Laptops", brand="Lenovo"),
+        Product(name="Buds", description="d", price=79.0, category="Headphones"),
+    ])
+    compiled = compiler.compile([("CATEGORY", "laptops"), ("BRAND", "lenovo"), ("BRAND", "acme")])
+
+    assert compiled.where == {"$and": [{"category": "Laptops"}, {"brand": "Lenovo"}]}
+    assert compiled.unresolved == ["acme"]
+
+def test_compile_without_entities(compiler):
+    assert compiler.compile([]).where is None
+
+def test_product_matches_compiled_filters(compiler):
+    where = compiler.compile([("CATEGORY", "headset"), ("PRICE_RANGE", "under 100")]).where
+    product = Product(name="Buds", description="d", price=79.0, category="Headphones", brand="Sony")
+    pricey = Product(name="Cans", description="d", price=299.0, category="Headphones", brand="Sony")
+
+    assert product_matches_filters(product, where)
+    assert not product_matches_filters(pricey, where)
+    assert filter_fields(where) == ["category", "price"]
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.models.product import Product
+from src.domain.models.rag import RAGRequest, RetrievedContext
+from src.application.services.listwise_rerank import (
+    ListwiseRerankConfig,
+    ListwiseReranker,
+    ListwiseRerankingStrategy,
+    build_listwise_prompt,
+    parse_permutation
+)
+
+
+def make_contexts(*scores):
+    names = ["MacBook Air", "ThinkPad X1", "Chromebook", "Surface Laptop"]
+    return [
+        RetrievedContext(
+            product=Product(name=names[i], description="Laptop", category="Laptops", price=999.0),
+            relevance_score=score
+        )
+        for i, score in enumerate(scores)
+    ]
+
+
+@pytest.fixture
+def llm_client():
+    client = Mock()
+    client.generate = AsyncMock(return_value="2 1 3")
+    return client
+
+
+def test_parse_permutation_dedupes_and_appends_missing():
+    assert parse_permutation("Ranking: 3, 1, 3, 9", 3) == [2, 0, 1]
+    assert parse_permutation("no idea", 3) is None
+
+def test_prompt_is_compact():
+    prompt = build_listwise_prompt("good for programming", make_contexts(0.7, 0.6))
+
+    assert "[1] MacBook Air - $999, Laptops" in prompt
+    assert "[2] ThinkPad X1" in prompt
+    assert "Laptop\n" not in prompt
+
+@pytest.mark.asyncio
+async def test_reranks_window_and_keeps_tail(llm_client):
+    reranker = ListwiseReranker(llm_client, ListwiseRerankConfig(window=3))
+    contexts = make_contexts(0.7, 0.65, 0.6, 0.5)
+
+    reranked = await reranker.rerank("good for programming", contexts)
+
+    assert [ctx.product.name for ctx in reranked] == ["ThinkPad X1", "MacBook Air", "Chromebook", "Surface Laptop"]
+    assert [ctx.relevance_score for ctx in reranked] == [0.7, 0.65, 0.6, 0.5]
+    assert "[4]" not in llm_client.generate.call_args.kwargs["prompt"]
+
+@pytest.mark.asyncio
+async def test_cache_hits_on_same_query_and_candidate_set(llm_client):
+    reranker = ListwiseReranker(llm_client)
+    contexts = make_contexts(0.7, 0.65, 0.6)
+
+    await reranker.rerank("Good for  programming", contexts)
+    reranked = await reranker.rerank("good for programming", list(reversed(contexts)))
+
+    assert llm_client.generate.call_count == 1
+    assert reranker.stats.cache_hits == 1
+    assert reranked[0].product.name == "ThinkPad X1"
+    assert max(reranked, key=lambda ctx: ctx.relevance_score) is reranked[0]
+
+@pytest.mark.asyncio
+async def test_large_leader_margin_skips_llm(llm_client):
+    reranker = ListwiseReranker(llm_client, ListwiseRerankConfig(skip_margin=0.2))
+    contexts = make_contexts(0.95, 0.6, 0.55)
+
+    assert await reranker.rerank("laptop", contexts) == contexts
+    llm_client.generate.assert_not_called()
+    assert reranker.stats.skipped_margin == 1
+
+@pytest.mark.asyncio
+async def test_latency_budget_falls_back_to_input_order(llm_client):
+    async def slow_generate(**kwargs):
+        await asyncio.sleep(1)
+        return "2 1"
+
+    llm_client.generate = AsyncMock(side_effect=slow_generate)
+    reranker = ListwiseReranker(llm_client, ListwiseRerankConfig(latency_budget_ms=10))
+    contexts = make_contexts(0.7, 0.65)
+
+    assert await reranker.rerank("laptop", contexts) == contexts
+    assert reranker.stats.timeouts == 1
+
+@pytest.mark.asyncio
+async def test_strategy_wraps_base_retrieval(llm_client):
+    base = Mock()
+    base.retrieve_context = AsyncMock(return_value=make_contexts(0.7, 0.65))
+    strategy = ListwiseRerankingStrategy(base, ListwiseReranker(llm_client))
+
+    contexts = await strategy.retrieve_context("laptop", RAGRequest(query="laptop"))
+
+    assert contexts[0].product.name == "ThinkPad X1"
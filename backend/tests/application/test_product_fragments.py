@@ -0,0 +1,65 @@
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+from src.application.services.prompt_template import RAGPromptTemplates
+from src.application.services.product_fragments import FragmentCacheConfig, ProductFragmentCache
+
+
+def make_context(name, relevance=0.9):
+    product = Product(name=name, description=f"{name} description", category="Phones", price=99.0, features=["5G"])
+    return RetrievedContext(product=product, relevance_score=relevance)
+
+
+def test_fragments_are_cached_per_product_and_generation():
+    generation = {"value": 1}
+    cache = ProductFragmentCache(generation=lambda: generation["value"])
+    ctx = make_context("Pixel 8")
+
+    first = cache.render(1, ctx)
+    second = cache.render(3, make_context("Pixel 8", 0.5).model_copy(update={"product": ctx.product}))
+    generation["value"] = 2
+    cache.render(1, ctx)
+
+    assert first.startswith("Product 1 (relevance 90%): Pixel 8\n")
+    assert second.startswith("Product 3 (relevance 50%): Pixel 8\n")
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+
+def test_fragment_cache_evicts_least_recently_used():
+    cache = ProductFragmentCache(FragmentCacheConfig(max_entries=2))
+    contexts = [make_context(name) for name in ["A", "B", "C"]]
+
+    cache.render(1, contexts[0])
+    cache.render(1, contexts[1])
+    cache.render(1, contexts[0])
+    cache.render(1, contexts[2])
+    cache.render(1, contexts[0])
+
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 3
+
+def test_truncated_description_bypasses_cache():
+    cache = ProductFragmentCache()
+
+    fragment = cache.render(1, make_context("Pixel 8"), description="Short.")
+
+    assert "Description: Short." in fragment
+    assert cache.stats.entries == 0
+
+def test_templates_are_compiled_once_with_normalized_whitespace():
+    template = RAGPromptTemplates.get_recommendation_template()
+
+    assert template is RAGPromptTemplates.get_recommendation_template()
+    assert "    " not in template.system_prompt
+    assert "    " not in template.user_prompt_template
+    assert "Example 2:" in template.few_shot_text
+
+def test_format_products_context_uses_fragment_cache():
+    cache = ProductFragmentCache()
+    contexts = [make_context("Pixel 8"), make_context("Galaxy S24", 0.7)]
+
+    RAGPromptTemplates.format_products_context(contexts, cache)
+    context = RAGPromptTemplates.format_products_context(contexts, cache)
+
+    assert context.split("\n\n")[1].startswith("Product 2 (relevance 70%): Galaxy S24")
+    assert cache.stats.hits == 2
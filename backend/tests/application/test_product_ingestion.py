@@ -145,4 +145,113 @@ async def test_dependency_injection(mock_embedding_service, mock_vector_reposito
     )
     
     assert service._embedding_service == mock_embedding_service
-    assert service._vector_repository == mock_vector_repository
\ No newline at end of file
+    assert service._vector_repository == mock_vector_repository
+
+
+@pytest.mark.asyncio
+async def test_chunked_ingestion_embeds_in_batches(mock_embedding_service, mock_vector_repository):
+    from src.application.services.text_chunker import TextChunker, ChunkConfig
+
+    sample_products = [
+        Product(name="Laptop", description="High performance laptop", category="Electronics", price=999.99),
+        Product(name="Mouse", description="Wireless mouse", category="Electronics", price=29.99)
+    ]
+
+    mock_embedding_service.embed_batch = AsyncMock(side_effect=lambda texts: [[0.1] for _ in texts])
+    mock_vector_repository.add_chunks = AsyncMock(return_value=0)
+    service = ProductIngestionService(
+        embedding_service=mock_embedding_service,
+        vector_repository=mock_vector_repository,
+        text_chunker=TextChunker(ChunkConfig(chunk_size=40, chunk_overlap=0)),
+        embedding_batch_size=3
+    )
+
+    await service.ingest_products(sample_products)
+
+    products, chunk_texts, embeddings = mock_vector_repository.add_chunks.call_args[0]
+    total_chunks = sum(len(texts) for texts in chunk_texts)
+    assert products == sample_products
+    assert len(embeddings) == total_chunks
+    assert all(len(call[0][0]) <= 3 for call in mock_embedding_service.embed_batch.call_args_list)
+    assert chunk_texts[0][0].startswith("Product: Laptop")
+    assert not any("Price:" in text for texts in chunk_texts for text in texts)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_fills_catalog_indexes(mock_embedding_service, mock_vector_repository):
+    from src.application.services.filter_compiler import FilterCompiler
+    from src.infrastructure.lexical.bm25_index import BM25Index
+
+    mock_vector_repository.list_products = AsyncMock(return_value=[
+        Product(name="Laptop", description="Fast laptop", category="Laptops", price=999.99, brand="Lenovo")
+    ])
+    compiler = FilterCompiler()
+    lexical_index = BM25Index()
+    service = ProductIngestionService(
+        embedding_service=mock_embedding_service,
+        vector_repository=mock_vector_repository,
+        lexical_index=lexical_index,
+        filter_compiler=compiler
+    )
+
+    assert await service.rebuild_indexes() == 1
+    assert compiler.compile([("CATEGORY", "laptop")]).where == {"category": "Laptops"}
+    mock_vector_repository.index_metadata.assert_called_once_with(mock_vector_repository.list_products.return_value)
+    assert lexical_index.get_product(lexical_index.search("lenovo")[0][0]).name == "Laptop"
+
+
+@pytest.mark.asyncio
+async def test_metadata_updates_refresh_lexical_index(mock_embedding_service, mock_vector_repository):
+    from src.infrastructure.lexical.bm25_index import BM25Index
+
+    product = Product(name="Laptop", description="Fast laptop", category="Laptops", price=999.99)
+    lexical_index = BM25Index()
+    lexical_index.add_product(product)
+    mock_vector_repository.apply_deltas = AsyncMock(return_value=1)
+    service = ProductIngestionService(
+        embedding_service=mock_embedding_service,
+        vector_repository=mock_vector_repository,
+        lexical_index=lexical_index
+    )
+
+    assert await service.apply_metadata_updates({str(product.id): {"price": 899.99, "stock_quantity": 3}}) == 1
+    refreshed = lexical_index.get_product(str(product.id))
+    assert (refreshed.price, refreshed.stock_quantity) == (899.99, 3)
+
+
+@pytest.mark.asyncio
+async def test_update_products_refreshes_similar_products(mock_embedding_service, mock_vector_repository):
+    products = [Product(name="Laptop", description="Fast laptop", category="Laptops", price=999.99)]
+    similar_products = Mock()
+    similar_products.index_products = AsyncMock()
+    mock_vector_repository.upsert_products = AsyncMock()
+    service = ProductIngestionService(
+        embedding_service=mock_embedding_service,
+        vector_repository=mock_vector_repository,
+        similar_products=similar_products
+    )
+
+    await service.update_products(products)
+
+    similar_products.index_products.assert_awaited_once_with([str(products[0].id)])
+
+
+@pytest.mark.asyncio
+async def test_shard_repository_mirrors_catalog_writes(mock_embedding_service, mock_vector_repository):
+    products = [Product(name="Laptop", description="Fast laptop", category="Laptops", price=999.99)]
+    shard_repository = Mock()
+    shard_repository.add_products = AsyncMock()
+    shard_repository.delete_product = AsyncMock()
+    shard_repository.get_product_count = AsyncMock(return_value=0)
+    mock_vector_repository.list_products = AsyncMock(return_value=products)
+    service = ProductIngestionService(
+        embedding_service=mock_embedding_service,
+        vector_repository=mock_vector_repository,
+        shard_repository=shard_repository
+    )
+
+    await service.rebuild_indexes()
+    await service.remove_product(str(products[0].id))
+
+    shard_repository.add_products.assert_awaited_once_with(products)
+    shard_repository.delete_product.assert_awaited_once_with(str(products[0].id))
@@ -0,0 +1,85 @@
+import pytest
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+from src.application.services.prompt_template import RAGPromptTemplates
+from src.application.services.prompt_builder import (
+    ApproximateTokenizer,
+    PromptBudget,
+    PromptBuilder
+)
+
+
+def make_context(name, relevance, sentences=20):
+    description = " ".join(f"{name} sentence number {i} explains a detail." for i in range(sentences))
+    product = Product(
+        name=name,
+        description=description,
+        category="Headphones",
+        price=199.0,
+        features=[f"feature {i}" for i in range(10)]
+    )
+    return RetrievedContext(product=product, relevance_score=relevance)
+
+
+@pytest.fixture
+def template():
+    return RAGPromptTemplates.get_recommendation_template()
+
+
+def test_tokenizer_truncates_at_sentence_boundaries():
+    tokenizer = ApproximateTokenizer(chars_per_token=4.0)
+    text = "First sentence here. Second sentence is longer than the first. Third."
+
+    assert tokenizer.truncate_sentences(text, 12) == "First sentence here."
+    assert tokenizer.truncate_sentences(text, 100) == text
+    assert tokenizer.truncate_sentences("one two three four five six", 3).endswith("…")
+
+def test_small_prompt_is_left_untouched(template):
+    builder = PromptBuilder(PromptBudget(max_prompt_tokens=4000))
+
+    result = builder.build(template, "headphones", [make_context("Sony", 0.9, sentences=1)])
+
+    assert result.tokens_saved == 0
+    assert not result.few_shots_dropped
+    assert "Example 1:" in result.prompt
+
+def test_tight_budget_drops_few_shots_and_truncates(template):
+    builder = PromptBuilder(PromptBudget(max_prompt_tokens=600))
+    contexts = [make_context("Sony", 0.9), make_context("Bose", 0.6)]
+
+    result = builder.build(template, "headphones", contexts)
+
+    assert result.few_shots_dropped
+    assert "Example 1:" not in result.prompt
+    assert result.tokens_used <= 600
+    assert result.tokens_saved > 0
+    assert result.products_truncated == 2
+    assert "feature 5" not in result.prompt
+
+def test_budget_is_allocated_by_relevance(template):
+    builder = PromptBuilder(PromptBudget(max_prompt_tokens=450))
+    contexts = [make_context("Sony", 0.9), make_context("Bose", 0.3)]
+
+    result = builder.build(template, "headphones", contexts)
+
+    sony, bose = result.prompt.split("Product 2 (")
+    assert sony.count("Sony sentence") > bose.count("Bose sentence") > 0
+
+def test_low_ranked_products_are_dropped_when_budget_runs_out(template):
+    builder = PromptBuilder(PromptBudget(max_prompt_tokens=400, min_product_tokens=60))
+    contexts = [make_context(name, 0.8) for name in ["Sony", "Bose", "JBL", "Anker"]]
+
+    result = builder.build(template, "headphones", contexts)
+
+    assert result.products_dropped > 0
+    assert "Sony" in result.prompt
+    assert "Anker" not in result.prompt
+
+def test_history_keeps_most_recent_lines(template):
+    builder = PromptBuilder(PromptBudget(max_prompt_tokens=500, history_share=0.05))
+    history = "\n".join(f"user: message {i}" for i in range(50))
+
+    result = builder.build(template, "headphones", [make_context("Sony", 0.9)], history)
+
+    assert "message 49" in result.prompt
+    assert "message 0\n" not in result.prompt
@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.models.conversation_state import ConversationContext
+from src.domain.models.intent import DetectedIntent
+from src.domain.models.memory import MemoryConfig
+from src.domain.models.product import Product
+from src.domain.models.search_result import SearchHit
+from src.domain.value_objects.entities import Entity, EntityType, IntentType
+from src.application.services.context_retrieval import RetrievalConfig, VectorSearchStrategy
+from src.application.services.conversation_manager import ConversationManager, ConversationManagerConfig
+from src.application.services.filter_compiler import FilterCompiler
+from src.application.services.query_rewriter import QueryRewriter, RewriteConfig
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.infrastructure.conversation.in_memory_state_repository import InMemoryStateRepository
+from src.infrastructure.conversation.in_memory_memory_repository import InMemoryMemoryRepository
+
+
+def make_context(*history, **entities):
+    return ConversationContext(
+        search_history=list(history),
+        collected_entities={kind: [value] for kind, value in entities.items()}
+    )
+
+
+def make_intent(query, *entities):
+    return DetectedIntent(
+        intent_type=IntentType.SEARCH_PRODUCT,
+        confidence=0.9,
+        entities=[Entity(type=kind, value=value, confidence=0.9) for kind, value in entities],
+        raw_query=query
+    )
+
+
+@pytest.fixture
+def embedding_service():
+    service = Mock()
+    service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    return service
+
+
+@pytest.fixture
+def llm_client():
+    client = Mock()
+    client.generate = AsyncMock(return_value="wireless gaming mouse")
+    return client
+
+
+@pytest.mark.asyncio
+async def test_standalone_query_passes_through():
+    rewriter = QueryRewriter()
+    context = make_context("noise cancelling headphones", category="headphones")
+
+    rewritten = await rewriter.rewrite("mechanical keyboard for coding", context, [(EntityType.CATEGORY, "keyboards")])
+
+    assert not rewritten.rewritten
+    assert rewritten.query == "mechanical keyboard for coding"
+    assert rewritten.entities == [("category", "keyboards")]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("message", [
+    "do you have any laptops?",
+    "what about laptops instead",
+    "is it also available in gaming mice",
+])
+async def test_new_topic_without_category_entity_passes_through(message):
+    rewriter = QueryRewriter()
+    context = make_context("sony headphones", category="headphones", brand="Sony")
+
+    rewritten = await rewriter.rewrite(message, context, [])
+
+    assert not rewritten.rewritten
+    assert rewritten.query == message
+
+@pytest.mark.asyncio
+async def test_cheaper_follow_up_reuses_last_query_and_lowers_price():
+    rewriter = QueryRewriter()
+    context = make_context("noise cancelling headphones under 200", category="headphones", brand="Sony")
+
+    rewritten = await rewriter.rewrite("what about cheaper ones?", context, [])
+
+    assert rewritten.method == "template"
+    assert rewritten.query == "headphones sony noise cancelling"
+    assert dict(rewritten.entities) == {"category": "headphones", "brand": "Sony", "price_range": "under 160"}
+
+@pytest.mark.asyncio
+async def test_message_entities_override_collected_ones():
+    rewriter = QueryRewriter()
+    context = make_context("sony headphones", category="headphones", brand="Sony")
+
+    rewritten = await rewriter.rewrite("how about bose instead", context, [(EntityType.BRAND, "Bose")])
+
+    assert dict(rewritten.entities)["brand"] == "Bose"
+    assert rewritten.query.split()[:2] == ["headphones", "bose"]
+
+@pytest.mark.asyncio
+async def test_llm_fallback_runs_under_budget(llm_client):
+    rewriter = QueryRewriter(llm_client=llm_client)
+    context = make_context("can you show me something")
+
+    rewritten = await rewriter.rewrite("any others?", context, [])
+
+    assert rewritten.method == "llm"
+    assert rewritten.query == "wireless gaming mouse"
+
+    async def slow_generate(**kwargs):
+        await asyncio.sleep(1)
+        return "too late"
+
+    llm_client.generate = AsyncMock(side_effect=slow_generate)
+    rewriter = QueryRewriter(llm_client=llm_client, config=RewriteConfig(llm_budget_ms=10))
+
+    rewritten = await rewriter.rewrite("any others?", context, [])
+
+    assert rewritten.query == "any others?"
+    assert rewriter.stats.llm_failures == 1
+
+@pytest.mark.asyncio
+async def test_embeddings_are_cached_per_conversation(embedding_service):
+    rewriter = QueryRewriter(embedding_service)
+    first, second = uuid4(), uuid4()
+
+    await rewriter.embed(first, "Sony  headphones")
+    await rewriter.embed(first, "sony headphones")
+    await rewriter.embed(second, "sony headphones")
+    rewriter.forget(first)
+    await rewriter.embed(first, "sony headphones")
+
+    assert embedding_service.embed_text.await_count == 3
+    assert rewriter.stats.embedding_hits == 1
+
+@pytest.mark.asyncio
+async def test_manager_retrieves_with_rewritten_query(embedding_service, llm_client):
+    hit = SearchHit("p1", 0.9, "Compact earbuds", {"name": "Buds", "category": "Headphones", "price": 99.0})
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=[hit])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(diversity_method="none"))
+    detector = Mock()
+    detector.detect_intent = AsyncMock(side_effect=[
+        make_intent("headphones under 200", (EntityType.CATEGORY, "headphones"), (EntityType.PRICE_RANGE, "under 200")),
+        make_intent("what about cheaper ones?")
+    ])
+    compiler = FilterCompiler()
+    compiler.learn_catalog([Product(name="Buds", description="d", price=99.0, category="Headphones")])
+    manager = ConversationManager(
+        state_repository=InMemoryStateRepository(),
+        memory_repository=InMemoryMemoryRepository(),
+        intent_detector=detector,
+        rag_pipeline=RAGPipeline(strategy, llm_client, RAGPipelineConfig()),
+        config=ConversationManagerConfig(memory_config=MemoryConfig()),
+        filter_compiler=compiler,
+        query_rewriter=QueryRewriter(embedding_service)
+    )
+    conversation_id = (await manager.start_conversation(uuid4())).conversation_id
+
+    await manager.process_message(conversation_id, "headphones under 200")
+    response, state = await manager.process_message(conversation_id, "what about cheaper ones?")
+
+    assert "Buds" in response
+    assert len(state.context.ranked_product_ids) == 1
+    assert embedding_service.embed_text.call_args_list[-1].args == ("headphones",)
+    assert vector_repository.search_hits.call_args.kwargs["filters"] == {"$and": [
+        {"category": "Headphones"},
+        {"price": {"$lte": 160.0}},
+    ]}
+    assert state.context.search_history == ["headphones under 200", "headphones"]
+    assert state.context.collected_entities["price_range"] == ["under 200", "under 160"]
@@ -231,16 +231,23 @@ async def test_compare_products(
 
 
 @pytest.mark.asyncio
-async def test_select_most_consistent_response(rag_pipeline):
-    responses = [
-        "Very short",
-        "This is a medium length response",
-        "Long response with many words and details"
-    ]
-    
-    selected = rag_pipeline._select_most_consistent_response(responses)
-    
-    assert selected == "This is a medium length response"
+async def test_self_consistency_reports_sample_stats(mock_retrieval_strategy, mock_llm_client):
+    product = Product(name="Sony WH-1000XM5", category="Headphones", price=399.0, description="Headphones")
+    mock_retrieval_strategy.retrieve_context.return_value = [RetrievedContext(product=product, relevance_score=0.9)]
+    mock_llm_client.generate.return_value = "The Sony WH-1000XM5 fits best"
+    pipeline = RAGPipeline(
+        mock_retrieval_strategy,
+        mock_llm_client,
+        RAGPipelineConfig(enable_self_consistency=True, consistency_samples=3, consistency_concurrency=1)
+    )
+
+    response = await pipeline.process_query(RAGRequest(query="headphones", response_mode="generate"))
+
+    stats = response.metadata["self_consistency"]
+    assert stats["early_exit"] is True
+    assert stats["samples_completed"] == 2
+    assert stats["agreed_product_ids"] == [str(product.id)]
+    assert pipeline.consistency_metrics.early_exit_rate == 1.0
 
 
 @pytest.mark.asyncio
@@ -278,3 +285,27 @@ async def test_process_query_integration_flow(
     assert response.context_used[0].relevance_score == 0.95
     assert response.confidence_score > 0.5
     assert isinstance(response.generated_at, datetime)
+
+
+@pytest.mark.asyncio
+async def test_compare_products_retrieves_queries_in_one_batch(
+    rag_pipeline,
+    mock_retrieval_strategy,
+    mock_llm_client
+):
+    iphone = Product(name="iPhone 15", category="Phones", price=799.0, description="Apple phone")
+    iphone_case = Product(name="iPhone 15 Case", category="Phones", price=19.0, description="Case")
+    galaxy = Product(name="Galaxy S24", category="Phones", price=799.0, description="Samsung phone")
+    mock_retrieval_strategy.retrieve_many = AsyncMock(return_value=[
+        [RetrievedContext(product=iphone, relevance_score=0.9), RetrievedContext(product=iphone_case, relevance_score=0.7)],
+        [RetrievedContext(product=galaxy, relevance_score=0.85), RetrievedContext(product=iphone, relevance_score=0.6)]
+    ])
+    mock_llm_client.generate.return_value = "The Galaxy has a better zoom camera"
+
+    comparison = await rag_pipeline.compare_products([], queries=["iPhone 15", "Galaxy S24"])
+
+    assert comparison == "The Galaxy has a better zoom camera"
+    mock_retrieval_strategy.retrieve_many.assert_called_once()
+    assert mock_retrieval_strategy.retrieve_many.call_args[0][0] == ["iPhone 15", "Galaxy S24"]
+    prompt = mock_llm_client.generate.call_args[1]["prompt"]
+    assert prompt.index("iPhone 15") < prompt.index("Galaxy S24") < prompt.index("iPhone 15 Case")
@@ -0,0 +1,84 @@
+import pytest
+from src.application.services.reranking import MultiFactorScorer, RerankConfig, RerankWeights
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+from src.domain.value_objects.entities import PriceRange
+
+
+def make_context(name, price, relevance, rating=None, stock_quantity=0):
+    return RetrievedContext(
+        product=Product(
+            name=name,
+            description=f"{name} description",
+            category="Headphones",
+            price=price,
+            rating=rating,
+            stock_quantity=stock_quantity
+        ),
+        relevance_score=relevance
+    )
+
+@pytest.fixture
+def contexts():
+    return [
+        make_context("Budget", 40.0, 0.6, rating=4.0),
+        make_context("Mid", 150.0, 0.7, rating=4.5),
+        make_context("Premium", 400.0, 0.9, rating=4.8),
+        make_context("Luxury", 900.0, 0.95, rating=5.0)
+    ]
+
+
+def test_default_price_curve_matches_step_function(contexts):
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=0.0, price=1.0, rating=0.0)))
+
+    scores = scorer.score(contexts)
+
+    assert list(scores) == pytest.approx([1.0, 0.8, 0.6, 0.4])
+
+def test_price_curve_boundaries_are_inclusive():
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=0.0, price=1.0, rating=0.0)))
+
+    scores = scorer.score([make_context("A", 50.0, 0.5), make_context("B", 200.0, 0.5)])
+
+    assert list(scores) == pytest.approx([1.0, 0.8])
+
+def test_weighted_score_combines_factors(contexts):
+    scores = MultiFactorScorer().score(contexts)
+
+    assert scores[2] == pytest.approx(0.9 * 0.7 + 0.6 * 0.2 + (4.8 / 5.0) * 0.1)
+
+def test_price_range_scores_relative_to_user_budget(contexts):
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=0.0, price=1.0, rating=0.0)))
+
+    scores = scorer.score(contexts, price_range=PriceRange(min_price=100.0, max_price=200.0))
+
+    assert list(scores) == pytest.approx([0.0, 1.0, 0.0, 0.0])
+    assert scorer.score([make_context("Close", 225.0, 0.5)], price_range=PriceRange(min_price=100.0, max_price=200.0))[0] == pytest.approx(0.5)
+
+def test_rerank_top_n_returns_best_in_order(contexts):
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=1.0, price=0.0, rating=0.0)))
+
+    ranked = scorer.rerank(contexts, top_n=2)
+
+    assert [ctx.product.name for ctx in ranked] == ["Luxury", "Premium"]
+
+def test_rerank_uses_external_relevance_scores(contexts):
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=1.0, price=0.0, rating=0.0)))
+
+    ranked = scorer.rerank(contexts, relevance_scores=[0.9, 0.1, 0.2, 0.3])
+
+    assert ranked[0].product.name == "Budget"
+
+def test_stock_weight_prefers_available_products():
+    scorer = MultiFactorScorer(RerankConfig(weights=RerankWeights(relevance=0.5, price=0.0, rating=0.0, stock=0.5)))
+
+    ranked = scorer.rerank([
+        make_context("Sold out", 100.0, 0.8, stock_quantity=0),
+        make_context("In stock", 100.0, 0.7, stock_quantity=20)
+    ])
+
+    assert ranked[0].product.name == "In stock"
+
+def test_config_rejects_mismatched_curve():
+    with pytest.raises(ValueError):
+        RerankConfig(price_breakpoints=[100.0], price_scores=[1.0])
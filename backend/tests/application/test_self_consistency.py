@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from src.domain.models.product import Product
+from src.domain.models.rag import RetrievedContext
+from src.application.services.self_consistency import (
+    SelfConsistencySampler,
+    agreement_scores,
+    mentioned_product_ids
+)
+
+
+@pytest.fixture
+def contexts():
+    names = ["iPhone 15", "iPhone 15 Case", "Galaxy S24"]
+    return [
+        RetrievedContext(
+            product=Product(name=name, category="Phones", price=99.0, description=name),
+            relevance_score=0.9
+        )
+        for name in names
+    ]
+
+
+def scripted(responses):
+    queue = list(responses)
+
+    async def generate():
+        delay, text = queue.pop(0)
+        await asyncio.sleep(delay)
+        return text
+
+    return generate
+
+
+def test_mentioned_product_ids_prefers_longest_names(contexts):
+    ids = mentioned_product_ids("Get the iPhone 15 case", contexts)
+
+    assert ids == frozenset({str(contexts[1].product.id)})
+
+def test_agreement_scores_use_jaccard_overlap():
+    scores = agreement_scores([frozenset({"a"}), frozenset({"a"}), frozenset({"a", "b"})])
+
+    assert scores == pytest.approx([0.75, 0.75, 0.5])
+
+@pytest.mark.asyncio
+async def test_sampler_runs_concurrently_and_cancels_after_quorum(contexts):
+    sampler = SelfConsistencySampler(samples=3, max_concurrency=3)
+    generate = scripted([(0.01, "iPhone 15"), (0.02, "The iPhone 15"), (5.0, "Galaxy S24")])
+
+    response, stats = await asyncio.wait_for(sampler.sample(generate, contexts), timeout=1.0)
+
+    assert response == "iPhone 15"
+    assert stats.early_exit is True
+    assert stats.samples_cancelled == 1
+    assert stats.agreed_product_ids == [str(contexts[0].product.id)]
+    assert stats.latency_spread >= 0.0
+
+@pytest.mark.asyncio
+async def test_sampler_picks_highest_agreement_without_quorum(contexts):
+    sampler = SelfConsistencySampler(samples=3, max_concurrency=1)
+    generate = scripted([(0, "Galaxy S24"), (0, "iPhone 15 and Galaxy S24"), (0, "iPhone 15")])
+
+    response, stats = await sampler.sample(generate, contexts)
+
+    assert response == "iPhone 15 and Galaxy S24"
+    assert stats.early_exit is False
+    assert stats.samples_completed == 3
+    assert sampler.metrics.early_exit_rate == 0.0
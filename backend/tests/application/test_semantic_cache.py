@@ -0,0 +1,135 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.domain.models.product import Product
+from src.domain.models.rag import RAGRequest, RAGResponse, RetrievedContext
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.application.services.semantic_cache import SemanticAnswerCache, SemanticCacheConfig
+
+EMBEDDINGS = {
+    "wireless headphones under 200": [1.0, 0.0, 0.0],
+    "bluetooth headphones below $200": [0.98, 0.1, 0.0],
+    "gaming laptop": [0.0, 1.0, 0.0],
+}
+
+
+@pytest.fixture
+def embedding_service():
+    service = Mock()
+    service.embed_text = AsyncMock(side_effect=lambda text: EMBEDDINGS[text])
+    return service
+
+
+def make_response(query):
+    product = Product(name="Sony WH-CH720N", description="Headphones", category="Headphones", price=149.0)
+    return RAGResponse(
+        query=query,
+        recommended_products=[product],
+        context_used=[RetrievedContext(product=product, relevance_score=0.9)],
+        confidence_score=0.8,
+        model_used="llama2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_query_hits(embedding_service):
+    cache = SemanticAnswerCache(embedding_service)
+    first = RAGRequest(query="wireless headphones under 200")
+    lookup = await cache.lookup(first)
+    cache.store(lookup, first.query, make_response(first.query))
+
+    hit = await cache.lookup(RAGRequest(query="bluetooth headphones below $200"))
+
+    assert hit.response is not None
+    assert hit.response.query == "bluetooth headphones below $200"
+    assert hit.response.metadata["semantic_cache"]["matched_query"] == "wireless headphones under 200"
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.audit_log[0].outcome == "hit"
+
+@pytest.mark.asyncio
+async def test_dissimilar_query_or_different_filters_miss(embedding_service):
+    cache = SemanticAnswerCache(embedding_service)
+    request = RAGRequest(query="wireless headphones under 200", filters={"brand": "Sony"})
+    cache.store(await cache.lookup(request), request.query, make_response(request.query))
+
+    unrelated = await cache.lookup(RAGRequest(query="gaming laptop", filters={"brand": "Sony"}))
+    other_filters = await cache.lookup(RAGRequest(query="wireless headphones under 200", filters={"brand": "Bose"}))
+
+    assert unrelated.response is None
+    assert other_filters.response is None
+
+@pytest.mark.asyncio
+async def test_catalog_generation_change_invalidates(embedding_service):
+    generation = {"value": 1}
+    cache = SemanticAnswerCache(embedding_service, generation=lambda: generation["value"])
+    request = RAGRequest(query="wireless headphones under 200")
+    cache.store(await cache.lookup(request), request.query, make_response(request.query))
+
+    generation["value"] = 2
+
+    assert (await cache.lookup(request)).response is None
+    assert cache.stats.entries == 0
+
+@pytest.mark.asyncio
+async def test_lru_eviction(embedding_service):
+    cache = SemanticAnswerCache(embedding_service, SemanticCacheConfig(max_entries=1))
+    for query in ["wireless headphones under 200", "gaming laptop"]:
+        request = RAGRequest(query=query)
+        cache.store(await cache.lookup(request), query, make_response(query))
+
+    assert cache.stats.evictions == 1
+    assert (await cache.lookup(RAGRequest(query="wireless headphones under 200"))).response is None
+
+@pytest.mark.asyncio
+async def test_flagged_false_hit_is_evicted_and_audited(embedding_service):
+    cache = SemanticAnswerCache(embedding_service)
+    request = RAGRequest(query="wireless headphones under 200")
+    cache.store(await cache.lookup(request), request.query, make_response(request.query))
+    hit = await cache.lookup(RAGRequest(query="bluetooth headphones below $200"))
+
+    assert cache.flag_false_hit(hit.audit_id)
+    assert cache.stats.false_hits == 1
+    assert [entry.outcome for entry in cache.audit_log] == ["hit", "false_hit"]
+    assert (await cache.lookup(request)).response is None
+
+@pytest.mark.asyncio
+async def test_pipeline_serves_cached_answers_and_reuses_embedding(embedding_service):
+    retrieval = Mock()
+    retrieval.retrieve_context = AsyncMock(return_value=make_response("q").context_used)
+    llm_client = Mock()
+    llm_client.generate = AsyncMock(return_value="The Sony WH-CH720N is a great pick")
+    pipeline = RAGPipeline(
+        retrieval,
+        llm_client,
+        RAGPipelineConfig(),
+        answer_cache=SemanticAnswerCache(embedding_service)
+    )
+
+    await pipeline.process_query(RAGRequest(query="wireless headphones under 200", response_mode="generate"))
+    cached = await pipeline.process_query(RAGRequest(query="bluetooth headphones below $200", response_mode="generate"))
+
+    assert llm_client.generate.call_count == 1
+    assert "semantic_cache" in cached.metadata
+    forwarded = retrieval.retrieve_context.call_args[0][1]
+    assert forwarded.query_embedding == EMBEDDINGS["wireless headphones under 200"]
+
+@pytest.mark.asyncio
+async def test_follow_up_turns_are_keyed_on_rewritten_query_and_filters(embedding_service):
+    cache = SemanticAnswerCache(embedding_service)
+    first = RAGRequest(
+        query="wireless headphones under 200",
+        conversation_context="user: show me headphones\nassistant: Here are some options",
+        filters={"brand": "Sony"}
+    )
+    cache.store(await cache.lookup(first), first.query, make_response(first.query))
+
+    hit = await cache.lookup(RAGRequest(
+        query="bluetooth headphones below $200",
+        conversation_context="user: any wireless ones?",
+        filters={"brand": "Sony"}
+    ))
+
+    assert cache.cacheable(first)
+    assert hit.response is not None
+    assert not SemanticAnswerCache(embedding_service, SemanticCacheConfig(cache_follow_ups=False)).cacheable(first)
+
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from src.application.services.similar_products import SimilarProductsService
+from src.domain.models.product import Product
+from src.infrastructure.vector_store.neighbor_graph import NeighborGraph, NeighborGraphConfig
+
+
+@pytest.fixture
+def products():
+    return [
+        Product(name=f"Product {i}", description="d", category="Audio", price=10.0 + i)
+        for i in range(3)
+    ]
+
+@pytest.fixture
+def mock_vector_repository(products):
+    repo = Mock()
+    repo.get_embeddings = AsyncMock(return_value=(
+        [str(p.id) for p in products],
+        np.array([[1.0, 0.0], [0.95, 0.05], [0.0, 1.0]])
+    ))
+
+    async def get_products(ids):
+        by_id = {str(p.id): p for p in products}
+        return [by_id[i] for i in ids]
+
+    repo.get_products = AsyncMock(side_effect=get_products)
+    return repo
+
+@pytest.fixture
+def service(mock_vector_repository):
+    return SimilarProductsService(mock_vector_repository, NeighborGraph(NeighborGraphConfig(k=2)))
+
+
+@pytest.mark.asyncio
+async def test_find_similar_uses_graph_built_by_refresh(service, mock_vector_repository, products):
+    assert await service.find_similar(str(products[0].id)) == []
+    mock_vector_repository.get_embeddings.assert_not_called()
+
+    assert await service.refresh() == 3
+    results = await service.find_similar(str(products[0].id), limit=1)
+
+    mock_vector_repository.get_embeddings.assert_called_once_with()
+    assert [r.product.name for r in results] == ["Product 1"]
+    assert 0.9 < results[0].score <= 1.0
+
+@pytest.mark.asyncio
+async def test_find_similar_reuses_graph(service, mock_vector_repository, products):
+    await service.refresh()
+    await service.find_similar(str(products[0].id))
+    await service.find_similar(str(products[1].id))
+
+    mock_vector_repository.get_embeddings.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_index_products_adds_incrementally(service, mock_vector_repository, products):
+    await service.refresh()
+    new_id = str(uuid4())
+    mock_vector_repository.get_embeddings.return_value = ([new_id], np.array([[0.0, 0.99]]))
+
+    await service.index_products([new_id])
+
+    mock_vector_repository.get_embeddings.assert_called_with([new_id])
+    assert await service.has_product(new_id)
+
+@pytest.mark.asyncio
+async def test_unknown_product(service):
+    assert await service.has_product("missing") is False
+    assert await service.find_similar("missing") == []
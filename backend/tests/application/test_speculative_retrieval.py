@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+from uuid import uuid4
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.models.memory import MemoryConfig
+from src.domain.models.rag import RAGRequest
+from src.domain.models.search_result import CandidatePool, SearchHit
+from src.application.services.context_retrieval import RetrievalConfig, VectorSearchStrategy
+from src.application.services.conversation_manager import ConversationManager, ConversationManagerConfig
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.application.services.speculative_retrieval import SpeculationConfig, SpeculativeRetriever
+from src.infrastructure.conversation.in_memory_state_repository import InMemoryStateRepository
+from src.infrastructure.conversation.in_memory_memory_repository import InMemoryMemoryRepository
+
+
+def make_hits(count):
+    return [
+        SearchHit(f"p{i}", 0.95 - i * 0.01, f"doc {i}", {
+            "name": f"P{i}",
+            "category": "Headphones",
+            "brand": "Sony" if i % 2 == 0 else "Bose",
+            "price": 100.0 + i
+        })
+        for i in range(count)
+    ]
+
+
+def make_intent(intent_type):
+    intent = Mock()
+    intent.intent_type = intent_type
+    intent.entities = []
+    return intent
+
+
+@pytest.fixture
+def vector_repository():
+    repository = Mock()
+    repository.search_hits = AsyncMock(return_value=make_hits(3))
+    return repository
+
+
+@pytest.fixture
+def embedding_service():
+    service = Mock()
+    service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    return service
+
+
+@pytest.fixture
+def llm_client():
+    client = Mock()
+    client.generate = AsyncMock(return_value="Try P0")
+    return client
+
+
+@pytest.fixture
+def rag_pipeline(vector_repository, embedding_service, llm_client):
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(diversity_method="none"))
+    return RAGPipeline(strategy, llm_client, RAGPipelineConfig())
+
+
+async def make_manager(intent_detector, rag_pipeline, retriever):
+    manager = ConversationManager(
+        state_repository=InMemoryStateRepository(),
+        memory_repository=InMemoryMemoryRepository(),
+        intent_detector=intent_detector,
+        rag_pipeline=rag_pipeline,
+        config=ConversationManagerConfig(memory_config=MemoryConfig()),
+        speculative_retriever=retriever
+    )
+    state = await manager.start_conversation(uuid4())
+    return manager, state.conversation_id
+
+
+@pytest.mark.asyncio
+async def test_strategy_refines_candidate_pool_without_searching(vector_repository, embedding_service):
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(diversity_method="none"))
+    request = RAGRequest(
+        query="headphones",
+        max_results=2,
+        filters={"brand": "Sony"},
+        query_embedding=[0.1, 0.2],
+        candidate_pool=CandidatePool(make_hits(20), exhaustive=False)
+    )
+
+    contexts = await strategy.retrieve_context("headphones", request)
+
+    assert [ctx.product.name for ctx in contexts] == ["P0", "P2"]
+    vector_repository.search_hits.assert_not_called()
+    embedding_service.embed_text.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_strategy_searches_when_pool_is_too_thin(vector_repository, embedding_service):
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(diversity_method="none"))
+    request = RAGRequest(
+        query="headphones",
+        max_results=2,
+        filters={"brand": "Sony"},
+        candidate_pool=CandidatePool(make_hits(2), exhaustive=False)
+    )
+
+    await strategy.retrieve_context("headphones", request)
+
+    assert vector_repository.search_hits.call_args.kwargs["filters"] == {"brand": "Sony"}
+
+@pytest.mark.asyncio
+async def test_speculation_overlaps_intent_detection(vector_repository, embedding_service, rag_pipeline):
+    retriever = SpeculativeRetriever(embedding_service, vector_repository, SpeculationConfig(candidate_pool=10))
+
+    async def detect_intent(message):
+        await asyncio.sleep(0)
+        assert embedding_service.embed_text.await_count == 1
+        return make_intent("SEARCH_PRODUCT")
+
+    detector = Mock()
+    detector.detect_intent = AsyncMock(side_effect=detect_intent)
+    manager, conversation_id = await make_manager(detector, rag_pipeline, retriever)
+
+    response, state = await manager.process_message(conversation_id, "sony headphones")
+
+    assert "P0" in response
+    assert embedding_service.embed_text.await_count == 1
+    assert vector_repository.search_hits.await_count == 1
+    assert vector_repository.search_hits.call_args.kwargs["filters"] is None
+    assert retriever.metrics.used == 1
+    assert len(state.context.recommended_products) == 3
+
+@pytest.mark.asyncio
+async def test_greeting_cancels_speculation(vector_repository, embedding_service, rag_pipeline, llm_client):
+    async def slow_embed(text):
+        await asyncio.sleep(10)
+        return [0.1, 0.2]
+
+    embedding_service.embed_text = AsyncMock(side_effect=slow_embed)
+    retriever = SpeculativeRetriever(embedding_service, vector_repository)
+    detector = Mock()
+    detector.detect_intent = AsyncMock(return_value=make_intent("GREETING"))
+    manager, conversation_id = await make_manager(detector, rag_pipeline, retriever)
+
+    response, _ = await manager.process_message(conversation_id, "hello there")
+    await asyncio.sleep(0)
+
+    assert response.startswith("Hello")
+    assert retriever.metrics.cancelled == 1
+    assert retriever.metrics.waste_rate == 1.0
+    vector_repository.search_hits.assert_not_called()
+    llm_client.generate.assert_not_called()
@@ -0,0 +1,76 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from src.domain.models.product import Product
+from src.domain.models.rag import RAGRequest, RetrievedContext
+from src.application.services.rag_pipeline import RAGPipeline, RAGPipelineConfig
+from src.application.services.structured_output import (
+    parse_structured_recommendation,
+    render_structured_reasoning
+)
+
+
+@pytest.fixture
+def contexts():
+    return [
+        RetrievedContext(
+            product=Product(name=name, description="Headphones", category="Headphones", price=price),
+            relevance_score=score
+        )
+        for name, price, score in [("Sony XM5", 399.0, 0.8), ("Bose QC45", 329.0, 0.78), ("JBL Tune", 99.0, 0.7)]
+    ]
+
+
+def test_parses_ids_and_positions_in_llm_order(contexts):
+    bose_id = str(contexts[1].product.id)
+    raw = json.dumps({
+        "recommendations": [
+            {"product_id": bose_id, "reason": "Most comfortable"},
+            {"product_id": "Product 3", "reason": "Best value"},
+            {"product_id": bose_id, "reason": "duplicate"},
+            {"product_id": "not-retrieved", "reason": "hallucinated"}
+        ],
+        "summary": "Bose for comfort, JBL on a budget."
+    })
+
+    result = parse_structured_recommendation(raw, contexts)
+
+    assert result.product_ids == [bose_id, str(contexts[2].product.id)]
+    assert result.reasons[bose_id] == "Most comfortable"
+    assert result.invalid_ids == ["not-retrieved"]
+    assert not result.used_fallback
+    assert render_structured_reasoning(result, contexts).splitlines() == [
+        "Bose for comfort, JBL on a budget.",
+        "1. Bose QC45 - Most comfortable",
+        "2. JBL Tune - Best value"
+    ]
+
+def test_extracts_json_wrapped_in_prose(contexts):
+    raw = 'Sure! {"recommendations": [{"product_id": "1", "reason": "Top ANC"}]} Hope that helps.'
+
+    assert parse_structured_recommendation(raw, contexts).product_ids == [str(contexts[0].product.id)]
+
+@pytest.mark.parametrize("raw", ["not json at all", '{"recommendations": "nope"}', '{"recommendations": [{"product_id": "9"}]}'])
+def test_falls_back_to_retrieval_order(contexts, raw):
+    result = parse_structured_recommendation(raw, contexts)
+
+    assert result.used_fallback
+    assert result.product_ids == [str(ctx.product.id) for ctx in contexts]
+
+@pytest.mark.asyncio
+async def test_pipeline_returns_ranked_ids_from_structured_output(contexts):
+    retrieval = Mock()
+    retrieval.retrieve_context = AsyncMock(return_value=contexts)
+    llm_client = Mock()
+    llm_client.generate = AsyncMock(return_value=json.dumps({
+        "recommendations": [{"product_id": "2", "reason": "Comfortable for long flights"}]
+    }))
+    pipeline = RAGPipeline(retrieval, llm_client, RAGPipelineConfig(structured_output=True))
+
+    response = await pipeline.process_query(RAGRequest(query="headphones for travel", response_mode="generate"))
+
+    assert llm_client.generate.call_args.kwargs["format"] == "json"
+    assert response.ranked_product_ids == [str(contexts[1].product.id)]
+    assert [product.name for product in response.recommended_products] == ["Bose QC45"]
+    assert response.product_reasons == {str(contexts[1].product.id): "Comfortable for long flights"}
+    assert response.metadata["structured"]["fallback_reason"] is None
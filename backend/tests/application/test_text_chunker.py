@@ -111,4 +111,13 @@ def test_chunk_preserves_content():
             overlap_start = max(0, len(combined_unique_text) - 10)
             combined_unique_text += chunk.text[10:] if len(chunk.text) > 10 else ""
     
-    assert len(chunks) > 0
\ No newline at end of file
+    assert len(chunks) > 0
+
+
+def test_chunk_long_text_terminates_at_end(small_chunker):
+    text = "word " * 40
+
+    chunks = small_chunker.chunk_text(text)
+
+    assert chunks[-1].end_index == len(text)
+    assert len(chunks) < 10
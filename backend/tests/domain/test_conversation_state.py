@@ -127,6 +127,18 @@ class TestConversationState:
         state.add_recommended_product(product_id_1)
         assert len(state.context.recommended_products) == 2
 
+    def test_set_ranking_replaces_previous_turn(self):
+        state = ConversationState(
+            conversation_id=uuid4(),
+            user_id=uuid4()
+        )
+        
+        state.set_ranking(["p1", "p2"], {"p1": "Best battery life"})
+        state.set_ranking(["p3"], {})
+        
+        assert state.context.ranked_product_ids == ["p3"]
+        assert state.context.product_reasons == {}
+
     def test_mark_completed(self):
         state = ConversationState(
             conversation_id=uuid4(),
@@ -0,0 +1,77 @@
+import pytest
+from uuid import uuid4
+from src.domain.models.search_result import SearchHit, SearchResult
+from src.domain.models.product import Product
+
+
+@pytest.fixture
+def metadata():
+    return {
+        "name": "Wireless Headphones",
+        "category": "Electronics",
+        "price": 199.99,
+        "brand": "AudioTech",
+        "features": "wireless,bluetooth",
+        "rating": 4.5,
+        "stock_quantity": 3
+    }
+
+
+def test_search_hit_is_slotted(metadata):
+    hit = SearchHit("prod-1", 0.9, "Great headphones", metadata)
+
+    with pytest.raises(AttributeError):
+        hit.extra = True
+
+def test_search_hit_metadata_is_read_only_view(metadata):
+    hit = SearchHit("prod-1", 0.9, "Great headphones", metadata)
+
+    with pytest.raises(TypeError):
+        hit.metadata["price"] = 1.0
+    assert hit.category == "Electronics"
+    assert hit.brand == "AudioTech"
+    assert hit.price == 199.99
+
+def test_to_product_builds_product_without_validation(metadata):
+    product_id = str(uuid4())
+    hit = SearchHit(product_id, 0.9, "Great headphones", metadata)
+
+    product = hit.to_product()
+
+    assert isinstance(product, Product)
+    assert str(product.id) == product_id
+    assert product.features == ["wireless", "bluetooth"]
+    assert product.rating == 4.5
+    assert product.stock_quantity == 3
+    assert product.tags == []
+
+def test_to_product_keeps_non_uuid_ids(metadata):
+    product = SearchHit("prod-1", 0.9, "Great headphones", metadata).to_product()
+
+    assert product.id == "prod-1"
+
+def test_empty_brand_maps_to_none(metadata):
+    metadata["brand"] = ""
+    hit = SearchHit("prod-1", 0.9, "doc", metadata)
+
+    assert hit.brand is None
+    assert hit.to_product().brand is None
+
+def test_to_search_result(metadata):
+    result = SearchHit("prod-1", 0.75, "doc", metadata).to_search_result()
+
+    assert isinstance(result, SearchResult)
+    assert result.score == 0.75
+    assert result.chunk_text == "doc"
+    assert result.metadata["name"] == "Wireless Headphones"
+
+
+def test_merge_search_hits_keeps_best_score_per_product(metadata):
+    from src.domain.models.search_result import merge_search_hits
+
+    merged = merge_search_hits([
+        [SearchHit("a", 0.9, "doc", metadata), SearchHit("b", 0.5, "doc", metadata)],
+        [SearchHit("b", 0.8, "doc", metadata), SearchHit("c", 0.4, "doc", metadata)]
+    ], top_k=2)
+
+    assert [(hit.product_id, hit.score) for hit in merged] == [("a", 0.9), ("b", 0.8)]
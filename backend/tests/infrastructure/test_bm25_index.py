@@ -0,0 +1,84 @@
+import pytest
+from src.infrastructure.lexical.bm25_index import BM25Index, BM25Config, tokenize
+from src.domain.models.product import Product
+
+
+@pytest.fixture
+def products():
+    return [
+        Product(
+            name="Sony WH-1000XM5",
+            description="Premium noise-canceling wireless headphones",
+            category="Headphones",
+            price=399.99,
+            brand="Sony"
+        ),
+        Product(
+            name="Sony WH-CH520",
+            description="Affordable wireless on-ear headphones",
+            category="Headphones",
+            price=59.99,
+            brand="Sony"
+        ),
+        Product(
+            name="Trail Runner 2",
+            description="Lightweight running shoes for trails",
+            category="Sports",
+            price=129.99,
+            brand="SportX"
+        )
+    ]
+
+@pytest.fixture
+def index(products):
+    index = BM25Index()
+    index.add_products(products)
+    return index
+
+
+def test_tokenize_keeps_model_numbers():
+    tokens = tokenize("Sony WH-1000XM5 headphones")
+
+    assert "wh-1000xm5" in tokens
+    assert "wh1000xm5" in tokens
+    assert "1000xm5" in tokens
+    assert "headphones" in tokens
+
+def test_exact_model_number_ranks_first(index, products):
+    results = index.search("WH-1000XM5", top_k=3)
+
+    assert results[0][0] == str(products[0].id)
+    assert results[0][1] > 0.0
+
+def test_unknown_terms_return_nothing(index):
+    assert index.search("laptop") == []
+
+def test_remove_excludes_document(index, products):
+    assert index.remove(str(products[0].id)) is True
+
+    results = index.search("WH-1000XM5")
+
+    assert str(products[0].id) not in [product_id for product_id, _ in results]
+    assert len(index) == 2
+    assert index.get_product(str(products[0].id)) is None
+
+def test_remove_unknown_returns_false(index):
+    assert index.remove("missing") is False
+
+def test_readding_product_replaces_document(index, products):
+    updated = products[2].model_copy(update={"description": "Waterproof trail shoes"})
+
+    index.add_product(updated)
+
+    assert len(index) == 3
+    assert index.search("waterproof")[0][0] == str(updated.id)
+
+def test_compaction_preserves_results(products):
+    index = BM25Index(BM25Config(compaction_ratio=0.3))
+    index.add_products(products)
+
+    index.remove(str(products[1].id))
+
+    assert len(index._slot_ids) == 2
+    assert index.search("running")[0][0] == str(products[2].id)
+    assert index.search("WH-1000XM5")[0][0] == str(products[0].id)
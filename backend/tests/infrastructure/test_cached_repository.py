@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from src.infrastructure.vector_store.cached_repository import (
+    CachingVectorRepository,
+    SearchCacheConfig
+)
+
+
+@pytest.fixture
+def inner_repository():
+    repo = Mock()
+    repo.generation = 0
+    repo.search = AsyncMock(return_value=["result"])
+
+    async def bump(*args, **kwargs):
+        repo.generation += 1
+
+    repo.add_products = AsyncMock(side_effect=bump)
+    repo.delete_product = AsyncMock(side_effect=bump)
+    return repo
+
+@pytest.fixture
+def cached_repo(inner_repository):
+    return CachingVectorRepository(inner_repository, SearchCacheConfig(max_entries=2))
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache(cached_repo, inner_repository):
+    await cached_repo.search([0.1, 0.2], top_k=5, filters={"category": "Audio"})
+    results = await cached_repo.search([0.1, 0.2], top_k=5, filters={"category": "Audio"})
+
+    assert results == ["result"]
+    inner_repository.search.assert_called_once()
+    assert cached_repo.stats.hits == 1
+    assert cached_repo.stats.hit_rate == 0.5
+
+@pytest.mark.asyncio
+async def test_quantization_merges_near_identical_embeddings(cached_repo, inner_repository):
+    await cached_repo.search([0.123412, -0.00001])
+    await cached_repo.search([0.123398, 0.00001])
+
+    inner_repository.search.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_different_top_k_or_filters_miss(cached_repo, inner_repository):
+    await cached_repo.search([0.1], top_k=5)
+    await cached_repo.search([0.1], top_k=10)
+    await cached_repo.search([0.1], top_k=5, filters={"brand": "Sony"})
+
+    assert inner_repository.search.call_count == 3
+
+@pytest.mark.asyncio
+async def test_writes_bump_generation_and_invalidate(cached_repo, inner_repository):
+    await cached_repo.search([0.1])
+    await cached_repo.add_products([Mock()])
+    await cached_repo.search([0.1])
+
+    assert inner_repository.search.call_count == 2
+    assert cached_repo.generation == 1
+
+@pytest.mark.asyncio
+async def test_writes_that_bypass_the_cache_still_invalidate(cached_repo, inner_repository):
+    await cached_repo.search([0.1])
+    inner_repository.generation += 1
+    await cached_repo.search([0.1])
+
+    assert inner_repository.search.call_count == 2
+
+@pytest.mark.asyncio
+async def test_lru_eviction(cached_repo):
+    await cached_repo.search([0.1])
+    await cached_repo.search([0.2])
+    await cached_repo.search([0.3])
+
+    assert cached_repo.stats.evictions == 1
+    assert cached_repo.stats.entries == 2
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(inner_repository):
+    repo = CachingVectorRepository(inner_repository, SearchCacheConfig(ttl_seconds=10))
+    with patch("src.infrastructure.vector_store.cached_repository.time.monotonic") as clock:
+        clock.return_value = 100.0
+        await repo.search([0.1])
+        clock.return_value = 111.0
+        await repo.search([0.1])
+
+    assert inner_repository.search.call_count == 2
+    assert repo.stats.expirations == 1
+
+@pytest.mark.asyncio
+async def test_search_many_fetches_only_uncached_queries(cached_repo, inner_repository):
+    inner_repository.search_hits = AsyncMock(return_value=["a"])
+    inner_repository.search_many = AsyncMock(return_value=[["b"]])
+    await cached_repo.search_hits([0.1, 0.2], top_k=3)
+
+    results = await cached_repo.search_many([[0.1, 0.2], [0.3, 0.4]], top_k=3)
+
+    assert results == [["a"], ["b"]]
+    inner_repository.search_many.assert_called_once_with(
+        query_embeddings=[[0.3, 0.4]], top_k=3, filters=None, include_embeddings=False
+    )
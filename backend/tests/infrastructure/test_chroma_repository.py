@@ -138,10 +138,16 @@ async def test_search_empty_results(config, mock_chroma_client, mock_collection)
 
 @pytest.mark.asyncio
 async def test_delete_product(config, mock_chroma_client, mock_collection):
+    mock_collection.get.return_value = {"ids": ["prod-1"]}
     repo = ChromaVectorRepository(config)
     
     await repo.delete_product("prod-1")
     
+    mock_collection.delete.assert_not_called()
+    assert repo.tombstone_count == 1
+    
+    await repo.compact()
+    
     mock_collection.delete.assert_called_once_with(ids=["prod-1"])
 
 @pytest.mark.asyncio
@@ -169,3 +175,397 @@ async def test_search_score_normalization(config, mock_chroma_client, mock_colle
     
     assert results[0].score >= 0.0
     assert results[0].score <= 1.0
+
+@pytest.mark.asyncio
+async def test_search_prefilters_with_metadata_index(config, mock_chroma_client, mock_collection):
+    from uuid import uuid4
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+
+    products = [
+        Product(name="Cheap", description="Cheap item", category="Audio", price=20.0),
+        Product(name="Pricey", description="Pricey item", category="Audio", price=500.0)
+    ]
+    index = ColumnarMetadataIndex()
+    index.upsert(products)
+    mock_collection.get.return_value = {
+        "ids": [str(products[0].id)],
+        "embeddings": [[1.0, 0.0]],
+        "documents": ["Cheap item"],
+        "metadatas": [{"name": "Cheap", "category": "Audio", "price": 20.0, "brand": "", "features": ""}]
+    }
+
+    repo = ChromaVectorRepository(config, metadata_index=index)
+    results = await repo.search([1.0, 0.0], top_k=5, filters={"price": {"$lte": 100}})
+
+    mock_collection.get.assert_called_once()
+    assert mock_collection.get.call_args[1]["ids"] == [str(products[0].id)]
+    mock_collection.query.assert_not_called()
+    assert results[0].score == pytest.approx(1.0)
+
+@pytest.mark.asyncio
+async def test_search_prefilter_empty_skips_collection(config, mock_chroma_client, mock_collection):
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+
+    repo = ChromaVectorRepository(config, metadata_index=ColumnarMetadataIndex())
+    results = await repo.search([0.1], filters={"brand": "Nobody"})
+
+    assert results == []
+    mock_collection.query.assert_not_called()
+
+@pytest.fixture
+def uuid_product():
+    return Product(
+        name="Desk Lamp",
+        description="LED desk lamp with dimmer",
+        category="Home",
+        price=39.99,
+        stock_quantity=10
+    )
+
+@pytest.mark.asyncio
+async def test_search_filters_tombstoned_products(config, mock_chroma_client, mock_collection):
+    mock_collection.query.return_value = {
+        "ids": [["prod-1", "prod-2"]],
+        "documents": [["Doc 1", "Doc 2"]],
+        "metadatas": [[
+            {"name": "One", "category": "Test", "price": 10.0, "brand": "", "features": ""},
+            {"name": "Two", "category": "Test", "price": 12.0, "brand": "", "features": ""}
+        ]],
+        "distances": [[0.1, 0.2]]
+    }
+    mock_collection.get.return_value = {"ids": ["prod-1"]}
+    repo = ChromaVectorRepository(config)
+    await repo.delete_product("prod-1")
+
+    results = await repo.search([0.1], top_k=1)
+
+    assert mock_collection.query.call_args[1]["n_results"] == 2
+    assert [r.product.name for r in results] == ["Two"]
+
+@pytest.mark.asyncio
+async def test_upsert_new_product_embeds_document(config, mock_chroma_client, mock_collection, uuid_product):
+    mock_collection.get.return_value = {"ids": [], "metadatas": []}
+    repo = ChromaVectorRepository(config)
+
+    summary = await repo.upsert_products([uuid_product])
+
+    assert summary.inserted == 1
+    mock_collection.upsert.assert_called_once()
+    mock_collection.update.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_upsert_unchanged_text_updates_metadata_only(config, mock_chroma_client, mock_collection, uuid_product):
+    repo = ChromaVectorRepository(config)
+    await repo.add_products([uuid_product])
+    repriced = uuid_product.model_copy(update={"price": 29.99})
+
+    summary = await repo.upsert_products([repriced])
+
+    assert summary.metadata_only == 1
+    mock_collection.upsert.assert_not_called()
+    assert mock_collection.update.call_args[1]["metadatas"][0]["price"] == 29.99
+
+@pytest.mark.asyncio
+async def test_upsert_changed_text_reembeds(config, mock_chroma_client, mock_collection, uuid_product):
+    mock_collection.get.return_value = {
+        "ids": [str(uuid_product.id)],
+        "metadatas": [{"content_hash": "stale"}]
+    }
+    repo = ChromaVectorRepository(config)
+
+    summary = await repo.upsert_products([uuid_product])
+
+    assert summary.reembedded == 1
+    mock_collection.upsert.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_apply_deltas_updates_metadata_and_index(config, mock_chroma_client, mock_collection, uuid_product):
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+
+    index = ColumnarMetadataIndex()
+    repo = ChromaVectorRepository(config, metadata_index=index)
+    await repo.add_products([uuid_product])
+    generation = repo.generation
+
+    updated = await repo.apply_deltas({str(uuid_product.id): {"price": 19.99, "stock_quantity": 0}})
+
+    assert updated == 1
+    mock_collection.update.assert_called_once_with(
+        ids=[str(uuid_product.id)],
+        metadatas=[{"price": 19.99, "stock_quantity": 0}]
+    )
+    assert index.count({"price": {"$lt": 20}}) == 1
+    assert repo.generation == generation + 1
+
+@pytest.mark.asyncio
+async def test_apply_delta_rejects_document_fields(config, mock_chroma_client, mock_collection):
+    repo = ChromaVectorRepository(config)
+
+    with pytest.raises(ValueError):
+        await repo.apply_delta("prod-1", {"description": "new text"})
+
+@pytest.mark.asyncio
+async def test_delete_unknown_product_is_ignored(config, mock_chroma_client, mock_collection):
+    mock_collection.get.return_value = {"ids": []}
+    mock_collection.count.return_value = 1
+    repo = ChromaVectorRepository(config)
+
+    await repo.delete_product("missing")
+    await repo.delete_product("missing")
+
+    assert repo.tombstone_count == 0
+    assert await repo.get_product_count() == 1
+
+@pytest.mark.asyncio
+async def test_apply_delta_rejects_embedded_fields(config, mock_chroma_client, mock_collection):
+    repo = ChromaVectorRepository(config)
+
+    with pytest.raises(ValueError):
+        await repo.apply_delta("prod-1", {"name": "Renamed"})
+
+@pytest.mark.asyncio
+async def test_background_compaction(mock_chroma_client, mock_collection):
+    import asyncio
+
+    mock_collection.get.return_value = {"ids": ["prod-1"]}
+    repo = ChromaVectorRepository(ChromaConfig(
+        compaction_interval_seconds=0.01,
+        compaction_min_tombstones=1
+    ))
+    await repo.delete_product("prod-1")
+
+    repo.start_background_compaction()
+    await asyncio.sleep(0.05)
+    await repo.stop_background_compaction()
+
+    mock_collection.delete.assert_called_once_with(ids=["prod-1"])
+    assert repo.tombstone_count == 0
+
+@pytest.fixture
+def chunk_collection():
+    collection = Mock()
+    collection.get.return_value = {"ids": [], "metadatas": []}
+    return collection
+
+@pytest.fixture
+def chunked_chroma_client(mock_collection, chunk_collection):
+    with patch('src.infrastructure.vector_store.chroma_repository.chromadb.Client') as mock_client:
+        client_instance = Mock()
+        client_instance.get_or_create_collection.side_effect = lambda name, metadata=None: (
+            chunk_collection if name.endswith("_chunks") else mock_collection
+        )
+        mock_client.return_value = client_instance
+        yield mock_client
+
+def chunk_results(rows):
+    return {
+        "ids": [[f"{parent}#{position}" for parent, position, _ in rows]],
+        "documents": [[f"chunk {position} of {parent}" for parent, position, _ in rows]],
+        "metadatas": [[
+            {"name": parent, "category": "Audio", "price": 10.0, "parent_id": parent, "chunk_position": position}
+            for parent, position, _ in rows
+        ]],
+        "distances": [[distance for _, _, distance in rows]]
+    }
+
+@pytest.mark.asyncio
+async def test_add_chunks_stores_parent_ids(config, chunked_chroma_client, chunk_collection, uuid_product):
+    repo = ChromaVectorRepository(config)
+    product_id = str(uuid_product.id)
+
+    written = await repo.add_chunks([uuid_product], [["first", "second", "third"]], [[0.1], [0.2], [0.3]])
+
+    assert written == 3
+    chunk_collection.delete.assert_called_once_with(where={"parent_id": {"$in": [product_id]}})
+    call_args = chunk_collection.add.call_args[1]
+    assert call_args["ids"] == [f"{product_id}#0", f"{product_id}#1", f"{product_id}#2"]
+    assert call_args["embeddings"] == [[0.1], [0.2], [0.3]]
+    assert {m["parent_id"] for m in call_args["metadatas"]} == {product_id}
+    assert [m["chunk_position"] for m in call_args["metadatas"]] == [0, 1, 2]
+
+@pytest.mark.asyncio
+async def test_search_chunk_hits_keeps_best_chunk_per_product(config, chunked_chroma_client, chunk_collection):
+    chunk_collection.query.return_value = chunk_results([
+        ("a", 2, 0.1), ("b", 0, 0.2), ("a", 0, 0.3), ("b", 1, 0.25), ("b", 2, 0.3)
+    ])
+    repo = ChromaVectorRepository(config)
+
+    best_max = await repo.search_chunk_hits([0.1, 0.2], top_k=2)
+    best_sum = await repo.search_chunk_hits([0.1, 0.2], top_k=2, aggregation="sum")
+
+    assert [hit.product_id for hit in best_max] == ["a", "b"]
+    assert best_max[0].document == "chunk 2 of a"
+    assert best_max[0].chunk_position == 2
+    assert [hit.product_id for hit in best_sum] == ["b", "a"]
+    assert chunk_collection.query.call_args[1]["n_results"] == 8
+
+@pytest.mark.asyncio
+async def test_search_chunk_hits_skips_deleted_parents(config, chunked_chroma_client, mock_collection, chunk_collection):
+    chunk_collection.query.return_value = chunk_results([("a", 0, 0.1), ("b", 0, 0.2)])
+    mock_collection.get.return_value = {"ids": ["a"]}
+    repo = ChromaVectorRepository(config)
+    await repo.add_chunks([], [], [])
+    await repo.delete_product("a")
+
+    hits = await repo.search_chunk_hits([0.1, 0.2], top_k=2)
+
+    assert [hit.product_id for hit in hits] == ["b"]
+
+@pytest.mark.asyncio
+async def test_compact_removes_chunks_of_deleted_products(config, chunked_chroma_client, chunk_collection, uuid_product):
+    repo = ChromaVectorRepository(config)
+    product_id = str(uuid_product.id)
+    await repo.add_products([uuid_product])
+    await repo.add_chunks([uuid_product], [["text"]], [[0.1]])
+    await repo.delete_product(product_id)
+
+    await repo.compact()
+
+    chunk_collection.delete.assert_called_with(where={"parent_id": {"$in": [product_id]}})
+
+@pytest.mark.asyncio
+async def test_search_many_issues_single_batched_query(config, mock_chroma_client, mock_collection):
+    metadata = {"name": "P", "category": "Test", "price": 10.0, "brand": "", "features": ""}
+    mock_collection.query.return_value = {
+        "ids": [["a", "b"], ["c", "a"]],
+        "documents": [["Doc a", "Doc b"], ["Doc c", "Doc a"]],
+        "metadatas": [[metadata, metadata], [metadata, metadata]],
+        "distances": [[0.1, 0.2], [0.3, 0.4]]
+    }
+    mock_collection.get.return_value = {"ids": ["b"]}
+    repo = ChromaVectorRepository(config)
+    await repo.delete_product("b")
+
+    per_query = await repo.search_many([[0.1], [0.2]], top_k=1)
+
+    mock_collection.query.assert_called_once_with(
+        query_embeddings=[[0.1], [0.2]], n_results=2, where=None
+    )
+    assert [[hit.product_id for hit in hits] for hits in per_query] == [["a"], ["c"]]
+
+@pytest.mark.asyncio
+async def test_search_many_exact_path_scores_each_query(config, mock_chroma_client, mock_collection):
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+
+    products = [
+        Product(name="Left", description="Left", category="Audio", price=20.0),
+        Product(name="Up", description="Up", category="Audio", price=30.0)
+    ]
+    index = ColumnarMetadataIndex()
+    index.upsert(products)
+    metadata = {"name": "P", "category": "Audio", "price": 20.0, "brand": "", "features": ""}
+    mock_collection.get.return_value = {
+        "ids": [str(products[0].id), str(products[1].id)],
+        "embeddings": [[1.0, 0.0], [0.0, 1.0]],
+        "documents": ["Left", "Up"],
+        "metadatas": [metadata, metadata]
+    }
+    repo = ChromaVectorRepository(config, metadata_index=index)
+
+    per_query = await repo.search_many([[0.0, 1.0], [1.0, 0.1]], top_k=1, filters={"category": "Audio"})
+
+    assert [hits[0].document for hits in per_query] == ["Up", "Left"]
+    mock_collection.get.assert_called_once()
+    mock_collection.query.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_snapshot_export_and_import(tmp_path, config, mock_chroma_client, mock_collection, uuid_product):
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+    from src.infrastructure.vector_store.snapshot import read_snapshot
+
+    product_id = str(uuid_product.id)
+    metadata = {"name": "Desk Lamp", "category": "Home", "price": 39.99, "content_hash": "abc"}
+    mock_collection.get.return_value = {
+        "ids": [product_id, "deleted"],
+        "embeddings": [[0.1, 0.2], [0.3, 0.4]],
+        "documents": ["LED desk lamp", "gone"],
+        "metadatas": [metadata, metadata]
+    }
+    source = ChromaVectorRepository(config)
+    await source.delete_product("deleted")
+    manifest = await source.export_snapshot(str(tmp_path / "snapshot"))
+
+    mock_collection.get.return_value = {"ids": [], "metadatas": []}
+    index = ColumnarMetadataIndex()
+    replica = ChromaVectorRepository(config, metadata_index=index)
+    imported = await replica.import_snapshot(read_snapshot(str(tmp_path / "snapshot")), batch_size=1)
+
+    assert manifest.count == 1 and manifest.generation == 1
+    assert imported == 1
+    upsert_args = mock_collection.upsert.call_args[1]
+    assert upsert_args["ids"] == [product_id]
+    assert upsert_args["embeddings"] == [pytest.approx([0.1, 0.2])]
+    assert replica.generation == 1
+    assert index.count({"category": "Home"}) == 1
+
+@pytest.mark.asyncio
+async def test_search_hits_can_return_embeddings(config, mock_chroma_client, mock_collection):
+    mock_collection.query.return_value = {
+        "ids": [["a"]],
+        "documents": [["Doc a"]],
+        "metadatas": [[{"name": "A", "category": "Test", "price": 1.0}]],
+        "distances": [[0.1]],
+        "embeddings": [[[0.5, 0.5]]]
+    }
+    repo = ChromaVectorRepository(config)
+
+    hits = await repo.search_hits([0.1, 0.2], top_k=1, include_embeddings=True)
+
+    assert hits[0].embedding == [0.5, 0.5]
+    assert "embeddings" in mock_collection.query.call_args[1]["include"]
+
+@pytest.mark.asyncio
+async def test_import_snapshot_skips_rows_already_persisted(config, mock_chroma_client, mock_collection):
+    from src.infrastructure.vector_store.snapshot import SnapshotManifest, VectorSnapshot
+    import numpy as np
+
+    metadatas = [
+        {"name": "Same", "category": "Home", "price": 10.0, "content_hash": "same"},
+        {"name": "Repriced", "category": "Home", "price": 12.0, "content_hash": "repriced"},
+        {"name": "Changed", "category": "Home", "price": 14.0, "content_hash": "new"}
+    ]
+    mock_collection.get.return_value = {
+        "ids": ["same", "repriced", "changed"],
+        "metadatas": [metadatas[0], {**metadatas[1], "price": 15.0}, {**metadatas[2], "content_hash": "old"}]
+    }
+    snapshot = VectorSnapshot(
+        manifest=SnapshotManifest(collection_name="test_products", generation=3, count=3, dimension=2),
+        ids=["same", "repriced", "changed"],
+        documents=["a", "b", "c"],
+        metadatas=metadatas,
+        vectors=np.arange(6, dtype=np.float32).reshape(3, 2)
+    )
+    repo = ChromaVectorRepository(config)
+
+    assert await repo.import_snapshot(snapshot) == 3
+
+    mock_collection.upsert.assert_called_once_with(
+        ids=["changed"], embeddings=[[4.0, 5.0]], documents=["c"], metadatas=[metadatas[2]]
+    )
+    mock_collection.update.assert_called_once_with(ids=["repriced"], metadatas=[metadatas[1]])
+    assert repo.generation == 3
+
+@pytest.mark.asyncio
+async def test_index_metadata_fills_columnar_index(config, mock_chroma_client, mock_collection, uuid_product):
+    from src.infrastructure.vector_store.columnar_index import ColumnarMetadataIndex
+
+    index = ColumnarMetadataIndex()
+    repo = ChromaVectorRepository(config, metadata_index=index)
+
+    repo.index_metadata([uuid_product])
+
+    assert str(uuid_product.id) in index
+    mock_collection.upsert.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_re_adding_tombstoned_product_overwrites_it(config, mock_chroma_client, mock_collection, uuid_product):
+    repo = ChromaVectorRepository(config)
+    await repo.add_products([uuid_product])
+    await repo.delete_product(str(uuid_product.id))
+    revised = uuid_product.model_copy(update={"description": "Revised lamp"})
+
+    await repo.add_products([revised])
+
+    mock_collection.add.assert_called_once()
+    assert mock_collection.upsert.call_args[1]["documents"] == ["Revised lamp"]
+    assert repo.tombstone_count == 0
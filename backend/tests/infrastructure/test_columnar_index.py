@@ -0,0 +1,61 @@
+import pytest
+from src.infrastructure.vector_store.columnar_index import (
+    ColumnarMetadataIndex,
+    UnsupportedFilterError
+)
+from src.domain.models.product import Product
+
+
+@pytest.fixture
+def products():
+    return [
+        Product(name="Headphones", description="d", category="Audio", price=199.0, brand="Sony", rating=4.7, stock_quantity=3),
+        Product(name="Earbuds", description="d", category="Audio", price=79.0, brand="JBL", rating=4.1),
+        Product(name="Laptop", description="d", category="Computers", price=1299.0, brand="Sony", stock_quantity=8),
+    ]
+
+@pytest.fixture
+def index(products):
+    index = ColumnarMetadataIndex(initial_capacity=2)
+    index.upsert(products)
+    return index
+
+
+def test_upsert_grows_capacity(index):
+    assert len(index) == 3
+
+def test_equality_filter(index, products):
+    assert index.filter_ids({"category": "Audio"}) == [str(products[0].id), str(products[1].id)]
+
+def test_numeric_range_with_and(index, products):
+    ids = index.filter_ids({"$and": [{"price": {"$gte": 50}}, {"price": {"$lte": 200}}, {"brand": "Sony"}]})
+
+    assert ids == [str(products[0].id)]
+
+def test_or_and_in_operators(index, products):
+    ids = index.filter_ids({"$or": [{"brand": {"$in": ["JBL"]}}, {"stock_quantity": {"$gt": 5}}]})
+
+    assert ids == [str(products[1].id), str(products[2].id)]
+
+def test_missing_rating_never_matches_range(index, products):
+    assert index.filter_ids({"rating": {"$gte": 4.0}}) == [str(products[0].id), str(products[1].id)]
+
+def test_unknown_value_matches_nothing(index):
+    assert index.count({"brand": "Apple"}) == 0
+
+def test_unknown_field_raises(index):
+    with pytest.raises(UnsupportedFilterError):
+        index.filter_mask({"color": "red"})
+
+def test_remove_and_reuse_row(index, products):
+    assert index.remove(str(products[0].id)) is True
+    assert index.count() == 2
+
+    replacement = Product(name="Speaker", description="d", category="Audio", price=49.0)
+    index.upsert([replacement])
+
+    assert index.filter_ids({"category": "Audio"}) == [str(replacement.id), str(products[1].id)]
+
+def test_facets_respect_filters(index):
+    assert index.facets("brand") == {"Sony": 2, "JBL": 1}
+    assert index.facets("category", {"price": {"$lt": 500}}) == {"Audio": 2}
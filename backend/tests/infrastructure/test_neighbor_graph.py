@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+from src.infrastructure.vector_store.neighbor_graph import NeighborGraph, NeighborGraphConfig
+
+
+@pytest.fixture
+def vectors():
+    return np.array([
+        [1.0, 0.0, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.9, 0.1],
+        [0.0, 0.0, 1.0],
+    ])
+
+@pytest.fixture
+def ids():
+    return ["a", "b", "c", "d", "e"]
+
+@pytest.fixture
+def graph(ids, vectors):
+    graph = NeighborGraph(NeighborGraphConfig(k=2, block_size=2))
+    graph.build(ids, vectors)
+    return graph
+
+
+def test_build_finds_nearest_neighbors(graph):
+    assert graph.neighbors("a", 1)[0][0] == "b"
+    assert graph.neighbors("c", 1)[0][0] == "d"
+    assert len(graph) == 5
+
+def test_neighbors_exclude_self_and_are_sorted(graph):
+    neighbors = graph.neighbors("a", 2)
+
+    assert "a" not in [neighbor_id for neighbor_id, _ in neighbors]
+    assert neighbors[0][1] >= neighbors[1][1]
+
+def test_blocked_build_matches_single_block(ids, vectors):
+    blocked = NeighborGraph(NeighborGraphConfig(k=3, block_size=1))
+    single = NeighborGraph(NeighborGraphConfig(k=3, block_size=100))
+    blocked.build(ids, vectors)
+    single.build(ids, vectors)
+
+    for product_id in ids:
+        assert [n for n, _ in blocked.neighbors(product_id, 3)] == [n for n, _ in single.neighbors(product_id, 3)]
+
+def test_incremental_add_updates_existing_rows(graph):
+    graph.add(["f"], np.array([[0.0, 0.05, 1.0]]))
+
+    assert graph.neighbors("f", 1)[0][0] == "e"
+    assert graph.neighbors("e", 1)[0][0] == "f"
+
+def test_add_replaces_existing_vector(graph):
+    graph.add(["a"], np.array([[0.0, 0.0, 0.9]]))
+
+    assert len(graph) == 5
+    assert graph.neighbors("a", 1)[0][0] == "e"
+
+def test_remove_drops_node_and_edges(graph):
+    assert graph.remove("b") is True
+
+    assert "b" not in graph
+    assert all(neighbor_id != "b" for neighbor_id, _ in graph.neighbors("a", 2))
+    assert graph.remove("b") is False
+
+def test_remove_refills_neighbor_lists(graph, ids, vectors):
+    graph.remove("b")
+    rebuilt = NeighborGraph(NeighborGraphConfig(k=2))
+    rebuilt.build([i for i in ids if i != "b"], np.delete(vectors, 1, axis=0))
+
+    for product_id in ("a", "c", "d", "e"):
+        assert graph.neighbors(product_id, 2) == rebuilt.neighbors(product_id, 2)
+    assert len(graph.neighbors("a", 2)) == 2
+
+def test_unknown_product_has_no_neighbors(graph):
+    assert graph.neighbors("missing", 5) == []
@@ -0,0 +1,207 @@
+import pytest
+from uuid import uuid4
+from unittest.mock import Mock, patch
+from src.infrastructure.vector_store.sharded_chroma_repository import (
+    ShardedChromaVectorRepository,
+    ShardedChromaConfig
+)
+from src.domain.models.product import Product
+
+
+def make_collection(name, ids=None, distances=None, metadata=None):
+    collection = Mock()
+    collection.name = name
+    collection.metadata = metadata
+    collection.count.return_value = len(ids or [])
+    collection.query.return_value = {
+        "ids": [ids or []],
+        "documents": [[f"doc {i}" for i in ids or []]],
+        "metadatas": [[
+            {"name": f"Product {i}", "category": name, "price": 10.0, "brand": "", "features": ""}
+            for i in ids or []
+        ]],
+        "distances": [distances or []]
+    }
+    return collection
+
+@pytest.fixture
+def collections():
+    return {}
+
+@pytest.fixture
+def mock_chroma_client(collections):
+    with patch('src.infrastructure.vector_store.sharded_chroma_repository.chromadb.Client') as mock_client:
+        client_instance = Mock()
+
+        def get_or_create_collection(name, metadata=None):
+            if name not in collections:
+                collections[name] = make_collection(name, metadata=metadata)
+            return collections[name]
+
+        client_instance.get_or_create_collection.side_effect = get_or_create_collection
+        client_instance.list_collections.side_effect = lambda: list(collections.values())
+        mock_client.return_value = client_instance
+        yield client_instance
+
+@pytest.fixture
+def repo(mock_chroma_client):
+    return ShardedChromaVectorRepository(ShardedChromaConfig(collection_prefix="products"))
+
+def make_product(category):
+    return Product(
+        name=f"{category} item",
+        description=f"A product in {category}",
+        category=category,
+        price=49.99
+    )
+
+@pytest.mark.asyncio
+async def test_add_products_routes_by_category(repo, collections):
+    await repo.add_products([make_product("Electronics"), make_product("Home & Garden")])
+
+    assert set(repo.shard_keys) == {"electronics", "home_garden"}
+    collections["products_electronics"].add.assert_called_once()
+    collections["products_home_garden"].add.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_category_filter_hits_single_shard(repo, collections):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    electronics_id = str(uuid4())
+    collections["products_electronics"].count.return_value = 1
+    collections["products_electronics"].query.return_value = make_collection(
+        "Electronics", [electronics_id], [0.1]
+    ).query.return_value
+
+    results = await repo.search([0.1, 0.2], top_k=3, filters={"category": "Electronics"})
+
+    assert [str(r.product.id) for r in results] == [electronics_id]
+    collections["products_sports"].query.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_unfiltered_search_merges_shards_by_score(repo, collections):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    ids = [str(uuid4()) for _ in range(4)]
+    collections["products_electronics"] = make_collection("Electronics", ids[:2], [0.1, 0.6])
+    collections["products_sports"] = make_collection("Sports", ids[2:], [0.3, 0.05])
+    repo._shards = {
+        "electronics": collections["products_electronics"],
+        "sports": collections["products_sports"]
+    }
+
+    results = await repo.search([0.1, 0.2], top_k=3)
+
+    assert [str(r.product.id) for r in results] == [ids[3], ids[0], ids[2]]
+
+@pytest.mark.asyncio
+async def test_unknown_category_returns_empty(repo):
+    await repo.add_products([make_product("Electronics")])
+
+    results = await repo.search([0.1], filters={"category": {"$eq": "Toys"}})
+
+    assert results == []
+
+@pytest.mark.asyncio
+async def test_hash_buckets_group_categories(mock_chroma_client):
+    repo = ShardedChromaVectorRepository(ShardedChromaConfig(hash_buckets=4))
+
+    key = repo.shard_key_for_category("Electronics")
+
+    assert key.startswith("bucket_")
+    assert key == repo.shard_key_for_category("  electronics ")
+
+@pytest.mark.asyncio
+async def test_rebuild_shard_swaps_only_that_shard(repo, collections, mock_chroma_client):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    replacement = make_product("Electronics")
+
+    await repo.rebuild_shard("electronics", [replacement])
+
+    collections["products_electronics_r1"].add.assert_called_once()
+    mock_chroma_client.delete_collection.assert_called_once_with(name="products_electronics")
+    assert repo._shards["sports"] is collections["products_sports"]
+
+@pytest.mark.asyncio
+async def test_delete_product_targets_owning_shard(repo, collections):
+    product = make_product("Sports")
+    await repo.add_products([product, make_product("Electronics")])
+
+    await repo.delete_product(str(product.id))
+
+    collections["products_sports"].delete.assert_called_once_with(ids=[str(product.id)])
+    collections["products_electronics"].delete.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_search_many_queries_each_shard_once(repo, collections):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    ids = [str(uuid4()) for _ in range(4)]
+    for name, shard_ids, distances in (
+        ("products_electronics", ids[:2], [[0.1], [0.6]]),
+        ("products_sports", ids[2:], [[0.3], [0.05]])
+    ):
+        collection = collections[name]
+        collection.count.return_value = 1
+        collection.query.return_value = {
+            "ids": [[shard_ids[0]], [shard_ids[1]]],
+            "documents": [["doc"], ["doc"]],
+            "metadatas": [[{"name": "P", "category": name, "price": 1.0}]] * 2,
+            "distances": distances
+        }
+
+    per_query = await repo.search_many([[0.1, 0.2], [0.3, 0.4]], top_k=1)
+
+    assert [[hit.product_id for hit in hits] for hits in per_query] == [[ids[0]], [ids[3]]]
+    collections["products_electronics"].query.assert_called_once()
+    collections["products_sports"].query.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_compiled_category_filter_hits_single_shard(repo, collections):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    for name in ("products_electronics", "products_sports"):
+        collections[name].count.return_value = 1
+    filters = {"$and": [{"category": "Electronics"}, {"price": {"$lte": 100.0}}]}
+
+    await repo.search([0.1, 0.2], top_k=3, filters=filters)
+
+    collections["products_electronics"].query.assert_called_once()
+    collections["products_sports"].query.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_existing_shards_are_discovered_on_init(repo, collections, mock_chroma_client):
+    await repo.add_products([make_product("Electronics"), make_product("Sports")])
+    await repo.rebuild_shard("sports", [make_product("Sports")])
+    collections["unrelated"] = make_collection("unrelated", metadata={"hnsw:space": "cosine"})
+
+    reopened = ShardedChromaVectorRepository(ShardedChromaConfig(collection_prefix="products"))
+
+    assert set(reopened.shard_keys) == {"electronics", "sports"}
+    assert reopened._shards["sports"] is collections["products_sports_r1"]
+
+@pytest.mark.asyncio
+async def test_upsert_moves_product_between_shards(repo, collections):
+    product = make_product("Sports")
+    await repo.add_products([product])
+
+    await repo.upsert_products([product.model_copy(update={"category": "Electronics"})])
+
+    collections["products_sports"].delete.assert_called_once_with(ids=[str(product.id)])
+    collections["products_electronics"].upsert.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_apply_deltas_updates_owning_shard(repo, collections):
+    product = make_product("Sports")
+    await repo.add_products([product])
+    collections["products_sports"].get.return_value = {"ids": [str(product.id)]}
+
+    assert await repo.apply_deltas({str(product.id): {"price": 19.99}}) == 1
+
+    collections["products_sports"].update.assert_called_once_with(ids=[str(product.id)], metadatas=[{"price": 19.99}])
+
+@pytest.mark.asyncio
+async def test_apply_deltas_rejects_embedded_fields(repo, collections):
+    product = make_product("Sports")
+    await repo.add_products([product])
+
+    with pytest.raises(ValueError):
+        await repo.apply_deltas({str(product.id): {"name": "Renamed"}})
+
+    collections["products_sports"].update.assert_not_called()
@@ -0,0 +1,90 @@
+import json
+import pytest
+import numpy as np
+from src.infrastructure.vector_store.snapshot import (
+    SnapshotError,
+    SnapshotManifest,
+    VectorSnapshot,
+    read_snapshot,
+    warm_snapshot,
+    write_snapshot
+)
+
+
+@pytest.fixture
+def snapshot():
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    return VectorSnapshot(
+        manifest=SnapshotManifest(collection_name="products", generation=7, count=3, dimension=4),
+        ids=["a", "b", "c"],
+        documents=["doc a", "doc b", "doc c"],
+        metadatas=[{"name": "A"}, {"name": "B"}, {"name": "C"}],
+        vectors=vectors
+    )
+
+
+def test_round_trip_memory_maps_vectors(tmp_path, snapshot):
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(directory, snapshot)
+
+    loaded = read_snapshot(directory)
+
+    assert isinstance(loaded.vectors, np.memmap)
+    assert np.array_equal(loaded.vectors, snapshot.vectors)
+    assert loaded.ids == ["a", "b", "c"]
+    assert loaded.metadatas[1] == {"name": "B"}
+    assert loaded.manifest.generation == 7
+
+def test_write_replaces_existing_snapshot(tmp_path, snapshot):
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(directory, snapshot)
+    snapshot.manifest.generation = 8
+
+    write_snapshot(directory, snapshot)
+
+    assert read_snapshot(directory).manifest.generation == 8
+    assert not (tmp_path / "snapshot.tmp").exists()
+
+def test_write_swaps_versions_without_breaking_open_readers(tmp_path, snapshot):
+    directory = tmp_path / "snapshot"
+    write_snapshot(str(directory), snapshot)
+    previous = read_snapshot(str(directory))
+    snapshot.vectors = snapshot.vectors + 1
+
+    write_snapshot(str(directory), snapshot)
+
+    assert directory.is_symlink()
+    assert len(list(tmp_path.glob("snapshot.v*"))) == 1
+    assert np.array_equal(read_snapshot(str(directory)).vectors, snapshot.vectors)
+    assert float(previous.vectors[0, 0]) == 0.0
+
+def test_write_replaces_legacy_snapshot_directory(tmp_path, snapshot):
+    directory = tmp_path / "snapshot"
+    directory.mkdir()
+    (directory / "manifest.json").write_text("{}")
+
+    write_snapshot(str(directory), snapshot)
+
+    assert read_snapshot(str(directory)).manifest.generation == 7
+
+def test_warm_touches_one_value_per_page(tmp_path, snapshot):
+    directory = str(tmp_path / "snapshot")
+    write_snapshot(directory, snapshot)
+
+    touched = warm_snapshot(read_snapshot(directory), page_size=16)
+
+    assert touched == 3
+
+def test_count_mismatch_is_rejected(tmp_path, snapshot):
+    directory = tmp_path / "snapshot"
+    write_snapshot(str(directory), snapshot)
+    manifest = json.loads((directory / "manifest.json").read_text())
+    manifest["count"] = 5
+    (directory / "manifest.json").write_text(json.dumps(manifest))
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(directory))
+
+def test_missing_snapshot_raises(tmp_path):
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(tmp_path / "missing"))
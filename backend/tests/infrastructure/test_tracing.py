@@ -0,0 +1,118 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.domain.models.rag import RAGRequest
+from src.domain.models.search_result import SearchHit
+from src.application.services.context_retrieval import RetrievalConfig, VectorSearchStrategy
+from src.infrastructure.tracing import (
+    JsonlTraceExporter,
+    Tracer,
+    TraceRingBuffer,
+    current_request_id,
+    render_waterfall,
+    set_request_id,
+    tracer
+)
+
+
+@pytest.fixture
+def buffer():
+    ring = TraceRingBuffer(capacity=10)
+    tracer.add_exporter(ring)
+    yield ring
+    tracer.clear_exporters()
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_share_request_id(buffer):
+    async def stage(name):
+        with tracer.span(name):
+            await asyncio.sleep(0)
+            return current_request_id()
+
+    async def turn():
+        set_request_id("req-1")
+        with tracer.span("turn"):
+            return await asyncio.gather(stage("embed"), stage("search"))
+
+    assert await asyncio.create_task(turn()) == ["req-1", "req-1"]
+
+    trace = buffer.recent()[0]
+    assert trace.request_id == "req-1"
+    assert [span.name for span in trace.spans] == ["turn", "embed", "search"]
+    assert {span.parent_id for span in trace.spans[1:]} == {trace.root.span_id}
+
+def test_span_records_errors_and_still_exports(buffer):
+    with pytest.raises(ValueError):
+        with tracer.span("turn"):
+            with tracer.span("generate"):
+                raise ValueError("boom")
+
+    trace = buffer.recent()[0]
+    assert trace.spans[1].error == "ValueError: boom"
+    assert trace.root.error == "ValueError: boom"
+
+def test_ring_buffer_returns_newest_slow_traces_first():
+    ring = TraceRingBuffer(capacity=2)
+    local = Tracer([ring])
+    for name in ["a", "b", "c"]:
+        with local.span(name) as span:
+            span.start -= 2.0 if name != "b" else 0.0
+
+    assert [trace.root.name for trace in ring.recent(min_duration_ms=1000)] == ["c"]
+    assert len(ring) == 2
+
+def test_disabled_tracer_yields_no_span():
+    ring = TraceRingBuffer()
+    local = Tracer([ring], enabled=False)
+
+    with local.span("turn") as span:
+        assert span is None
+
+    assert len(ring) == 0
+
+def test_jsonl_exporter_rotates(tmp_path):
+    path = tmp_path / "traces" / "traces.jsonl"
+    exporter = JsonlTraceExporter(str(path), max_bytes=400, backup_count=2)
+    local = Tracer([exporter])
+
+    for index in range(10):
+        with local.span("turn", index=index):
+            pass
+    exporter.close()
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[-1])["spans"][0]["attributes"] == {"index": 9}
+    assert (tmp_path / "traces" / "traces.jsonl.1").exists()
+    assert (tmp_path / "traces" / "traces.jsonl.2").exists()
+    assert not (tmp_path / "traces" / "traces.jsonl.3").exists()
+
+def test_waterfall_reports_depth_and_share():
+    ring = TraceRingBuffer()
+    local = Tracer([ring])
+    with local.span("turn"):
+        with local.span("retrieve"):
+            with local.span("embed"):
+                pass
+
+    waterfall = render_waterfall(ring.recent()[0], width=20)
+
+    assert [row["depth"] for row in waterfall["spans"]] == [0, 1, 2]
+    assert waterfall["spans"][0]["share"] == 1.0
+    assert all(len(row["bar"]) == 20 for row in waterfall["spans"])
+
+@pytest.mark.asyncio
+async def test_vector_strategy_emits_stage_spans(buffer):
+    hit = SearchHit("p1", 0.9, "doc", {"name": "P1", "category": "Headphones", "price": 10.0})
+    vector_repository = Mock()
+    vector_repository.search_hits = AsyncMock(return_value=[hit])
+    embedding_service = Mock()
+    embedding_service.embed_text = AsyncMock(return_value=[0.1, 0.2])
+    strategy = VectorSearchStrategy(vector_repository, embedding_service, RetrievalConfig(diversity_method="none"))
+
+    await strategy.retrieve_context("headphones", RAGRequest(query="headphones", max_results=1))
+
+    names = [span.name for span in buffer.recent()[0].spans]
+    assert names == ["retrieval.vector", "retrieval.embed", "retrieval.vector_search", "retrieval.select"]
@@ -0,0 +1,94 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from src.main import app
+from src.api.dependencies import get_rag_pipeline, get_search_cache, get_semantic_cache
+from src.application.services.semantic_cache import SemanticAnswerCache
+from src.domain.models.rag import RAGRequest, RAGResponse
+from src.application.services.answer_policy import AnswerDecision, AnswerPath, AnswerPathMetrics
+from src.infrastructure.vector_store.cached_repository import CachingVectorRepository, SearchCacheConfig
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def search_cache():
+    repository = MagicMock()
+    repository.generation = 0
+    repository.search_hits = AsyncMock(return_value=[])
+    cache = CachingVectorRepository(repository, SearchCacheConfig())
+    app.dependency_overrides[get_search_cache] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_search_cache, None)
+
+
+class TestSearchCacheStatsEndpoint:
+    @pytest.mark.asyncio
+    async def test_reports_cache_stats(self, search_cache):
+        await search_cache.search_hits([0.1, 0.2], top_k=5)
+        await search_cache.search_hits([0.1, 0.2], top_k=5)
+
+        response = client.get("/debug/cache/search")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["enabled"] is True
+        assert (data["hits"], data["misses"], data["entries"]) == (1, 1, 1)
+        assert data["hit_rate"] == 0.5
+
+    def test_reports_disabled_cache(self):
+        app.dependency_overrides[get_search_cache] = lambda: None
+        try:
+            response = client.get("/debug/cache/search")
+        finally:
+            app.dependency_overrides.pop(get_search_cache, None)
+
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
+
+
+class TestAnswerPathStatsEndpoint:
+    def test_reports_fast_path_counts(self):
+        metrics = AnswerPathMetrics()
+        metrics.record(AnswerDecision(path=AnswerPath.GENERATE, reason="retrieval not decisive"))
+        metrics.record(AnswerDecision(path=AnswerPath.LIST, reason="requested list"))
+        app.dependency_overrides[get_rag_pipeline] = lambda: MagicMock(answer_path_metrics=metrics)
+        try:
+            response = client.get("/debug/answer-paths")
+        finally:
+            app.dependency_overrides.pop(get_rag_pipeline, None)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["requests"] == 2
+        assert data["paths"]["list"] == 1
+        assert data["fast_path_rate"] == 0.5
+
+
+@pytest.fixture
+def semantic_cache():
+    embedding_service = MagicMock()
+    embedding_service.embed_text = AsyncMock(return_value=[1.0, 0.0])
+    cache = SemanticAnswerCache(embedding_service)
+    app.dependency_overrides[get_semantic_cache] = lambda: cache
+    yield cache
+    app.dependency_overrides.pop(get_semantic_cache, None)
+
+
+class TestSemanticCacheEndpoints:
+    @pytest.mark.asyncio
+    async def test_reports_audits_and_flags_hits(self, semantic_cache):
+        request = RAGRequest(query="wireless headphones")
+        lookup = await semantic_cache.lookup(request)
+        semantic_cache.store(lookup, request.query, RAGResponse(query=request.query, recommended_products=[], context_used=[], confidence_score=0.9, model_used="llama2"))
+        hit = await semantic_cache.lookup(RAGRequest(query="headphones that are wireless"))
+
+        stats = client.get("/debug/cache/semantic").json()
+        audit = client.get("/debug/cache/semantic/audit").json()
+        flagged = client.post(f"/debug/cache/semantic/audit/{hit.audit_id}/false-hit")
+
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert audit["entries"][0]["matched_query"] == "wireless headphones"
+        assert flagged.status_code == 200
+        assert semantic_cache.stats.false_hits == 1
+        assert client.post(f"/debug/cache/semantic/audit/{hit.audit_id}/false-hit").status_code == 404
@@ -2,7 +2,12 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi.testclient import TestClient
 from uuid import uuid4
+import numpy as np
 from src.main import app
+from src.api.dependencies import get_similar_products_service
+from src.application.services.similar_products import SimilarProductsService
+from src.domain.models.product import Product
+from src.infrastructure.vector_store.neighbor_graph import NeighborGraph, NeighborGraphConfig
 
 client = TestClient(app)
 
@@ -241,4 +246,42 @@ class TestProductGetEndpoint:
     def test_get_product_with_invalid_uuid_fails(self):
         response = client.get("/api/v1/products/invalid-uuid")
         
-        assert response.status_code == 422
\ No newline at end of file
+        assert response.status_code == 422
+
+
+@pytest.fixture
+def similar_products():
+    products = [
+        Product(name="Studio Headphones", description="Closed-back", price=199.99, category="audio"),
+        Product(name="Travel Headphones", description="Foldable", price=149.99, category="audio"),
+        Product(name="Desk Lamp", description="LED lamp", price=39.99, category="home")
+    ]
+    by_id = {str(product.id): product for product in products}
+    repo = MagicMock()
+    repo.get_embeddings = AsyncMock(return_value=(
+        list(by_id), np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+    ))
+    repo.get_products = AsyncMock(side_effect=lambda ids: [by_id[i] for i in ids])
+    service = SimilarProductsService(repo, NeighborGraph(NeighborGraphConfig(k=2)))
+    app.dependency_overrides[get_similar_products_service] = lambda: service
+    yield service, products
+    app.dependency_overrides.pop(get_similar_products_service, None)
+
+
+class TestSimilarProductsEndpoint:
+    @pytest.mark.asyncio
+    async def test_similar_products_served_from_prebuilt_graph(self, similar_products):
+        service, products = similar_products
+        await service.refresh()
+
+        response = client.get(f"/api/v1/products/{products[0].id}/similar?limit=1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["product_id"] == str(products[0].id)
+        assert [item["name"] for item in data["similar_products"]] == ["Travel Headphones"]
+
+    def test_similar_products_unknown_id_returns_404(self, similar_products):
+        response = client.get(f"/api/v1/products/{uuid4()}/similar")
+
+        assert response.status_code == 404